@@ -0,0 +1,118 @@
+"""
+Eventra all-in-one — the user, event and feedback services in one process.
+
+Small deployments don't need three apps (three cold starts, three
+keep-alive pingers) talking to the same database: this mounts the three
+FastAPI apps under /user, /event and /feedback and runs their lifespans
+together. The user and feedback services' psycopg2 pools are replaced by
+one shared pool (the event service has its own async psycopg 3 pool).
+
+    uvicorn main:app --port 8000
+
+With EVENTRA_IN_PROCESS=1 the Streamlit frontend imports this app and
+calls it directly instead of over HTTP (see frontend/services/transport.py).
+
+Each service is a flat directory whose modules share names with the
+others' (main, database, cache, models...), so each is imported with its
+own directory first on sys.path and its modules are moved out of
+sys.modules before the next one is loaded.
+"""
+
+import importlib
+import os
+import sys
+from contextlib import AsyncExitStack, asynccontextmanager
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+SERVICES_ROOT = Path(os.getenv("EVENTRA_SERVICES_ROOT", Path(__file__).resolve().parent.parent))
+
+# (mount prefix, service directory)
+SERVICES = (
+    ("/user", "user-service"),
+    ("/event", "event-service"),
+    ("/feedback", "feedback-service"),
+)
+
+# One process answers for all three, so the per-service pingers only keep
+# the database awake unless pointed at this deployment's own URL
+os.environ.setdefault("KEEP_ALIVE_URLS", "")
+
+
+def _load_service(directory):
+    """Import directory/main.py; returns its modules by name, isolated from the other services'."""
+    names = {path.stem for path in directory.glob("*.py")}
+    shadowed = {name: sys.modules.pop(name) for name in names if name in sys.modules}
+    sys.path.insert(0, str(directory))
+    try:
+        importlib.import_module("main")
+        return {name: sys.modules[name] for name in names if name in sys.modules}
+    finally:
+        sys.path.remove(str(directory))
+        for name in names:
+            sys.modules.pop(name, None)
+        sys.modules.update(shadowed)
+
+
+services = {prefix: _load_service(SERVICES_ROOT / directory) for prefix, directory in SERVICES}
+
+# Share one psycopg2 pool: get_cursor() looks up the module-level _pool on each call
+shared_pool = services["/user"]["database"]._pool
+services["/feedback"]["database"]._pool = shared_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run each service's own lifespan (pools, listeners, background tasks)."""
+    async with AsyncExitStack() as stack:
+        for modules in services.values():
+            sub_app = modules["main"].app
+            await stack.enter_async_context(sub_app.router.lifespan_context(sub_app))
+        yield
+
+
+app = FastAPI(title="Eventra", version="1.0.0", lifespan=lifespan)
+
+for prefix, modules in services.items():
+    app.mount(prefix, modules["main"].app)
+
+
+# ──────────── Health ────────────
+
+@app.get("/health")
+def health():
+    """Health check with a lightweight DB query on the shared pool."""
+    try:
+        with services["/user"]["database"].get_cursor() as cur:
+            cur.execute("SELECT 1")
+        db_status = "connected"
+    except Exception:
+        db_status = "error"
+    return {
+        "status": "ok",
+        "service": "all-in-one",
+        "mounts": [prefix for prefix, _ in SERVICES],
+        "database": db_status,
+    }
+
+
+@app.get("/health/pool")
+def health_pool():
+    """Statistics for the shared psycopg2 pool and the event service's async pool."""
+    return {
+        "shared": shared_pool.stats(),
+        "event_async": services["/event"]["database"].async_pool_stats(),
+    }
+
+
+@app.get("/ready")
+def ready():
+    """503 until every service has finished its startup warm-up."""
+    reports = {prefix: modules["main"].warmup.report() for prefix, modules in services.items()}
+    is_ready = all(report["status"] == "ready" for report in reports.values())
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"status": "ready" if is_ready else "warming_up", "services": reports},
+    )
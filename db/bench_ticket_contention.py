@@ -0,0 +1,165 @@
+"""
+Ticket contention benchmark — registrations/sec versus shard count.
+
+Creates a scratch event with one ticket and N synthetic students, then
+registers every student concurrently through register_participant() once
+per shard count. Everything the benchmark creates is deleted afterwards.
+
+    python db/bench_ticket_contention.py --workers 32 --registrations 2000 \
+        --shards 1 2 4 8 16 --latency-ms 5
+
+--latency-ms holds each transaction open for that long after the claim,
+standing in for the client <-> database round trip before COMMIT (the
+window during which the claimed row stays locked).
+"""
+
+import os
+import time
+import uuid
+import queue
+import argparse
+import threading
+import psycopg2
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DB_CONFIG = {
+    "host": os.getenv("SUPABASE_DB_HOST"),
+    "dbname": os.getenv("SUPABASE_DB_NAME"),
+    "user": os.getenv("SUPABASE_DB_USER"),
+    "password": os.getenv("SUPABASE_DB_PASSWORD"),
+    "port": os.getenv("SUPABASE_DB_PORT", "5432"),
+    "sslmode": "require",
+}
+
+
+def setup(conn, registrations):
+    tag = uuid.uuid4().hex[:8]
+    with conn.cursor() as cur:
+        cur.execute("SELECT id FROM tbl_venues ORDER BY id LIMIT 1")
+        venue = cur.fetchone()
+        cur.execute("SELECT id FROM tbl_hosts ORDER BY id LIMIT 1")
+        host = cur.fetchone()
+        if not venue or not host:
+            raise SystemExit("Need at least one venue and one host to create the scratch event.")
+
+        cur.execute("""
+            INSERT INTO tbl_events
+            (name, description, date, start_time, end_time,
+             location_id, organizer_id, status, max_participants)
+            VALUES (%s, 'Ticket contention benchmark', CURRENT_DATE + 30,
+                    '10:00', '12:00', %s, %s, 'Scheduled', %s)
+            RETURNING id
+        """, (f"Contention benchmark {tag}", venue[0], host[0], registrations))
+        event_id = cur.fetchone()[0]
+
+        cur.execute("""
+            INSERT INTO tbl_tickets (event_id, ticket_type, price, quantity)
+            VALUES (%s, 'Benchmark', 0, %s)
+            RETURNING id
+        """, (event_id, registrations))
+        ticket_id = cur.fetchone()[0]
+
+        cur.execute("""
+            INSERT INTO tbl_students (srn, name, semester, section)
+            SELECT %s || n, 'Bench Student ' || n, 1, 'Z'
+            FROM generate_series(1, %s) AS n
+            RETURNING id
+        """, (f"BENCH-{tag}-", registrations))
+        student_ids = [row[0] for row in cur.fetchall()]
+    conn.commit()
+    return tag, event_id, ticket_id, student_ids
+
+
+def reset(conn, event_id, ticket_id, registrations, shards):
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM tbl_event_participants WHERE event_id = %s", (event_id,))
+        cur.execute("DELETE FROM tbl_orders WHERE ticket_id = %s", (ticket_id,))
+        cur.execute("DELETE FROM tbl_ticket_shards WHERE ticket_id = %s", (ticket_id,))
+        cur.execute("UPDATE tbl_tickets SET quantity = %s WHERE id = %s", (registrations, ticket_id))
+        cur.execute("SELECT shard_ticket(%s, %s)", (ticket_id, shards))
+    conn.commit()
+
+
+def cleanup(conn, tag, event_id, ticket_id):
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM tbl_event_participants WHERE event_id = %s", (event_id,))
+        cur.execute("DELETE FROM tbl_orders WHERE ticket_id = %s", (ticket_id,))
+        cur.execute("DELETE FROM tbl_ticket_shards WHERE ticket_id = %s", (ticket_id,))
+        cur.execute("DELETE FROM tbl_tickets WHERE id = %s", (ticket_id,))
+        cur.execute("DELETE FROM tbl_events WHERE id = %s", (event_id,))
+        cur.execute("DELETE FROM tbl_students WHERE srn LIKE %s", (f"BENCH-{tag}-%",))
+    conn.commit()
+
+
+def run(event_id, ticket_id, student_ids, workers, latency_s):
+    """Register every student once; returns (elapsed seconds, status counts)."""
+    todo = queue.Queue()
+    for sid in student_ids:
+        todo.put(sid)
+
+    counts = {}
+    lock = threading.Lock()
+    start = threading.Barrier(workers + 1)
+
+    def worker():
+        conn = psycopg2.connect(**DB_CONFIG)
+        try:
+            start.wait()
+            with conn.cursor() as cur:
+                while True:
+                    try:
+                        sid = todo.get_nowait()
+                    except queue.Empty:
+                        break
+                    cur.execute(
+                        "SELECT register_participant(%s, %s, %s)",
+                        (event_id, sid, ticket_id),
+                    )
+                    status = cur.fetchone()[0]
+                    if latency_s:
+                        cur.execute("SELECT pg_sleep(%s)", (latency_s,))
+                    conn.commit()
+                    with lock:
+                        counts[status] = counts.get(status, 0) + 1
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for t in threads:
+        t.start()
+    start.wait()
+    began = time.perf_counter()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - began, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--registrations", type=int, default=2000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    tag, event_id, ticket_id, student_ids = setup(conn, args.registrations)
+    try:
+        print(f"{'shards':>6}  {'regs':>6}  {'seconds':>8}  {'regs/sec':>9}  statuses")
+        for shards in args.shards:
+            reset(conn, event_id, ticket_id, args.registrations, shards)
+            elapsed, counts = run(
+                event_id, ticket_id, student_ids,
+                args.workers, args.latency_ms / 1000,
+            )
+            ok = counts.get(0, 0)
+            print(f"{shards:>6}  {ok:>6}  {elapsed:>8.2f}  {ok / elapsed:>9.1f}  {counts}")
+    finally:
+        cleanup(conn, tag, event_id, ticket_id)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Plan check — upcoming/completed event queries must use tbl_events_ends_at_id_idx.
+
+Runs EXPLAIN (FORMAT JSON) on the event service's ends_at queries
+(db/part11_event_ends_at.sql) and exits non-zero unless every plan reads
+tbl_events through that index (Index Scan, Index Only Scan or Bitmap
+Index Scan).
+
+    python db/check_ends_at_plans.py
+    python db/check_ends_at_plans.py --planner-choice
+
+By default sequential scans are disabled for the check, so it proves the
+predicates can use the index however small tbl_events is (on a small
+table the planner rightly prefers a Seq Scan). A predicate the index
+can't serve, such as (date + end_time) > NOW(), still falls back to a
+Seq Scan and fails. --planner-choice leaves the planner settings alone,
+which is only meaningful on a production-sized table.
+"""
+
+import os
+import json
+import argparse
+import psycopg2
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DB_CONFIG = {
+    "host": os.getenv("SUPABASE_DB_HOST"),
+    "dbname": os.getenv("SUPABASE_DB_NAME"),
+    "user": os.getenv("SUPABASE_DB_USER"),
+    "password": os.getenv("SUPABASE_DB_PASSWORD"),
+    "port": os.getenv("SUPABASE_DB_PORT", "5432"),
+    "sslmode": "require",
+}
+
+INDEX_NAME = "tbl_events_ends_at_id_idx"
+
+EVENT_COLUMNS = """
+    SELECT e.id, e.name, e.description, e.date,
+           e.start_time, e.end_time,
+           e.location_id, v.name AS venue_name,
+           e.organizer_id, h.name AS host_name,
+           e.status, e.max_participants, e.ends_at
+    FROM tbl_events e
+    LEFT JOIN tbl_venues v ON e.location_id = v.id
+    LEFT JOIN tbl_hosts h ON e.organizer_id = h.id
+"""
+
+# (name, query, params) — the shapes GET /events and GET /events/completed run
+QUERIES = [
+    ("upcoming", EVENT_COLUMNS + """
+        WHERE e.ends_at > NOW()
+        ORDER BY e.date, e.start_time
+    """, ()),
+    ("completed, first page", EVENT_COLUMNS + """
+        WHERE e.ends_at <= NOW()
+        ORDER BY e.ends_at DESC, e.id DESC
+        LIMIT %s
+    """, (51,)),
+    ("completed, next page", EVENT_COLUMNS + """
+        WHERE e.ends_at <= NOW()
+          AND (e.ends_at, e.id) < (NOW() - interval '30 days', 0)
+        ORDER BY e.ends_at DESC, e.id DESC
+        LIMIT %s
+    """, (51,)),
+]
+
+
+def plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def events_scans(plan):
+    """Node types and index names of every scan on tbl_events in the plan."""
+    return [
+        (node["Node Type"], node.get("Index Name"))
+        for node in plan_nodes(plan)
+        if node.get("Relation Name") == "tbl_events"
+        or node.get("Index Name", "").startswith("tbl_events")
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--planner-choice", action="store_true",
+                        help="don't disable sequential scans")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    failures = 0
+    try:
+        with conn.cursor() as cur:
+            if not args.planner_choice:
+                cur.execute("SET LOCAL enable_seqscan = off")
+            for name, query, params in QUERIES:
+                cur.execute("EXPLAIN (FORMAT JSON) " + query, params)
+                plan = cur.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                scans = events_scans(plan[0]["Plan"])
+                ok = bool(scans) and all(index == INDEX_NAME for _, index in scans)
+                failures += not ok
+                shown = ", ".join(f"{kind} ({index})" if index else kind for kind, index in scans)
+                print(f"{'ok' if ok else 'FAIL':>4}  {name}: {shown}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+    if failures:
+        raise SystemExit(f"{failures} of {len(QUERIES)} queries don't use {INDEX_NAME}")
+    print(f"All {len(QUERIES)} queries use {INDEX_NAME}")
+
+
+if __name__ == "__main__":
+    main()
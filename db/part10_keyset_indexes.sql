@@ -0,0 +1,9 @@
+-- PART 10: Indexes backing keyset pagination on the list endpoints
+CREATE INDEX IF NOT EXISTS tbl_events_date_id_idx
+  ON public.tbl_events(date, id);
+CREATE INDEX IF NOT EXISTS tbl_students_name_id_idx
+  ON public.tbl_students(name, id);
+CREATE INDEX IF NOT EXISTS tbl_resources_name_id_idx
+  ON public.tbl_resources(name, id);
+CREATE INDEX IF NOT EXISTS tbl_event_feedback_event_id_id_idx
+  ON public.tbl_event_feedback(event_id, id);
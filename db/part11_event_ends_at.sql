@@ -0,0 +1,12 @@
+-- PART 11: Stored end timestamp for upcoming/completed filtering
+-- (e.date + e.end_time) > NOW() can't use an index; ends_at is a generated
+-- column, so every INSERT/UPDATE of date or end_time keeps it current.
+ALTER TABLE public.tbl_events
+  ADD COLUMN IF NOT EXISTS ends_at timestamp
+  GENERATED ALWAYS AS (date + end_time) STORED;
+
+CREATE INDEX IF NOT EXISTS tbl_events_ends_at_id_idx
+  ON public.tbl_events(ends_at, id);
+
+-- Verify with db/check_ends_at_plans.py: EXPLAIN (FORMAT JSON) on the
+-- upcoming/completed queries must show tbl_events_ends_at_id_idx.
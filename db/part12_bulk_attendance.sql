@@ -0,0 +1,54 @@
+-- PART 12: Bulk attendance marking (check-in desk)
+-- Marks a whole batch of students in one set-based UPDATE. Students can be
+-- given by id, by SRN, or both; one result row comes back per requested
+-- entry, in request order. Status codes:
+--   0 = marked, 1 = already marked, 2 = not registered, 3 = unknown SRN
+DROP FUNCTION IF EXISTS public.mark_attendance_bulk(bigint, bigint[], text[]);
+
+CREATE OR REPLACE FUNCTION public.mark_attendance_bulk(
+  p_event_id bigint,
+  p_user_ids bigint[],
+  p_srns text[]
+)
+RETURNS TABLE (user_id bigint, srn text, status integer)
+LANGUAGE plpgsql
+AS $function$
+BEGIN
+  RETURN QUERY
+  WITH requested AS (
+    SELECT u.uid, NULL::text AS req_srn, u.ord
+    FROM unnest(p_user_ids) WITH ORDINALITY AS u(uid, ord)
+    UNION ALL
+    SELECT s.id, r.req_srn, cardinality(p_user_ids) + r.ord
+    FROM unnest(p_srns) WITH ORDINALITY AS r(req_srn, ord)
+    LEFT JOIN tbl_students s ON s.srn = r.req_srn
+  ),
+  registered AS (
+    SELECT p.user_id AS uid
+    FROM tbl_event_participants p
+    WHERE p.event_id = p_event_id
+      AND p.user_id IN (SELECT q.uid FROM requested q)
+  ),
+  -- Re-checking attendance_status on the target row means a concurrent batch
+  -- that marked it first leaves this one reporting "already marked"
+  marked AS (
+    UPDATE tbl_event_participants p
+    SET attendance_status = TRUE
+    WHERE p.event_id = p_event_id
+      AND p.user_id IN (SELECT q.uid FROM requested q)
+      AND p.attendance_status IS NOT TRUE
+    RETURNING p.user_id AS uid
+  )
+  SELECT q.uid, q.req_srn,
+         CASE
+           WHEN q.uid IS NULL THEN 3
+           WHEN m.uid IS NOT NULL THEN 0
+           WHEN r.uid IS NOT NULL THEN 1
+           ELSE 2
+         END
+  FROM requested q
+  LEFT JOIN registered r ON r.uid = q.uid
+  LEFT JOIN marked m ON m.uid = q.uid
+  ORDER BY q.ord;
+END;
+$function$;
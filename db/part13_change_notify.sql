@@ -0,0 +1,77 @@
+-- PART 13: Change notifications for cross-replica cache invalidation
+-- Writes to the cached tables pg_notify('eventra_changes', payload) with a
+-- compact JSON payload, e.g. {"table":"tbl_tickets","event_id":12}. Each
+-- service replica LISTENs and evicts the matching cache entries. Postgres
+-- folds identical payloads within one transaction, so a batch touching many
+-- rows of one event sends a single message.
+CREATE OR REPLACE FUNCTION public.notify_table_change()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_row record;
+  v_event_id bigint;
+BEGIN
+  IF TG_LEVEL = 'STATEMENT' THEN
+    PERFORM pg_notify('eventra_changes', json_build_object('table', TG_TABLE_NAME)::text);
+    RETURN NULL;
+  END IF;
+
+  IF TG_OP = 'DELETE' THEN
+    v_row := OLD;
+  ELSE
+    v_row := NEW;
+  END IF;
+
+  IF TG_TABLE_NAME = 'tbl_events' THEN
+    v_event_id := v_row.id;
+  ELSIF TG_TABLE_NAME = 'tbl_ticket_shards' THEN
+    SELECT t.event_id INTO v_event_id FROM tbl_tickets t WHERE t.id = v_row.ticket_id;
+  ELSE
+    v_event_id := v_row.event_id;
+  END IF;
+
+  PERFORM pg_notify(
+    'eventra_changes',
+    json_build_object('table', TG_TABLE_NAME, 'event_id', v_event_id)::text
+  );
+  RETURN NULL;
+END;
+$function$;
+
+-- Per-row: the payload names the event, so only that event's entries go
+DROP TRIGGER IF EXISTS tbl_events_notify_change ON public.tbl_events;
+CREATE TRIGGER tbl_events_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.tbl_events
+  FOR EACH ROW EXECUTE FUNCTION public.notify_table_change();
+
+DROP TRIGGER IF EXISTS tbl_tickets_notify_change ON public.tbl_tickets;
+CREATE TRIGGER tbl_tickets_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.tbl_tickets
+  FOR EACH ROW EXECUTE FUNCTION public.notify_table_change();
+
+DROP TRIGGER IF EXISTS tbl_ticket_shards_notify_change ON public.tbl_ticket_shards;
+CREATE TRIGGER tbl_ticket_shards_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.tbl_ticket_shards
+  FOR EACH ROW EXECUTE FUNCTION public.notify_table_change();
+
+DROP TRIGGER IF EXISTS tbl_event_participants_notify_change ON public.tbl_event_participants;
+CREATE TRIGGER tbl_event_participants_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.tbl_event_participants
+  FOR EACH ROW EXECUTE FUNCTION public.notify_table_change();
+
+-- Per-statement: these lists are cached whole
+DROP TRIGGER IF EXISTS tbl_venues_notify_change ON public.tbl_venues;
+CREATE TRIGGER tbl_venues_notify_change
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.tbl_venues
+  FOR EACH STATEMENT EXECUTE FUNCTION public.notify_table_change();
+
+DROP TRIGGER IF EXISTS tbl_resources_notify_change ON public.tbl_resources;
+CREATE TRIGGER tbl_resources_notify_change
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.tbl_resources
+  FOR EACH STATEMENT EXECUTE FUNCTION public.notify_table_change();
+
+DROP TRIGGER IF EXISTS tbl_hosts_notify_change ON public.tbl_hosts;
+CREATE TRIGGER tbl_hosts_notify_change
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.tbl_hosts
+  FOR EACH STATEMENT EXECUTE FUNCTION public.notify_table_change();
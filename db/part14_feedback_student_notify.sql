@@ -0,0 +1,12 @@
+-- PART 14: Change notifications for feedback and students
+-- Extends part13 so the feedback and user services can invalidate (and
+-- re-issue ETags for) their cached lists across replicas.
+DROP TRIGGER IF EXISTS tbl_event_feedback_notify_change ON public.tbl_event_feedback;
+CREATE TRIGGER tbl_event_feedback_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.tbl_event_feedback
+  FOR EACH ROW EXECUTE FUNCTION public.notify_table_change();
+
+DROP TRIGGER IF EXISTS tbl_students_notify_change ON public.tbl_students;
+CREATE TRIGGER tbl_students_notify_change
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.tbl_students
+  FOR EACH STATEMENT EXECUTE FUNCTION public.notify_table_change();
@@ -0,0 +1,147 @@
+-- PART 15: Incrementally maintained rating aggregates
+-- One row per event with the review count, rating sum and a 1-5 histogram,
+-- kept current by a trigger on tbl_event_feedback in the same transaction
+-- as the feedback write, so averages are read from a single row instead of
+-- aggregating every review.
+CREATE TABLE IF NOT EXISTS public.tbl_event_rating_summary (
+  event_id bigint NOT NULL,
+  review_count integer NOT NULL DEFAULT 0,
+  rating_sum bigint NOT NULL DEFAULT 0,
+  rating_1 integer NOT NULL DEFAULT 0,
+  rating_2 integer NOT NULL DEFAULT 0,
+  rating_3 integer NOT NULL DEFAULT 0,
+  rating_4 integer NOT NULL DEFAULT 0,
+  rating_5 integer NOT NULL DEFAULT 0,
+  updated_at timestamptz NOT NULL DEFAULT now(),
+  CONSTRAINT tbl_event_rating_summary_pkey PRIMARY KEY (event_id),
+  CONSTRAINT tbl_event_rating_summary_event_id_fkey
+    FOREIGN KEY (event_id) REFERENCES public.tbl_events(id) ON DELETE CASCADE
+);
+
+-- Add (p_sign = 1) or remove (p_sign = -1) one rating from an event's summary
+CREATE OR REPLACE FUNCTION public.apply_rating_delta(
+  p_event_id bigint,
+  p_rating integer,
+  p_sign integer
+)
+RETURNS void
+LANGUAGE plpgsql
+AS $function$
+BEGIN
+  INSERT INTO tbl_event_rating_summary AS s
+    (event_id, review_count, rating_sum,
+     rating_1, rating_2, rating_3, rating_4, rating_5)
+  VALUES (
+    p_event_id, p_sign, p_sign * p_rating,
+    CASE WHEN p_rating = 1 THEN p_sign ELSE 0 END,
+    CASE WHEN p_rating = 2 THEN p_sign ELSE 0 END,
+    CASE WHEN p_rating = 3 THEN p_sign ELSE 0 END,
+    CASE WHEN p_rating = 4 THEN p_sign ELSE 0 END,
+    CASE WHEN p_rating = 5 THEN p_sign ELSE 0 END
+  )
+  ON CONFLICT (event_id) DO UPDATE SET
+    review_count = s.review_count + EXCLUDED.review_count,
+    rating_sum = s.rating_sum + EXCLUDED.rating_sum,
+    rating_1 = s.rating_1 + EXCLUDED.rating_1,
+    rating_2 = s.rating_2 + EXCLUDED.rating_2,
+    rating_3 = s.rating_3 + EXCLUDED.rating_3,
+    rating_4 = s.rating_4 + EXCLUDED.rating_4,
+    rating_5 = s.rating_5 + EXCLUDED.rating_5,
+    updated_at = now();
+END;
+$function$;
+
+CREATE OR REPLACE FUNCTION public.maintain_rating_summary()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $function$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.rating IS NOT NULL THEN
+    PERFORM apply_rating_delta(OLD.event_id, OLD.rating, -1);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.rating IS NOT NULL THEN
+    PERFORM apply_rating_delta(NEW.event_id, NEW.rating, 1);
+  END IF;
+  RETURN NULL;
+END;
+$function$;
+
+DROP TRIGGER IF EXISTS tbl_event_feedback_rating_summary ON public.tbl_event_feedback;
+CREATE TRIGGER tbl_event_feedback_rating_summary
+  AFTER INSERT OR DELETE OR UPDATE OF event_id, rating ON public.tbl_event_feedback
+  FOR EACH ROW EXECUTE FUNCTION public.maintain_rating_summary();
+
+-- Rebuild summaries from tbl_event_feedback (one event, or all when NULL).
+-- Blocks feedback writes while it runs; returns how many summaries changed.
+CREATE OR REPLACE FUNCTION public.reconcile_rating_summary(p_event_id bigint DEFAULT NULL)
+RETURNS integer
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_changed integer;
+  v_removed integer;
+BEGIN
+  LOCK TABLE tbl_event_feedback IN SHARE MODE;
+
+  WITH actual AS (
+    SELECT f.event_id,
+           COUNT(*)::integer AS review_count,
+           SUM(f.rating)::bigint AS rating_sum,
+           COUNT(*) FILTER (WHERE f.rating = 1)::integer AS rating_1,
+           COUNT(*) FILTER (WHERE f.rating = 2)::integer AS rating_2,
+           COUNT(*) FILTER (WHERE f.rating = 3)::integer AS rating_3,
+           COUNT(*) FILTER (WHERE f.rating = 4)::integer AS rating_4,
+           COUNT(*) FILTER (WHERE f.rating = 5)::integer AS rating_5
+    FROM tbl_event_feedback f
+    WHERE f.rating IS NOT NULL
+      AND (p_event_id IS NULL OR f.event_id = p_event_id)
+    GROUP BY f.event_id
+  )
+  INSERT INTO tbl_event_rating_summary AS s
+    (event_id, review_count, rating_sum,
+     rating_1, rating_2, rating_3, rating_4, rating_5)
+  SELECT * FROM actual
+  ON CONFLICT (event_id) DO UPDATE SET
+    review_count = EXCLUDED.review_count,
+    rating_sum = EXCLUDED.rating_sum,
+    rating_1 = EXCLUDED.rating_1,
+    rating_2 = EXCLUDED.rating_2,
+    rating_3 = EXCLUDED.rating_3,
+    rating_4 = EXCLUDED.rating_4,
+    rating_5 = EXCLUDED.rating_5,
+    updated_at = now()
+  WHERE (s.review_count, s.rating_sum, s.rating_1, s.rating_2,
+         s.rating_3, s.rating_4, s.rating_5)
+     IS DISTINCT FROM
+        (EXCLUDED.review_count, EXCLUDED.rating_sum, EXCLUDED.rating_1,
+         EXCLUDED.rating_2, EXCLUDED.rating_3, EXCLUDED.rating_4, EXCLUDED.rating_5);
+  GET DIAGNOSTICS v_changed = ROW_COUNT;
+
+  -- Summaries left behind for events that no longer have any feedback
+  DELETE FROM tbl_event_rating_summary s
+  WHERE (p_event_id IS NULL OR s.event_id = p_event_id)
+    AND NOT EXISTS (
+      SELECT 1 FROM tbl_event_feedback f
+      WHERE f.event_id = s.event_id AND f.rating IS NOT NULL
+    );
+  GET DIAGNOSTICS v_removed = ROW_COUNT;
+
+  RETURN v_changed + v_removed;
+END;
+$function$;
+
+-- Averages now come from the summary row
+CREATE OR REPLACE FUNCTION public.get_average_rating(p_event_id bigint)
+RETURNS numeric
+LANGUAGE sql
+STABLE
+AS $function$
+  select coalesce(
+    (select rating_sum::numeric / nullif(review_count, 0)
+     from tbl_event_rating_summary
+     where event_id = p_event_id),
+    0);
+$function$;
+
+-- Backfill
+SELECT public.reconcile_rating_summary();
@@ -0,0 +1,28 @@
+-- PART 16: Full-text and fuzzy search
+-- Events and feedback comments get a stored tsvector with a GIN index for
+-- word/prefix search; event and student names (and SRNs) get pg_trgm GIN
+-- indexes for substring and typo-tolerant matching. Backs the /search
+-- endpoints so the UI can look rows up instead of loading whole tables.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE public.tbl_events
+  ADD COLUMN IF NOT EXISTS search_vector tsvector
+  GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B')
+  ) STORED;
+CREATE INDEX IF NOT EXISTS tbl_events_search_vector_idx
+  ON public.tbl_events USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS tbl_events_name_trgm_idx
+  ON public.tbl_events USING gin (name gin_trgm_ops);
+
+ALTER TABLE public.tbl_event_feedback
+  ADD COLUMN IF NOT EXISTS comments_vector tsvector
+  GENERATED ALWAYS AS (to_tsvector('english', coalesce(comments, ''))) STORED;
+CREATE INDEX IF NOT EXISTS tbl_event_feedback_comments_vector_idx
+  ON public.tbl_event_feedback USING gin (comments_vector);
+
+CREATE INDEX IF NOT EXISTS tbl_students_name_trgm_idx
+  ON public.tbl_students USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS tbl_students_srn_trgm_idx
+  ON public.tbl_students USING gin (srn gin_trgm_ops);
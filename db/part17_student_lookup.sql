@@ -0,0 +1,8 @@
+-- PART 17: Student login lookup
+-- Case-insensitive prefix search on name/SRN (GET /students?prefix=) and
+-- exact SRN lookup (GET /students/by-srn/{srn}). text_pattern_ops lets
+-- LIKE 'abc%' use the btree regardless of the database collation.
+CREATE INDEX IF NOT EXISTS tbl_students_lower_name_prefix_idx
+  ON public.tbl_students(lower(name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS tbl_students_upper_srn_prefix_idx
+  ON public.tbl_students(upper(srn) text_pattern_ops);
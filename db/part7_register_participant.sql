@@ -0,0 +1,46 @@
+-- PART 7: Single-round-trip registration
+-- Status codes: 0 = registered, 1 = already registered,
+--               2 = ticket not found, 3 = sold out
+DROP FUNCTION IF EXISTS public.register_participant(bigint, bigint, bigint);
+
+CREATE OR REPLACE FUNCTION public.register_participant(
+  p_event_id bigint,
+  p_user_id bigint,
+  p_ticket_id bigint
+)
+RETURNS integer
+LANGUAGE plpgsql
+AS $function$
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM tbl_event_participants
+    WHERE event_id = p_event_id AND user_id = p_user_id
+  ) THEN
+    RETURN 1;
+  END IF;
+
+  -- Conditional decrement takes the ticket row lock only until this call's transaction ends
+  UPDATE tbl_tickets
+  SET quantity = quantity - 1
+  WHERE id = p_ticket_id AND quantity > 0;
+
+  IF NOT FOUND THEN
+    IF EXISTS (SELECT 1 FROM tbl_tickets WHERE id = p_ticket_id) THEN
+      RETURN 3;
+    END IF;
+    RETURN 2;
+  END IF;
+
+  INSERT INTO tbl_orders (ticket_id, user_id, order_time, payment_status)
+  VALUES (p_ticket_id, p_user_id, now(), 'Completed');
+
+  INSERT INTO tbl_event_participants (event_id, user_id, registration_time)
+  VALUES (p_event_id, p_user_id, now());
+
+  RETURN 0;
+EXCEPTION
+  -- A concurrent request for the same student won the race; the decrement is undone
+  WHEN unique_violation THEN
+    RETURN 1;
+END;
+$function$;
@@ -0,0 +1,204 @@
+-- PART 8: Sharded ticket inventory
+-- A ticket's stock can be split across N buckets in tbl_ticket_shards so that
+-- concurrent registrations lock different rows (FOR UPDATE SKIP LOCKED)
+-- instead of queueing on the single tbl_tickets row. For a sharded ticket,
+-- tbl_tickets.quantity is 0 and the available stock is the sum of its buckets.
+CREATE TABLE IF NOT EXISTS public.tbl_ticket_shards (
+  ticket_id bigint NOT NULL,
+  shard_no integer NOT NULL,
+  quantity integer NOT NULL DEFAULT 0,
+  CONSTRAINT tbl_ticket_shards_pkey PRIMARY KEY (ticket_id, shard_no),
+  CONSTRAINT tbl_ticket_shards_ticket_id_fkey
+    FOREIGN KEY (ticket_id) REFERENCES public.tbl_tickets(id) ON DELETE CASCADE,
+  CONSTRAINT tbl_ticket_shards_quantity_check CHECK (quantity >= 0)
+);
+
+-- Take one unit of stock; returns FALSE when the ticket is sold out (or missing)
+CREATE OR REPLACE FUNCTION public.claim_ticket_unit(p_ticket_id bigint)
+RETURNS boolean
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_shard integer;
+BEGIN
+  UPDATE tbl_tickets
+  SET quantity = quantity - 1
+  WHERE id = p_ticket_id AND quantity > 0;
+
+  IF FOUND THEN
+    RETURN TRUE;
+  END IF;
+
+  LOOP
+    -- Any bucket nobody else is holding, starting from a random one
+    SELECT shard_no INTO v_shard
+    FROM tbl_ticket_shards
+    WHERE ticket_id = p_ticket_id AND quantity > 0
+    ORDER BY random()
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED;
+    EXIT WHEN FOUND;
+
+    -- Every bucket with stock is busy: wait for one instead of reporting sold out
+    SELECT shard_no INTO v_shard
+    FROM tbl_ticket_shards
+    WHERE ticket_id = p_ticket_id AND quantity > 0
+    ORDER BY random()
+    LIMIT 1
+    FOR UPDATE;
+    EXIT WHEN FOUND;
+
+    IF NOT EXISTS (
+      SELECT 1 FROM tbl_ticket_shards
+      WHERE ticket_id = p_ticket_id AND quantity > 0
+    ) THEN
+      RETURN FALSE;
+    END IF;
+  END LOOP;
+
+  UPDATE tbl_ticket_shards
+  SET quantity = quantity - 1
+  WHERE ticket_id = p_ticket_id AND shard_no = v_shard;
+
+  RETURN TRUE;
+END;
+$function$;
+
+-- Put one unit of stock back, into an unlocked bucket when the ticket is sharded
+CREATE OR REPLACE FUNCTION public.return_ticket_unit(p_ticket_id bigint)
+RETURNS void
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_shard integer;
+BEGIN
+  SELECT shard_no INTO v_shard
+  FROM tbl_ticket_shards
+  WHERE ticket_id = p_ticket_id
+  ORDER BY random()
+  LIMIT 1
+  FOR UPDATE SKIP LOCKED;
+
+  IF NOT FOUND THEN
+    SELECT shard_no INTO v_shard
+    FROM tbl_ticket_shards
+    WHERE ticket_id = p_ticket_id
+    ORDER BY random()
+    LIMIT 1
+    FOR UPDATE;
+  END IF;
+
+  IF FOUND THEN
+    UPDATE tbl_ticket_shards
+    SET quantity = quantity + 1
+    WHERE ticket_id = p_ticket_id AND shard_no = v_shard;
+  ELSE
+    UPDATE tbl_tickets SET quantity = quantity + 1 WHERE id = p_ticket_id;
+  END IF;
+END;
+$function$;
+
+-- Redistribute a ticket's total stock across p_shards buckets (<= 1 collapses
+-- it back into tbl_tickets.quantity). Returns the total, or NULL if no ticket.
+CREATE OR REPLACE FUNCTION public.shard_ticket(p_ticket_id bigint, p_shards integer)
+RETURNS integer
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_total integer;
+BEGIN
+  SELECT quantity INTO v_total
+  FROM tbl_tickets
+  WHERE id = p_ticket_id
+  FOR UPDATE;
+
+  IF NOT FOUND THEN
+    RETURN NULL;
+  END IF;
+
+  PERFORM 1 FROM tbl_ticket_shards WHERE ticket_id = p_ticket_id FOR UPDATE;
+  v_total := v_total + COALESCE(
+    (SELECT SUM(quantity) FROM tbl_ticket_shards WHERE ticket_id = p_ticket_id), 0
+  );
+  DELETE FROM tbl_ticket_shards WHERE ticket_id = p_ticket_id;
+
+  IF p_shards <= 1 THEN
+    UPDATE tbl_tickets SET quantity = v_total WHERE id = p_ticket_id;
+  ELSE
+    INSERT INTO tbl_ticket_shards (ticket_id, shard_no, quantity)
+    SELECT p_ticket_id, n,
+           v_total / p_shards + CASE WHEN n < v_total % p_shards THEN 1 ELSE 0 END
+    FROM generate_series(0, p_shards - 1) AS n;
+    UPDATE tbl_tickets SET quantity = 0 WHERE id = p_ticket_id;
+  END IF;
+
+  RETURN v_total;
+END;
+$function$;
+
+-- register_participant (PART 7) now claims stock through claim_ticket_unit
+CREATE OR REPLACE FUNCTION public.register_participant(
+  p_event_id bigint,
+  p_user_id bigint,
+  p_ticket_id bigint
+)
+RETURNS integer
+LANGUAGE plpgsql
+AS $function$
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM tbl_event_participants
+    WHERE event_id = p_event_id AND user_id = p_user_id
+  ) THEN
+    RETURN 1;
+  END IF;
+
+  IF NOT claim_ticket_unit(p_ticket_id) THEN
+    IF EXISTS (SELECT 1 FROM tbl_tickets WHERE id = p_ticket_id) THEN
+      RETURN 3;
+    END IF;
+    RETURN 2;
+  END IF;
+
+  INSERT INTO tbl_orders (ticket_id, user_id, order_time, payment_status)
+  VALUES (p_ticket_id, p_user_id, now(), 'Completed');
+
+  INSERT INTO tbl_event_participants (event_id, user_id, registration_time)
+  VALUES (p_event_id, p_user_id, now());
+
+  RETURN 0;
+EXCEPTION
+  -- A concurrent request for the same student won the race; the claim is undone
+  WHEN unique_violation THEN
+    RETURN 1;
+END;
+$function$;
+
+-- Status codes: 0 = cancelled, 1 = registration not found
+CREATE OR REPLACE FUNCTION public.cancel_participant(p_event_id bigint, p_user_id bigint)
+RETURNS integer
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_ticket_id bigint;
+BEGIN
+  FOR v_ticket_id IN
+    DELETE FROM tbl_orders o
+    USING tbl_tickets t
+    WHERE o.ticket_id = t.id
+      AND o.user_id = p_user_id
+      AND t.event_id = p_event_id
+    RETURNING o.ticket_id
+  LOOP
+    PERFORM return_ticket_unit(v_ticket_id);
+  END LOOP;
+
+  DELETE FROM tbl_event_participants
+  WHERE event_id = p_event_id AND user_id = p_user_id;
+
+  IF NOT FOUND THEN
+    RETURN 1;
+  END IF;
+  RETURN 0;
+END;
+$function$;
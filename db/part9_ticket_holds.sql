@@ -0,0 +1,160 @@
+-- PART 9: Short-lived ticket holds (reserve, then confirm)
+-- A hold claims one unit of stock up front (claim_ticket_unit) and keeps it
+-- for a TTL; confirming turns it into the order + participant rows without
+-- touching ticket stock again. Lapsed holds are returned by
+-- release_expired_holds(). Status codes extend register_participant's:
+--   0 = ok, 1 = already registered, 2 = ticket not found, 3 = sold out,
+--   4 = hold not found, 5 = hold expired
+CREATE TABLE IF NOT EXISTS public.tbl_ticket_holds (
+  id bigserial,
+  ticket_id bigint NOT NULL,
+  event_id bigint NOT NULL,
+  user_id bigint NOT NULL,
+  created_at timestamptz NOT NULL DEFAULT now(),
+  expires_at timestamptz NOT NULL,
+  CONSTRAINT tbl_ticket_holds_pkey PRIMARY KEY (id),
+  CONSTRAINT tbl_ticket_holds_ticket_id_fkey
+    FOREIGN KEY (ticket_id) REFERENCES public.tbl_tickets(id) ON DELETE CASCADE,
+  CONSTRAINT tbl_ticket_holds_event_user_unique UNIQUE (event_id, user_id)
+);
+
+CREATE INDEX IF NOT EXISTS tbl_ticket_holds_expires_at_idx
+  ON public.tbl_ticket_holds(expires_at);
+
+-- Claim a unit and hold it for p_ttl_seconds. A student keeps at most one hold
+-- per event: a new request replaces (and restocks) the previous one.
+DROP FUNCTION IF EXISTS public.hold_ticket(bigint, bigint, bigint, integer);
+
+CREATE OR REPLACE FUNCTION public.hold_ticket(
+  p_event_id bigint,
+  p_user_id bigint,
+  p_ticket_id bigint,
+  p_ttl_seconds integer
+)
+RETURNS TABLE (status integer, hold_id bigint, expires_at timestamptz)
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_old_ticket_id bigint;
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM tbl_event_participants p
+    WHERE p.event_id = p_event_id AND p.user_id = p_user_id
+  ) THEN
+    RETURN QUERY SELECT 1, NULL::bigint, NULL::timestamptz;
+    RETURN;
+  END IF;
+
+  DELETE FROM tbl_ticket_holds h
+  WHERE h.event_id = p_event_id AND h.user_id = p_user_id
+  RETURNING h.ticket_id INTO v_old_ticket_id;
+
+  IF v_old_ticket_id IS NOT NULL THEN
+    PERFORM return_ticket_unit(v_old_ticket_id);
+  END IF;
+
+  IF NOT claim_ticket_unit(p_ticket_id) THEN
+    IF EXISTS (SELECT 1 FROM tbl_tickets t WHERE t.id = p_ticket_id) THEN
+      RETURN QUERY SELECT 3, NULL::bigint, NULL::timestamptz;
+    ELSE
+      RETURN QUERY SELECT 2, NULL::bigint, NULL::timestamptz;
+    END IF;
+    RETURN;
+  END IF;
+
+  RETURN QUERY
+  INSERT INTO tbl_ticket_holds AS h (ticket_id, event_id, user_id, expires_at)
+  VALUES (p_ticket_id, p_event_id, p_user_id,
+          now() + make_interval(secs => p_ttl_seconds))
+  RETURNING 0, h.id, h.expires_at;
+EXCEPTION
+  -- A concurrent hold request for the same student won the race
+  WHEN unique_violation THEN
+    RETURN QUERY SELECT 1, NULL::bigint, NULL::timestamptz;
+END;
+$function$;
+
+-- Turn an unexpired hold into the order + participant rows
+CREATE OR REPLACE FUNCTION public.confirm_hold(p_hold_id bigint, p_user_id bigint)
+RETURNS integer
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_hold tbl_ticket_holds%ROWTYPE;
+BEGIN
+  DELETE FROM tbl_ticket_holds
+  WHERE id = p_hold_id AND user_id = p_user_id
+  RETURNING * INTO v_hold;
+
+  IF NOT FOUND THEN
+    RETURN 4;
+  END IF;
+
+  IF v_hold.expires_at <= now() THEN
+    PERFORM return_ticket_unit(v_hold.ticket_id);
+    RETURN 5;
+  END IF;
+
+  BEGIN
+    INSERT INTO tbl_orders (ticket_id, user_id, order_time, payment_status)
+    VALUES (v_hold.ticket_id, v_hold.user_id, now(), 'Completed');
+
+    INSERT INTO tbl_event_participants (event_id, user_id, registration_time)
+    VALUES (v_hold.event_id, v_hold.user_id, now());
+  EXCEPTION
+    -- Registered through another path meanwhile: give the held unit back
+    WHEN unique_violation THEN
+      PERFORM return_ticket_unit(v_hold.ticket_id);
+      RETURN 1;
+  END;
+
+  RETURN 0;
+END;
+$function$;
+
+-- Give up a hold early; 0 = released, 4 = hold not found
+CREATE OR REPLACE FUNCTION public.release_hold(p_hold_id bigint, p_user_id bigint)
+RETURNS integer
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_ticket_id bigint;
+BEGIN
+  DELETE FROM tbl_ticket_holds
+  WHERE id = p_hold_id AND user_id = p_user_id
+  RETURNING ticket_id INTO v_ticket_id;
+
+  IF NOT FOUND THEN
+    RETURN 4;
+  END IF;
+
+  PERFORM return_ticket_unit(v_ticket_id);
+  RETURN 0;
+END;
+$function$;
+
+-- Return lapsed holds to stock; safe to run from several replicas at once
+CREATE OR REPLACE FUNCTION public.release_expired_holds()
+RETURNS integer
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_ticket_id bigint;
+  v_released integer := 0;
+BEGIN
+  FOR v_ticket_id IN
+    DELETE FROM tbl_ticket_holds
+    WHERE id IN (
+      SELECT id FROM tbl_ticket_holds
+      WHERE expires_at <= now()
+      FOR UPDATE SKIP LOCKED
+    )
+    RETURNING ticket_id
+  LOOP
+    PERFORM return_ticket_unit(v_ticket_id);
+    v_released := v_released + 1;
+  END LOOP;
+
+  RETURN v_released;
+END;
+$function$;
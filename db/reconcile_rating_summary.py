@@ -0,0 +1,51 @@
+"""
+Backfill / reconcile tbl_event_rating_summary from tbl_event_feedback.
+
+Runs reconcile_rating_summary() (db/part15_rating_summary.sql) for one event
+or for every event, and reports how many summaries were out of date.
+
+    python db/reconcile_rating_summary.py            # all events
+    python db/reconcile_rating_summary.py --event 12
+
+Feedback writes are blocked while it runs, so prefer a quiet moment for a
+full run on a large table.
+"""
+
+import os
+import argparse
+import psycopg2
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DB_CONFIG = {
+    "host": os.getenv("SUPABASE_DB_HOST"),
+    "dbname": os.getenv("SUPABASE_DB_NAME"),
+    "user": os.getenv("SUPABASE_DB_USER"),
+    "password": os.getenv("SUPABASE_DB_PASSWORD"),
+    "port": os.getenv("SUPABASE_DB_PORT", "5432"),
+    "sslmode": "require",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--event", type=int, default=None,
+                        help="only reconcile this event id")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT reconcile_rating_summary(%s)", (args.event,))
+            corrected = cur.fetchone()[0]
+        conn.commit()
+    finally:
+        conn.close()
+
+    scope = f"event {args.event}" if args.event is not None else "all events"
+    print(f"Reconciled {scope}: {corrected} summaries corrected")
+
+
+if __name__ == "__main__":
+    main()
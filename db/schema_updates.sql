@@ -242,3 +242,793 @@ CREATE INDEX IF NOT EXISTS tbl_event_feedback_event_id_idx
   ON public.tbl_event_feedback(event_id);
 CREATE INDEX IF NOT EXISTS tbl_event_resources_event_id_idx
   ON public.tbl_event_resources(event_id);
+
+-- ============================================================
+-- PART 7: Single-round-trip registration
+-- Status codes: 0 = registered, 1 = already registered,
+--               2 = ticket not found, 3 = sold out
+-- ============================================================
+DROP FUNCTION IF EXISTS public.register_participant(bigint, bigint, bigint);
+
+CREATE OR REPLACE FUNCTION public.register_participant(
+  p_event_id bigint,
+  p_user_id bigint,
+  p_ticket_id bigint
+)
+RETURNS integer
+LANGUAGE plpgsql
+AS $function$
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM tbl_event_participants
+    WHERE event_id = p_event_id AND user_id = p_user_id
+  ) THEN
+    RETURN 1;
+  END IF;
+
+  -- Conditional decrement takes the ticket row lock only until this call's transaction ends
+  UPDATE tbl_tickets
+  SET quantity = quantity - 1
+  WHERE id = p_ticket_id AND quantity > 0;
+
+  IF NOT FOUND THEN
+    IF EXISTS (SELECT 1 FROM tbl_tickets WHERE id = p_ticket_id) THEN
+      RETURN 3;
+    END IF;
+    RETURN 2;
+  END IF;
+
+  INSERT INTO tbl_orders (ticket_id, user_id, order_time, payment_status)
+  VALUES (p_ticket_id, p_user_id, now(), 'Completed');
+
+  INSERT INTO tbl_event_participants (event_id, user_id, registration_time)
+  VALUES (p_event_id, p_user_id, now());
+
+  RETURN 0;
+EXCEPTION
+  -- A concurrent request for the same student won the race; the decrement is undone
+  WHEN unique_violation THEN
+    RETURN 1;
+END;
+$function$;
+
+-- ============================================================
+-- PART 8: Sharded ticket inventory
+-- A ticket's stock can be split across N buckets in tbl_ticket_shards so that
+-- concurrent registrations lock different rows (FOR UPDATE SKIP LOCKED)
+-- instead of queueing on the single tbl_tickets row. For a sharded ticket,
+-- tbl_tickets.quantity is 0 and the available stock is the sum of its buckets.
+-- ============================================================
+CREATE TABLE IF NOT EXISTS public.tbl_ticket_shards (
+  ticket_id bigint NOT NULL,
+  shard_no integer NOT NULL,
+  quantity integer NOT NULL DEFAULT 0,
+  CONSTRAINT tbl_ticket_shards_pkey PRIMARY KEY (ticket_id, shard_no),
+  CONSTRAINT tbl_ticket_shards_ticket_id_fkey
+    FOREIGN KEY (ticket_id) REFERENCES public.tbl_tickets(id) ON DELETE CASCADE,
+  CONSTRAINT tbl_ticket_shards_quantity_check CHECK (quantity >= 0)
+);
+
+-- Take one unit of stock; returns FALSE when the ticket is sold out (or missing)
+CREATE OR REPLACE FUNCTION public.claim_ticket_unit(p_ticket_id bigint)
+RETURNS boolean
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_shard integer;
+BEGIN
+  UPDATE tbl_tickets
+  SET quantity = quantity - 1
+  WHERE id = p_ticket_id AND quantity > 0;
+
+  IF FOUND THEN
+    RETURN TRUE;
+  END IF;
+
+  LOOP
+    -- Any bucket nobody else is holding, starting from a random one
+    SELECT shard_no INTO v_shard
+    FROM tbl_ticket_shards
+    WHERE ticket_id = p_ticket_id AND quantity > 0
+    ORDER BY random()
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED;
+    EXIT WHEN FOUND;
+
+    -- Every bucket with stock is busy: wait for one instead of reporting sold out
+    SELECT shard_no INTO v_shard
+    FROM tbl_ticket_shards
+    WHERE ticket_id = p_ticket_id AND quantity > 0
+    ORDER BY random()
+    LIMIT 1
+    FOR UPDATE;
+    EXIT WHEN FOUND;
+
+    IF NOT EXISTS (
+      SELECT 1 FROM tbl_ticket_shards
+      WHERE ticket_id = p_ticket_id AND quantity > 0
+    ) THEN
+      RETURN FALSE;
+    END IF;
+  END LOOP;
+
+  UPDATE tbl_ticket_shards
+  SET quantity = quantity - 1
+  WHERE ticket_id = p_ticket_id AND shard_no = v_shard;
+
+  RETURN TRUE;
+END;
+$function$;
+
+-- Put one unit of stock back, into an unlocked bucket when the ticket is sharded
+CREATE OR REPLACE FUNCTION public.return_ticket_unit(p_ticket_id bigint)
+RETURNS void
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_shard integer;
+BEGIN
+  SELECT shard_no INTO v_shard
+  FROM tbl_ticket_shards
+  WHERE ticket_id = p_ticket_id
+  ORDER BY random()
+  LIMIT 1
+  FOR UPDATE SKIP LOCKED;
+
+  IF NOT FOUND THEN
+    SELECT shard_no INTO v_shard
+    FROM tbl_ticket_shards
+    WHERE ticket_id = p_ticket_id
+    ORDER BY random()
+    LIMIT 1
+    FOR UPDATE;
+  END IF;
+
+  IF FOUND THEN
+    UPDATE tbl_ticket_shards
+    SET quantity = quantity + 1
+    WHERE ticket_id = p_ticket_id AND shard_no = v_shard;
+  ELSE
+    UPDATE tbl_tickets SET quantity = quantity + 1 WHERE id = p_ticket_id;
+  END IF;
+END;
+$function$;
+
+-- Redistribute a ticket's total stock across p_shards buckets (<= 1 collapses
+-- it back into tbl_tickets.quantity). Returns the total, or NULL if no ticket.
+CREATE OR REPLACE FUNCTION public.shard_ticket(p_ticket_id bigint, p_shards integer)
+RETURNS integer
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_total integer;
+BEGIN
+  SELECT quantity INTO v_total
+  FROM tbl_tickets
+  WHERE id = p_ticket_id
+  FOR UPDATE;
+
+  IF NOT FOUND THEN
+    RETURN NULL;
+  END IF;
+
+  PERFORM 1 FROM tbl_ticket_shards WHERE ticket_id = p_ticket_id FOR UPDATE;
+  v_total := v_total + COALESCE(
+    (SELECT SUM(quantity) FROM tbl_ticket_shards WHERE ticket_id = p_ticket_id), 0
+  );
+  DELETE FROM tbl_ticket_shards WHERE ticket_id = p_ticket_id;
+
+  IF p_shards <= 1 THEN
+    UPDATE tbl_tickets SET quantity = v_total WHERE id = p_ticket_id;
+  ELSE
+    INSERT INTO tbl_ticket_shards (ticket_id, shard_no, quantity)
+    SELECT p_ticket_id, n,
+           v_total / p_shards + CASE WHEN n < v_total % p_shards THEN 1 ELSE 0 END
+    FROM generate_series(0, p_shards - 1) AS n;
+    UPDATE tbl_tickets SET quantity = 0 WHERE id = p_ticket_id;
+  END IF;
+
+  RETURN v_total;
+END;
+$function$;
+
+-- register_participant (PART 7) now claims stock through claim_ticket_unit
+CREATE OR REPLACE FUNCTION public.register_participant(
+  p_event_id bigint,
+  p_user_id bigint,
+  p_ticket_id bigint
+)
+RETURNS integer
+LANGUAGE plpgsql
+AS $function$
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM tbl_event_participants
+    WHERE event_id = p_event_id AND user_id = p_user_id
+  ) THEN
+    RETURN 1;
+  END IF;
+
+  IF NOT claim_ticket_unit(p_ticket_id) THEN
+    IF EXISTS (SELECT 1 FROM tbl_tickets WHERE id = p_ticket_id) THEN
+      RETURN 3;
+    END IF;
+    RETURN 2;
+  END IF;
+
+  INSERT INTO tbl_orders (ticket_id, user_id, order_time, payment_status)
+  VALUES (p_ticket_id, p_user_id, now(), 'Completed');
+
+  INSERT INTO tbl_event_participants (event_id, user_id, registration_time)
+  VALUES (p_event_id, p_user_id, now());
+
+  RETURN 0;
+EXCEPTION
+  -- A concurrent request for the same student won the race; the claim is undone
+  WHEN unique_violation THEN
+    RETURN 1;
+END;
+$function$;
+
+-- Status codes: 0 = cancelled, 1 = registration not found
+CREATE OR REPLACE FUNCTION public.cancel_participant(p_event_id bigint, p_user_id bigint)
+RETURNS integer
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_ticket_id bigint;
+BEGIN
+  FOR v_ticket_id IN
+    DELETE FROM tbl_orders o
+    USING tbl_tickets t
+    WHERE o.ticket_id = t.id
+      AND o.user_id = p_user_id
+      AND t.event_id = p_event_id
+    RETURNING o.ticket_id
+  LOOP
+    PERFORM return_ticket_unit(v_ticket_id);
+  END LOOP;
+
+  DELETE FROM tbl_event_participants
+  WHERE event_id = p_event_id AND user_id = p_user_id;
+
+  IF NOT FOUND THEN
+    RETURN 1;
+  END IF;
+  RETURN 0;
+END;
+$function$;
+
+-- ============================================================
+-- PART 9: Short-lived ticket holds (reserve, then confirm)
+-- A hold claims one unit of stock up front (claim_ticket_unit) and keeps it
+-- for a TTL; confirming turns it into the order + participant rows without
+-- touching ticket stock again. Lapsed holds are returned by
+-- release_expired_holds(). Status codes extend register_participant's:
+--   0 = ok, 1 = already registered, 2 = ticket not found, 3 = sold out,
+--   4 = hold not found, 5 = hold expired
+-- ============================================================
+CREATE TABLE IF NOT EXISTS public.tbl_ticket_holds (
+  id bigserial,
+  ticket_id bigint NOT NULL,
+  event_id bigint NOT NULL,
+  user_id bigint NOT NULL,
+  created_at timestamptz NOT NULL DEFAULT now(),
+  expires_at timestamptz NOT NULL,
+  CONSTRAINT tbl_ticket_holds_pkey PRIMARY KEY (id),
+  CONSTRAINT tbl_ticket_holds_ticket_id_fkey
+    FOREIGN KEY (ticket_id) REFERENCES public.tbl_tickets(id) ON DELETE CASCADE,
+  CONSTRAINT tbl_ticket_holds_event_user_unique UNIQUE (event_id, user_id)
+);
+
+CREATE INDEX IF NOT EXISTS tbl_ticket_holds_expires_at_idx
+  ON public.tbl_ticket_holds(expires_at);
+
+-- Claim a unit and hold it for p_ttl_seconds. A student keeps at most one hold
+-- per event: a new request replaces (and restocks) the previous one.
+DROP FUNCTION IF EXISTS public.hold_ticket(bigint, bigint, bigint, integer);
+
+CREATE OR REPLACE FUNCTION public.hold_ticket(
+  p_event_id bigint,
+  p_user_id bigint,
+  p_ticket_id bigint,
+  p_ttl_seconds integer
+)
+RETURNS TABLE (status integer, hold_id bigint, expires_at timestamptz)
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_old_ticket_id bigint;
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM tbl_event_participants p
+    WHERE p.event_id = p_event_id AND p.user_id = p_user_id
+  ) THEN
+    RETURN QUERY SELECT 1, NULL::bigint, NULL::timestamptz;
+    RETURN;
+  END IF;
+
+  DELETE FROM tbl_ticket_holds h
+  WHERE h.event_id = p_event_id AND h.user_id = p_user_id
+  RETURNING h.ticket_id INTO v_old_ticket_id;
+
+  IF v_old_ticket_id IS NOT NULL THEN
+    PERFORM return_ticket_unit(v_old_ticket_id);
+  END IF;
+
+  IF NOT claim_ticket_unit(p_ticket_id) THEN
+    IF EXISTS (SELECT 1 FROM tbl_tickets t WHERE t.id = p_ticket_id) THEN
+      RETURN QUERY SELECT 3, NULL::bigint, NULL::timestamptz;
+    ELSE
+      RETURN QUERY SELECT 2, NULL::bigint, NULL::timestamptz;
+    END IF;
+    RETURN;
+  END IF;
+
+  RETURN QUERY
+  INSERT INTO tbl_ticket_holds AS h (ticket_id, event_id, user_id, expires_at)
+  VALUES (p_ticket_id, p_event_id, p_user_id,
+          now() + make_interval(secs => p_ttl_seconds))
+  RETURNING 0, h.id, h.expires_at;
+EXCEPTION
+  -- A concurrent hold request for the same student won the race
+  WHEN unique_violation THEN
+    RETURN QUERY SELECT 1, NULL::bigint, NULL::timestamptz;
+END;
+$function$;
+
+-- Turn an unexpired hold into the order + participant rows
+CREATE OR REPLACE FUNCTION public.confirm_hold(p_hold_id bigint, p_user_id bigint)
+RETURNS integer
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_hold tbl_ticket_holds%ROWTYPE;
+BEGIN
+  DELETE FROM tbl_ticket_holds
+  WHERE id = p_hold_id AND user_id = p_user_id
+  RETURNING * INTO v_hold;
+
+  IF NOT FOUND THEN
+    RETURN 4;
+  END IF;
+
+  IF v_hold.expires_at <= now() THEN
+    PERFORM return_ticket_unit(v_hold.ticket_id);
+    RETURN 5;
+  END IF;
+
+  BEGIN
+    INSERT INTO tbl_orders (ticket_id, user_id, order_time, payment_status)
+    VALUES (v_hold.ticket_id, v_hold.user_id, now(), 'Completed');
+
+    INSERT INTO tbl_event_participants (event_id, user_id, registration_time)
+    VALUES (v_hold.event_id, v_hold.user_id, now());
+  EXCEPTION
+    -- Registered through another path meanwhile: give the held unit back
+    WHEN unique_violation THEN
+      PERFORM return_ticket_unit(v_hold.ticket_id);
+      RETURN 1;
+  END;
+
+  RETURN 0;
+END;
+$function$;
+
+-- Give up a hold early; 0 = released, 4 = hold not found
+CREATE OR REPLACE FUNCTION public.release_hold(p_hold_id bigint, p_user_id bigint)
+RETURNS integer
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_ticket_id bigint;
+BEGIN
+  DELETE FROM tbl_ticket_holds
+  WHERE id = p_hold_id AND user_id = p_user_id
+  RETURNING ticket_id INTO v_ticket_id;
+
+  IF NOT FOUND THEN
+    RETURN 4;
+  END IF;
+
+  PERFORM return_ticket_unit(v_ticket_id);
+  RETURN 0;
+END;
+$function$;
+
+-- Return lapsed holds to stock; safe to run from several replicas at once
+CREATE OR REPLACE FUNCTION public.release_expired_holds()
+RETURNS integer
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_ticket_id bigint;
+  v_released integer := 0;
+BEGIN
+  FOR v_ticket_id IN
+    DELETE FROM tbl_ticket_holds
+    WHERE id IN (
+      SELECT id FROM tbl_ticket_holds
+      WHERE expires_at <= now()
+      FOR UPDATE SKIP LOCKED
+    )
+    RETURNING ticket_id
+  LOOP
+    PERFORM return_ticket_unit(v_ticket_id);
+    v_released := v_released + 1;
+  END LOOP;
+
+  RETURN v_released;
+END;
+$function$;
+
+-- ============================================================
+-- PART 10: Indexes backing keyset pagination on the list endpoints
+-- ============================================================
+CREATE INDEX IF NOT EXISTS tbl_events_date_id_idx
+  ON public.tbl_events(date, id);
+CREATE INDEX IF NOT EXISTS tbl_students_name_id_idx
+  ON public.tbl_students(name, id);
+CREATE INDEX IF NOT EXISTS tbl_resources_name_id_idx
+  ON public.tbl_resources(name, id);
+CREATE INDEX IF NOT EXISTS tbl_event_feedback_event_id_id_idx
+  ON public.tbl_event_feedback(event_id, id);
+
+-- ============================================================
+-- PART 11: Stored end timestamp for upcoming/completed filtering
+-- (e.date + e.end_time) > NOW() can't use an index; ends_at is a generated
+-- column, so every INSERT/UPDATE of date or end_time keeps it current.
+-- ============================================================
+ALTER TABLE public.tbl_events
+  ADD COLUMN IF NOT EXISTS ends_at timestamp
+  GENERATED ALWAYS AS (date + end_time) STORED;
+
+CREATE INDEX IF NOT EXISTS tbl_events_ends_at_id_idx
+  ON public.tbl_events(ends_at, id);
+
+-- Verify with db/check_ends_at_plans.py: EXPLAIN (FORMAT JSON) on the
+-- upcoming/completed queries must show tbl_events_ends_at_id_idx.
+
+-- ============================================================
+-- PART 12: Bulk attendance marking (check-in desk)
+-- Marks a whole batch of students in one set-based UPDATE. Students can be
+-- given by id, by SRN, or both; one result row comes back per requested
+-- entry, in request order. Status codes:
+--   0 = marked, 1 = already marked, 2 = not registered, 3 = unknown SRN
+-- ============================================================
+DROP FUNCTION IF EXISTS public.mark_attendance_bulk(bigint, bigint[], text[]);
+
+CREATE OR REPLACE FUNCTION public.mark_attendance_bulk(
+  p_event_id bigint,
+  p_user_ids bigint[],
+  p_srns text[]
+)
+RETURNS TABLE (user_id bigint, srn text, status integer)
+LANGUAGE plpgsql
+AS $function$
+BEGIN
+  RETURN QUERY
+  WITH requested AS (
+    SELECT u.uid, NULL::text AS req_srn, u.ord
+    FROM unnest(p_user_ids) WITH ORDINALITY AS u(uid, ord)
+    UNION ALL
+    SELECT s.id, r.req_srn, cardinality(p_user_ids) + r.ord
+    FROM unnest(p_srns) WITH ORDINALITY AS r(req_srn, ord)
+    LEFT JOIN tbl_students s ON s.srn = r.req_srn
+  ),
+  registered AS (
+    SELECT p.user_id AS uid
+    FROM tbl_event_participants p
+    WHERE p.event_id = p_event_id
+      AND p.user_id IN (SELECT q.uid FROM requested q)
+  ),
+  -- Re-checking attendance_status on the target row means a concurrent batch
+  -- that marked it first leaves this one reporting "already marked"
+  marked AS (
+    UPDATE tbl_event_participants p
+    SET attendance_status = TRUE
+    WHERE p.event_id = p_event_id
+      AND p.user_id IN (SELECT q.uid FROM requested q)
+      AND p.attendance_status IS NOT TRUE
+    RETURNING p.user_id AS uid
+  )
+  SELECT q.uid, q.req_srn,
+         CASE
+           WHEN q.uid IS NULL THEN 3
+           WHEN m.uid IS NOT NULL THEN 0
+           WHEN r.uid IS NOT NULL THEN 1
+           ELSE 2
+         END
+  FROM requested q
+  LEFT JOIN registered r ON r.uid = q.uid
+  LEFT JOIN marked m ON m.uid = q.uid
+  ORDER BY q.ord;
+END;
+$function$;
+
+-- ============================================================
+-- PART 13: Change notifications for cross-replica cache invalidation
+-- Writes to the cached tables pg_notify('eventra_changes', payload) with a
+-- compact JSON payload, e.g. {"table":"tbl_tickets","event_id":12}. Each
+-- service replica LISTENs and evicts the matching cache entries. Postgres
+-- folds identical payloads within one transaction, so a batch touching many
+-- rows of one event sends a single message.
+-- ============================================================
+CREATE OR REPLACE FUNCTION public.notify_table_change()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_row record;
+  v_event_id bigint;
+BEGIN
+  IF TG_LEVEL = 'STATEMENT' THEN
+    PERFORM pg_notify('eventra_changes', json_build_object('table', TG_TABLE_NAME)::text);
+    RETURN NULL;
+  END IF;
+
+  IF TG_OP = 'DELETE' THEN
+    v_row := OLD;
+  ELSE
+    v_row := NEW;
+  END IF;
+
+  IF TG_TABLE_NAME = 'tbl_events' THEN
+    v_event_id := v_row.id;
+  ELSIF TG_TABLE_NAME = 'tbl_ticket_shards' THEN
+    SELECT t.event_id INTO v_event_id FROM tbl_tickets t WHERE t.id = v_row.ticket_id;
+  ELSE
+    v_event_id := v_row.event_id;
+  END IF;
+
+  PERFORM pg_notify(
+    'eventra_changes',
+    json_build_object('table', TG_TABLE_NAME, 'event_id', v_event_id)::text
+  );
+  RETURN NULL;
+END;
+$function$;
+
+-- Per-row: the payload names the event, so only that event's entries go
+DROP TRIGGER IF EXISTS tbl_events_notify_change ON public.tbl_events;
+CREATE TRIGGER tbl_events_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.tbl_events
+  FOR EACH ROW EXECUTE FUNCTION public.notify_table_change();
+
+DROP TRIGGER IF EXISTS tbl_tickets_notify_change ON public.tbl_tickets;
+CREATE TRIGGER tbl_tickets_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.tbl_tickets
+  FOR EACH ROW EXECUTE FUNCTION public.notify_table_change();
+
+DROP TRIGGER IF EXISTS tbl_ticket_shards_notify_change ON public.tbl_ticket_shards;
+CREATE TRIGGER tbl_ticket_shards_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.tbl_ticket_shards
+  FOR EACH ROW EXECUTE FUNCTION public.notify_table_change();
+
+DROP TRIGGER IF EXISTS tbl_event_participants_notify_change ON public.tbl_event_participants;
+CREATE TRIGGER tbl_event_participants_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.tbl_event_participants
+  FOR EACH ROW EXECUTE FUNCTION public.notify_table_change();
+
+-- Per-statement: these lists are cached whole
+DROP TRIGGER IF EXISTS tbl_venues_notify_change ON public.tbl_venues;
+CREATE TRIGGER tbl_venues_notify_change
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.tbl_venues
+  FOR EACH STATEMENT EXECUTE FUNCTION public.notify_table_change();
+
+DROP TRIGGER IF EXISTS tbl_resources_notify_change ON public.tbl_resources;
+CREATE TRIGGER tbl_resources_notify_change
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.tbl_resources
+  FOR EACH STATEMENT EXECUTE FUNCTION public.notify_table_change();
+
+DROP TRIGGER IF EXISTS tbl_hosts_notify_change ON public.tbl_hosts;
+CREATE TRIGGER tbl_hosts_notify_change
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.tbl_hosts
+  FOR EACH STATEMENT EXECUTE FUNCTION public.notify_table_change();
+
+-- ============================================================
+-- PART 14: Change notifications for feedback and students
+-- Extends part13 so the feedback and user services can invalidate (and
+-- re-issue ETags for) their cached lists across replicas.
+-- ============================================================
+DROP TRIGGER IF EXISTS tbl_event_feedback_notify_change ON public.tbl_event_feedback;
+CREATE TRIGGER tbl_event_feedback_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.tbl_event_feedback
+  FOR EACH ROW EXECUTE FUNCTION public.notify_table_change();
+
+DROP TRIGGER IF EXISTS tbl_students_notify_change ON public.tbl_students;
+CREATE TRIGGER tbl_students_notify_change
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.tbl_students
+  FOR EACH STATEMENT EXECUTE FUNCTION public.notify_table_change();
+
+-- ============================================================
+-- PART 15: Incrementally maintained rating aggregates
+-- One row per event with the review count, rating sum and a 1-5 histogram,
+-- kept current by a trigger on tbl_event_feedback in the same transaction
+-- as the feedback write, so averages are read from a single row instead of
+-- aggregating every review.
+-- ============================================================
+CREATE TABLE IF NOT EXISTS public.tbl_event_rating_summary (
+  event_id bigint NOT NULL,
+  review_count integer NOT NULL DEFAULT 0,
+  rating_sum bigint NOT NULL DEFAULT 0,
+  rating_1 integer NOT NULL DEFAULT 0,
+  rating_2 integer NOT NULL DEFAULT 0,
+  rating_3 integer NOT NULL DEFAULT 0,
+  rating_4 integer NOT NULL DEFAULT 0,
+  rating_5 integer NOT NULL DEFAULT 0,
+  updated_at timestamptz NOT NULL DEFAULT now(),
+  CONSTRAINT tbl_event_rating_summary_pkey PRIMARY KEY (event_id),
+  CONSTRAINT tbl_event_rating_summary_event_id_fkey
+    FOREIGN KEY (event_id) REFERENCES public.tbl_events(id) ON DELETE CASCADE
+);
+
+-- Add (p_sign = 1) or remove (p_sign = -1) one rating from an event's summary
+CREATE OR REPLACE FUNCTION public.apply_rating_delta(
+  p_event_id bigint,
+  p_rating integer,
+  p_sign integer
+)
+RETURNS void
+LANGUAGE plpgsql
+AS $function$
+BEGIN
+  INSERT INTO tbl_event_rating_summary AS s
+    (event_id, review_count, rating_sum,
+     rating_1, rating_2, rating_3, rating_4, rating_5)
+  VALUES (
+    p_event_id, p_sign, p_sign * p_rating,
+    CASE WHEN p_rating = 1 THEN p_sign ELSE 0 END,
+    CASE WHEN p_rating = 2 THEN p_sign ELSE 0 END,
+    CASE WHEN p_rating = 3 THEN p_sign ELSE 0 END,
+    CASE WHEN p_rating = 4 THEN p_sign ELSE 0 END,
+    CASE WHEN p_rating = 5 THEN p_sign ELSE 0 END
+  )
+  ON CONFLICT (event_id) DO UPDATE SET
+    review_count = s.review_count + EXCLUDED.review_count,
+    rating_sum = s.rating_sum + EXCLUDED.rating_sum,
+    rating_1 = s.rating_1 + EXCLUDED.rating_1,
+    rating_2 = s.rating_2 + EXCLUDED.rating_2,
+    rating_3 = s.rating_3 + EXCLUDED.rating_3,
+    rating_4 = s.rating_4 + EXCLUDED.rating_4,
+    rating_5 = s.rating_5 + EXCLUDED.rating_5,
+    updated_at = now();
+END;
+$function$;
+
+CREATE OR REPLACE FUNCTION public.maintain_rating_summary()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $function$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.rating IS NOT NULL THEN
+    PERFORM apply_rating_delta(OLD.event_id, OLD.rating, -1);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.rating IS NOT NULL THEN
+    PERFORM apply_rating_delta(NEW.event_id, NEW.rating, 1);
+  END IF;
+  RETURN NULL;
+END;
+$function$;
+
+DROP TRIGGER IF EXISTS tbl_event_feedback_rating_summary ON public.tbl_event_feedback;
+CREATE TRIGGER tbl_event_feedback_rating_summary
+  AFTER INSERT OR DELETE OR UPDATE OF event_id, rating ON public.tbl_event_feedback
+  FOR EACH ROW EXECUTE FUNCTION public.maintain_rating_summary();
+
+-- Rebuild summaries from tbl_event_feedback (one event, or all when NULL).
+-- Blocks feedback writes while it runs; returns how many summaries changed.
+CREATE OR REPLACE FUNCTION public.reconcile_rating_summary(p_event_id bigint DEFAULT NULL)
+RETURNS integer
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  v_changed integer;
+  v_removed integer;
+BEGIN
+  LOCK TABLE tbl_event_feedback IN SHARE MODE;
+
+  WITH actual AS (
+    SELECT f.event_id,
+           COUNT(*)::integer AS review_count,
+           SUM(f.rating)::bigint AS rating_sum,
+           COUNT(*) FILTER (WHERE f.rating = 1)::integer AS rating_1,
+           COUNT(*) FILTER (WHERE f.rating = 2)::integer AS rating_2,
+           COUNT(*) FILTER (WHERE f.rating = 3)::integer AS rating_3,
+           COUNT(*) FILTER (WHERE f.rating = 4)::integer AS rating_4,
+           COUNT(*) FILTER (WHERE f.rating = 5)::integer AS rating_5
+    FROM tbl_event_feedback f
+    WHERE f.rating IS NOT NULL
+      AND (p_event_id IS NULL OR f.event_id = p_event_id)
+    GROUP BY f.event_id
+  )
+  INSERT INTO tbl_event_rating_summary AS s
+    (event_id, review_count, rating_sum,
+     rating_1, rating_2, rating_3, rating_4, rating_5)
+  SELECT * FROM actual
+  ON CONFLICT (event_id) DO UPDATE SET
+    review_count = EXCLUDED.review_count,
+    rating_sum = EXCLUDED.rating_sum,
+    rating_1 = EXCLUDED.rating_1,
+    rating_2 = EXCLUDED.rating_2,
+    rating_3 = EXCLUDED.rating_3,
+    rating_4 = EXCLUDED.rating_4,
+    rating_5 = EXCLUDED.rating_5,
+    updated_at = now()
+  WHERE (s.review_count, s.rating_sum, s.rating_1, s.rating_2,
+         s.rating_3, s.rating_4, s.rating_5)
+     IS DISTINCT FROM
+        (EXCLUDED.review_count, EXCLUDED.rating_sum, EXCLUDED.rating_1,
+         EXCLUDED.rating_2, EXCLUDED.rating_3, EXCLUDED.rating_4, EXCLUDED.rating_5);
+  GET DIAGNOSTICS v_changed = ROW_COUNT;
+
+  -- Summaries left behind for events that no longer have any feedback
+  DELETE FROM tbl_event_rating_summary s
+  WHERE (p_event_id IS NULL OR s.event_id = p_event_id)
+    AND NOT EXISTS (
+      SELECT 1 FROM tbl_event_feedback f
+      WHERE f.event_id = s.event_id AND f.rating IS NOT NULL
+    );
+  GET DIAGNOSTICS v_removed = ROW_COUNT;
+
+  RETURN v_changed + v_removed;
+END;
+$function$;
+
+-- Averages now come from the summary row
+CREATE OR REPLACE FUNCTION public.get_average_rating(p_event_id bigint)
+RETURNS numeric
+LANGUAGE sql
+STABLE
+AS $function$
+  select coalesce(
+    (select rating_sum::numeric / nullif(review_count, 0)
+     from tbl_event_rating_summary
+     where event_id = p_event_id),
+    0);
+$function$;
+
+-- Backfill
+SELECT public.reconcile_rating_summary();
+
+-- ============================================================
+-- PART 16: Full-text and fuzzy search
+-- Events and feedback comments get a stored tsvector with a GIN index for
+-- word/prefix search; event and student names (and SRNs) get pg_trgm GIN
+-- indexes for substring and typo-tolerant matching. Backs the /search
+-- endpoints so the UI can look rows up instead of loading whole tables.
+-- ============================================================
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE public.tbl_events
+  ADD COLUMN IF NOT EXISTS search_vector tsvector
+  GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B')
+  ) STORED;
+CREATE INDEX IF NOT EXISTS tbl_events_search_vector_idx
+  ON public.tbl_events USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS tbl_events_name_trgm_idx
+  ON public.tbl_events USING gin (name gin_trgm_ops);
+
+ALTER TABLE public.tbl_event_feedback
+  ADD COLUMN IF NOT EXISTS comments_vector tsvector
+  GENERATED ALWAYS AS (to_tsvector('english', coalesce(comments, ''))) STORED;
+CREATE INDEX IF NOT EXISTS tbl_event_feedback_comments_vector_idx
+  ON public.tbl_event_feedback USING gin (comments_vector);
+
+CREATE INDEX IF NOT EXISTS tbl_students_name_trgm_idx
+  ON public.tbl_students USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS tbl_students_srn_trgm_idx
+  ON public.tbl_students USING gin (srn gin_trgm_ops);
+
+-- ============================================================
+-- PART 17: Student login lookup
+-- Case-insensitive prefix search on name/SRN (GET /students?prefix=) and
+-- exact SRN lookup (GET /students/by-srn/{srn}). text_pattern_ops lets
+-- LIKE 'abc%' use the btree regardless of the database collation.
+-- ============================================================
+CREATE INDEX IF NOT EXISTS tbl_students_lower_name_prefix_idx
+  ON public.tbl_students(lower(name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS tbl_students_upper_srn_prefix_idx
+  ON public.tbl_students(upper(srn) text_pattern_ops);
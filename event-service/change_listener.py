@@ -0,0 +1,83 @@
+"""
+Cross-replica cache invalidation.
+
+The db/part13 triggers pg_notify('eventra_changes', ...) on every write to a
+cached table. Each replica keeps one dedicated connection LISTENing on that
+channel and evicts the matching response-cache tags, so a write handled by
+one replica doesn't leave the others serving stale lists. Whenever the
+connection has to be re-established the whole cache is cleared, since
+notifications sent while it was down are lost. The first connect leaves
+it alone: nothing can have been missed yet.
+"""
+
+import os
+import json
+import asyncio
+import psycopg
+from database import DB_CONFIG
+
+CHANGE_CHANNEL = "eventra_changes"
+LISTEN_PING_INTERVAL = float(os.getenv("CHANGE_LISTENER_PING", "60"))  # seconds between liveness checks
+RECONNECT_MIN_DELAY = 1     # seconds; doubles per failed attempt
+RECONNECT_MAX_DELAY = 60
+
+
+def change_tags(payload):
+    """Cache tags affected by one change notification."""
+    try:
+        change = json.loads(payload)
+        table = change["table"]
+    except (ValueError, TypeError, KeyError):
+        return ()
+    event_id = change.get("event_id")
+
+    if table == "tbl_events":
+        return ("events",)
+    if table in ("tbl_tickets", "tbl_ticket_shards"):
+        return (f"tickets:{event_id}",) if event_id is not None else ("tickets",)
+    if table == "tbl_event_participants":
+        return (f"participants:{event_id}",) if event_id is not None else ("participants",)
+    if table == "tbl_venues":
+        return ("venues",)
+    if table == "tbl_hosts":
+        return ("hosts",)
+    if table == "tbl_resources":
+        return ("resources",)
+    if table == "tbl_event_feedback":
+        # "feedback" covers cross-event views such as the leaderboard
+        return (f"feedback:{event_id}", "feedback") if event_id is not None else ("feedback",)
+    if table == "tbl_students":
+        return ("students",)
+    return ()
+
+
+async def listen_for_changes(cache, listening=None):
+    """
+    Background task: apply change notifications to cache, reconnecting on
+    failure. listening, an asyncio.Event, is set once the first LISTEN has
+    succeeded.
+    """
+    delay = RECONNECT_MIN_DELAY
+    reconnecting = False
+    while True:
+        try:
+            conn = await psycopg.AsyncConnection.connect(**DB_CONFIG, autocommit=True)
+            async with conn:
+                await conn.execute(f"LISTEN {CHANGE_CHANNEL}")
+                if reconnecting:
+                    cache.clear()
+                reconnecting = True
+                if listening is not None:
+                    listening.set()
+                delay = RECONNECT_MIN_DELAY
+                print(f"[change-listener] Listening on {CHANGE_CHANNEL}")
+                while True:
+                    async for note in conn.notifies(timeout=LISTEN_PING_INTERVAL):
+                        cache.invalidate(*change_tags(note.payload))
+                    await conn.execute("SELECT 1")  # quiet period — make sure we're still connected
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[change-listener] Connection lost ({e}); retrying in {delay}s")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, RECONNECT_MAX_DELAY)
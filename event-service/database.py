@@ -1,8 +1,12 @@
 import os
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import time
+import uuid
+import weakref
+import psycopg
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool, PoolTimeout as AsyncPoolTimeout
 from dotenv import load_dotenv
-from contextlib import contextmanager
+from contextlib import asynccontextmanager
 
 load_dotenv()
 
@@ -15,24 +19,89 @@ DB_CONFIG = {
     "sslmode": "require"
 }
 
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))        # seconds to wait for a free connection
+POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", "300"))     # close connections idle longer than this
+POOL_CHECK_AFTER = float(os.getenv("DB_POOL_CHECK_AFTER", "30"))  # ping connections idle longer than this
+STREAM_ITERSIZE = int(os.getenv("DB_STREAM_ITERSIZE", "500"))     # rows per fetch for streamed results
 
-def get_connection():
-    conn = psycopg2.connect(**DB_CONFIG)
-    conn.autocommit = False
-    return conn
-
-
-@contextmanager
-def get_cursor(commit=False):
-    conn = get_connection()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    try:
-        yield cur
-        if commit:
-            conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        cur.close()
-        conn.close()
+
+_returned_at = weakref.WeakKeyDictionary()
+
+
+async def _mark_returned(conn):
+    _returned_at[conn] = time.monotonic()
+
+
+async def _check_connection(conn):
+    """Ping only connections that sat idle long enough to have gone stale."""
+    returned_at = _returned_at.get(conn)
+    if returned_at is not None and time.monotonic() - returned_at >= POOL_CHECK_AFTER:
+        await AsyncConnectionPool.check_connection(conn)
+
+
+_async_pool = AsyncConnectionPool(
+    kwargs={**DB_CONFIG, "row_factory": dict_row},
+    min_size=POOL_MIN_SIZE,
+    max_size=POOL_MAX_SIZE,
+    timeout=POOL_TIMEOUT,
+    max_idle=POOL_MAX_IDLE,
+    check=_check_connection,
+    reset=_mark_returned,
+    name="event-service",
+    open=False,
+)
+
+
+async def open_async_pool():
+    # Don't block startup on the database — min_size connections fill in the background
+    await _async_pool.open(wait=False)
+
+
+async def prefill_async_pool():
+    """Wait until the pool's min_size connections are open."""
+    await _async_pool.wait(timeout=POOL_TIMEOUT)
+
+
+async def close_async_pool():
+    await _async_pool.close()
+
+
+def async_pool_stats():
+    return _async_pool.get_stats()
+
+
+@asynccontextmanager
+async def get_async_cursor(commit=False):
+    """Pooled cursor yielding dict rows; commits or rolls back on exit."""
+    async with _async_pool.connection() as conn:
+        async with conn.cursor() as cur:
+            try:
+                yield cur
+                if commit:
+                    await conn.commit()
+                else:
+                    await conn.rollback()
+            except Exception:
+                try:
+                    await conn.rollback()
+                except psycopg.Error:
+                    pass  # broken connection — the pool discards it on return
+                raise
+
+
+async def stream_rows(query, params=(), itersize=STREAM_ITERSIZE):
+    """
+    Yield rows from a server-side (named) cursor, fetching itersize rows
+    per round trip, so memory stays flat however large the result is.
+    """
+    async with _async_pool.connection() as conn:
+        try:
+            async with conn.cursor(name=f"stream_{uuid.uuid4().hex}") as cur:
+                cur.itersize = itersize
+                await cur.execute(query, params)
+                async for row in cur:
+                    yield row
+        finally:
+            await conn.rollback()
@@ -1,17 +1,36 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from contextlib import asynccontextmanager
-from database import get_cursor
+from database import (
+    get_async_cursor, open_async_pool, prefill_async_pool, close_async_pool, async_pool_stats,
+    stream_rows, AsyncPoolTimeout,
+)
+from cache import response_cache, CLOCK
+from change_listener import listen_for_changes
+from warmup import WarmUp
+from scan_ingest import (
+    scan_buffer, ScanQueueFull, ATTENDANCE_RESULTS,
+)
+from pagination import (
+    MAX_PAGE_SIZE, keyset_filter, limit_clause, finish_page,
+)
+from search import (
+    DEFAULT_SEARCH_RESULTS, MAX_SEARCH_RESULTS, search_terms, prefix_tsquery,
+)
 from models import (
     EventOut, EventCreate, EventUpdate,
     VenueOut, VenueUpdate,
-    TicketOut, TicketCreate,
-    RegisterRequest,
-    ParticipantOut, RegistrationOut,
+    TicketOut, TicketCreate, TicketShardUpdate,
+    RegisterRequest, HoldRequest, HoldAction, HoldOut,
+    ParticipantOut, EventParticipantOut, RegistrationOut,
+    AttendanceBulk, AttendanceBulkOut, AttendanceScan,
     ResourceOut, ResourceAssign, MaintenanceCreate,
+    AdminDashboardOut, StudentDashboardOut,
 )
-import datetime
 import asyncio
 import httpx
+import os
+from typing import Optional
 
 # URLs of all services to keep alive
 KEEP_ALIVE_URLS = [
@@ -20,9 +39,17 @@ KEEP_ALIVE_URLS = [
     "https://eventra-feedbacke-service.onrender.com/health",  # feedback-service
     "https://eventra-cc.streamlit.app/",                  # frontend
 ]
+if os.getenv("KEEP_ALIVE_URLS") is not None:
+    # Comma-separated override; empty leaves just the database ping
+    KEEP_ALIVE_URLS = [url.strip() for url in os.environ["KEEP_ALIVE_URLS"].split(",") if url.strip()]
 
 PING_INTERVAL = 600  # 10 minutes
 
+MAX_ATTENDANCE_BATCH = 5000  # students per bulk check-in request
+
+HOLD_TTL_SECONDS = int(os.getenv("TICKET_HOLD_TTL", "300"))              # 5 minutes
+HOLD_SWEEP_INTERVAL = int(os.getenv("TICKET_HOLD_SWEEP_INTERVAL", "30"))  # seconds
+
 
 async def keep_alive_task():
     """Background task that pings all services and Supabase every 10 minutes."""
@@ -31,8 +58,8 @@ async def keep_alive_task():
 
         # Ping Supabase to prevent 7-day inactivity pause
         try:
-            with get_cursor() as cur:
-                cur.execute("SELECT 1")
+            async with get_async_cursor() as cur:
+                await cur.execute("SELECT 1")
             print("[keep-alive] Supabase DB ping OK")
         except Exception as e:
             print(f"[keep-alive] Supabase DB ping FAILED: {e}")
@@ -47,93 +74,269 @@ async def keep_alive_task():
                     print(f"[keep-alive] Failed to ping {url}: {e}")
 
 
+async def hold_sweeper_task():
+    """Background task that returns lapsed ticket holds to stock."""
+    while True:
+        await asyncio.sleep(HOLD_SWEEP_INTERVAL)
+        try:
+            async with get_async_cursor(commit=True) as cur:
+                await cur.execute("SELECT release_expired_holds() AS released")
+                released = (await cur.fetchone())["released"]
+            if released:
+                response_cache.invalidate("tickets")
+                print(f"[hold-sweeper] Released {released} expired holds")
+        except Exception as e:
+            print(f"[hold-sweeper] Sweep FAILED: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Start keep-alive background task on startup."""
+    """
+    Open the async DB pool and start the keep-alive, hold-sweeper,
+    scan-flush, cache change-listener and warm-up tasks on startup.
+    /ready reports 503 until the warm-up has filled the pool and, once
+    the listener is up (so no change can slip past it), primed the hot
+    endpoints.
+    """
+    await open_async_pool()
     task = asyncio.create_task(keep_alive_task())
     print("[keep-alive] Background ping task started")
+    sweeper = asyncio.create_task(hold_sweeper_task())
+    flusher = asyncio.create_task(scan_buffer.run())
+    listening = asyncio.Event()
+    listener = asyncio.create_task(listen_for_changes(response_cache, listening))
+    warmup.step("db pool", prefill_async_pool)
+    warmup.step("change listener", listening.wait)
+    warmup.get(app, "/venues", "/events", "/events/all", "/events/completed", "/dashboard/admin")
+    warming = asyncio.create_task(warmup.run())
     yield
+    warming.cancel()
+    try:
+        await warming
+    except asyncio.CancelledError:
+        pass
+    listener.cancel()
+    try:
+        await listener
+    except asyncio.CancelledError:
+        pass
+    flusher.cancel()
+    try:
+        await flusher
+    except asyncio.CancelledError:
+        pass
+    await scan_buffer.flush()  # don't drop acknowledged scans on shutdown
+    sweeper.cancel()
     task.cancel()
     try:
         await task
     except asyncio.CancelledError:
         print("[keep-alive] Background task stopped")
+    try:
+        await sweeper
+    except asyncio.CancelledError:
+        pass
+    await close_async_pool()
+
+
+def ndjson_response(rows, model):
+    """Stream rows as newline-delimited JSON, validating each through model."""
+    async def body():
+        async for row in rows:
+            yield model.model_validate(row).model_dump_json() + "\n"
 
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+warmup = WarmUp("event-service")
 
 app = FastAPI(title="Eventra Event Service", version="1.0.0", lifespan=lifespan)
 
 
+@app.exception_handler(AsyncPoolTimeout)
+async def pool_timeout_handler(request: Request, exc: Exception):
+    """Every pooled connection stayed busy past the timeout — ask clients to retry."""
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+
 # ──────────── Health ────────────
 
 @app.get("/health")
-def health():
+async def health():
     return {"status": "ok", "service": "event-service"}
 
 
+@app.get("/health/pool")
+async def health_pool():
+    """Connection pool statistics (size, idle/in-use, waits, timeouts)."""
+    return async_pool_stats()
+
+
+@app.get("/ready")
+async def ready():
+    """503 until the startup warm-up has finished; reports how long each step took."""
+    return warmup.response()
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Response cache size and hit/miss counters, overall and per endpoint."""
+    return response_cache.stats()
+
+
 # ══════════════════════════════════════════
 #  EVENTS
 # ══════════════════════════════════════════
 
 @app.get("/events", response_model=list[EventOut])
-def list_scheduled_events():
+async def list_scheduled_events(request: Request):
     """List events that haven't ended yet (scheduled/upcoming)."""
-    with get_cursor() as cur:
-        cur.execute("""
-            SELECT e.id, e.name, e.description, e.date,
-                   e.start_time, e.end_time,
-                   e.location_id, v.name AS venue_name,
-                   e.organizer_id, h.name AS host_name,
-                   e.status, e.max_participants
-            FROM tbl_events e
-            LEFT JOIN tbl_venues v ON e.location_id = v.id
-            LEFT JOIN tbl_hosts h ON e.organizer_id = h.id
-            WHERE (e.date + e.end_time) > NOW()
-            ORDER BY e.date, e.start_time
-        """)
-        return cur.fetchall()
+    async def load():
+        async with get_async_cursor() as cur:
+            await cur.execute("""
+                SELECT e.id, e.name, e.description, e.date,
+                       e.start_time, e.end_time,
+                       e.location_id, v.name AS venue_name,
+                       e.organizer_id, h.name AS host_name,
+                       e.status, e.max_participants
+                FROM tbl_events e
+                LEFT JOIN tbl_venues v ON e.location_id = v.id
+                LEFT JOIN tbl_hosts h ON e.organizer_id = h.id
+                WHERE e.ends_at > NOW()
+                ORDER BY e.date, e.start_time
+            """)
+            return await cur.fetchall()
+
+    return await response_cache.fetch(
+        "events", ("events", "venues", "hosts", CLOCK), load, list[EventOut], request
+    )
 
 
 @app.get("/events/completed", response_model=list[EventOut])
-def list_completed_events():
-    """List events that have already ended."""
-    with get_cursor() as cur:
-        cur.execute("""
-            SELECT e.id, e.name, e.description, e.date,
-                   e.start_time, e.end_time,
-                   e.location_id, v.name AS venue_name,
-                   e.organizer_id, h.name AS host_name,
-                   e.status, e.max_participants
-            FROM tbl_events e
-            LEFT JOIN tbl_venues v ON e.location_id = v.id
-            LEFT JOIN tbl_hosts h ON e.organizer_id = h.id
-            WHERE (e.date + e.end_time) <= NOW()
-            ORDER BY e.date DESC
-        """)
-        return cur.fetchall()
+async def list_completed_events(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+):
+    """List events that have already ended (keyset-paged by ends_at, id)."""
+    after_sql, after_params = keyset_filter(after, ("e.ends_at", "e.id"), descending=True)
+    limit_sql, limit_params = limit_clause(limit)
+
+    async def load():
+        async with get_async_cursor() as cur:
+            await cur.execute(f"""
+                SELECT e.id, e.name, e.description, e.date,
+                       e.start_time, e.end_time,
+                       e.location_id, v.name AS venue_name,
+                       e.organizer_id, h.name AS host_name,
+                       e.status, e.max_participants, e.ends_at
+                FROM tbl_events e
+                LEFT JOIN tbl_venues v ON e.location_id = v.id
+                LEFT JOIN tbl_hosts h ON e.organizer_id = h.id
+                WHERE e.ends_at <= NOW()
+                  AND {after_sql}
+                ORDER BY e.ends_at DESC, e.id DESC
+                {limit_sql}
+            """, after_params + limit_params)
+            return await cur.fetchall()
+
+    return await response_cache.fetch(
+        f"events_completed:{limit}:{after}", ("events", "venues", "hosts", CLOCK),
+        load, list[EventOut], request, page=(limit, ("ends_at", "id")),
+    )
+
+
+@app.get("/events/completed/stream")
+async def stream_completed_events():
+    """All completed events as NDJSON, streamed from a server-side cursor."""
+    rows = stream_rows("""
+        SELECT e.id, e.name, e.description, e.date,
+               e.start_time, e.end_time,
+               e.location_id, v.name AS venue_name,
+               e.organizer_id, h.name AS host_name,
+               e.status, e.max_participants
+        FROM tbl_events e
+        LEFT JOIN tbl_venues v ON e.location_id = v.id
+        LEFT JOIN tbl_hosts h ON e.organizer_id = h.id
+        WHERE e.ends_at <= NOW()
+        ORDER BY e.ends_at DESC, e.id DESC
+    """)
+    return ndjson_response(rows, EventOut)
 
 
 @app.get("/events/all", response_model=list[EventOut])
-def list_all_events():
+async def list_all_events(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+):
     """List all events (for admin views like ticket management)."""
-    with get_cursor() as cur:
-        cur.execute("""
+    after_sql, after_params = keyset_filter(after, ("e.date", "e.id"), descending=True)
+    limit_sql, limit_params = limit_clause(limit)
+
+    async def load():
+        async with get_async_cursor() as cur:
+            await cur.execute(f"""
+                SELECT e.id, e.name, e.description, e.date,
+                       e.start_time, e.end_time,
+                       e.location_id, v.name AS venue_name,
+                       e.organizer_id, h.name AS host_name,
+                       e.status, e.max_participants
+                FROM tbl_events e
+                LEFT JOIN tbl_venues v ON e.location_id = v.id
+                LEFT JOIN tbl_hosts h ON e.organizer_id = h.id
+                WHERE {after_sql}
+                ORDER BY e.date DESC, e.id DESC
+                {limit_sql}
+            """, after_params + limit_params)
+            return await cur.fetchall()
+
+    return await response_cache.fetch(
+        f"events_all:{limit}:{after}", ("events", "venues", "hosts"),
+        load, list[EventOut], request, page=(limit, ("date", "id")),
+    )
+
+
+@app.get("/events/search", response_model=list[EventOut])
+async def search_events(
+    q: str,
+    limit: int = Query(DEFAULT_SEARCH_RESULTS, ge=1, le=MAX_SEARCH_RESULTS),
+    upcoming: bool = False,
+):
+    """
+    Events whose name or description contains words starting with the
+    query's words, plus names within trigram distance of it (typos), best
+    match first. upcoming=true restricts to events that haven't ended.
+    """
+    terms = search_terms(q)
+    text = " ".join(terms)
+    upcoming_sql = "AND e.ends_at > NOW()" if upcoming else ""
+
+    async with get_async_cursor() as cur:
+        await cur.execute(f"""
+            WITH q AS (SELECT to_tsquery('english', %s) AS query)
             SELECT e.id, e.name, e.description, e.date,
                    e.start_time, e.end_time,
                    e.location_id, v.name AS venue_name,
                    e.organizer_id, h.name AS host_name,
                    e.status, e.max_participants
             FROM tbl_events e
+            CROSS JOIN q
             LEFT JOIN tbl_venues v ON e.location_id = v.id
             LEFT JOIN tbl_hosts h ON e.organizer_id = h.id
-            ORDER BY e.date DESC
-        """)
-        return cur.fetchall()
+            WHERE (e.search_vector @@ q.query OR e.name %% %s)
+              {upcoming_sql}
+            ORDER BY ts_rank(e.search_vector, q.query) + similarity(e.name, %s) DESC,
+                     e.date DESC, e.id
+            LIMIT %s
+        """, (prefix_tsquery(terms), text, text, limit))
+        return await cur.fetchall()
 
 
 @app.get("/events/{event_id}", response_model=EventOut)
-def get_event(event_id: int):
-    with get_cursor() as cur:
-        cur.execute("""
+async def get_event(event_id: int):
+    async with get_async_cursor() as cur:
+        await cur.execute("""
             SELECT e.id, e.name, e.description, e.date,
                    e.start_time, e.end_time,
                    e.location_id, v.name AS venue_name,
@@ -144,16 +347,16 @@ def get_event(event_id: int):
             LEFT JOIN tbl_hosts h ON e.organizer_id = h.id
             WHERE e.id = %s
         """, (event_id,))
-        row = cur.fetchone()
+        row = await cur.fetchone()
         if not row:
             raise HTTPException(status_code=404, detail="Event not found")
         return row
 
 
 @app.post("/events", response_model=EventOut, status_code=201)
-def create_event(event: EventCreate):
-    with get_cursor(commit=True) as cur:
-        cur.execute("""
+async def create_event(event: EventCreate):
+    async with get_async_cursor(commit=True) as cur:
+        await cur.execute("""
             INSERT INTO tbl_events
             (name, description, date, start_time, end_time,
              location_id, organizer_id, status, max_participants)
@@ -166,14 +369,16 @@ def create_event(event: EventCreate):
             event.location_id, event.organizer_id,
             event.max_participants,
         ))
-        row = cur.fetchone()
+        row = await cur.fetchone()
         if not row:
             raise HTTPException(status_code=500, detail="Failed to create event")
-        return row
+
+    response_cache.invalidate("events")
+    return row
 
 
 @app.put("/events/{event_id}")
-def update_event(event_id: int, event: EventUpdate):
+async def update_event(event_id: int, event: EventUpdate):
     fields = []
     values = []
     for field_name, value in event.model_dump(exclude_none=True).items():
@@ -185,14 +390,16 @@ def update_event(event_id: int, event: EventUpdate):
 
     values.append(event_id)
 
-    with get_cursor(commit=True) as cur:
-        cur.execute(
+    async with get_async_cursor(commit=True) as cur:
+        await cur.execute(
             f"UPDATE tbl_events SET {', '.join(fields)} WHERE id = %s",
             tuple(values),
         )
         if cur.rowcount == 0:
             raise HTTPException(status_code=404, detail="Event not found")
-        return {"message": "Event updated"}
+
+    response_cache.invalidate("events")
+    return {"message": "Event updated"}
 
 
 # ══════════════════════════════════════════
@@ -200,179 +407,253 @@ def update_event(event_id: int, event: EventUpdate):
 # ══════════════════════════════════════════
 
 @app.get("/venues", response_model=list[VenueOut])
-def list_venues():
-    with get_cursor() as cur:
-        cur.execute(
-            "SELECT id, name, building, capacity, is_available "
-            "FROM tbl_venues ORDER BY name"
-        )
-        return cur.fetchall()
+async def list_venues(request: Request):
+    async def load():
+        async with get_async_cursor() as cur:
+            await cur.execute(
+                "SELECT id, name, building, capacity, is_available "
+                "FROM tbl_venues ORDER BY name"
+            )
+            return await cur.fetchall()
+
+    return await response_cache.fetch(
+        "venues", ("venues",), load, list[VenueOut], request
+    )
 
 
 @app.get("/venues/available", response_model=list[VenueOut])
-def list_available_venues():
-    with get_cursor() as cur:
-        cur.execute("""
-            SELECT id, name, building, capacity, is_available
-            FROM tbl_venues
-            WHERE is_available = TRUE
-            ORDER BY capacity DESC
-        """)
-        return cur.fetchall()
+async def list_available_venues(request: Request):
+    async def load():
+        async with get_async_cursor() as cur:
+            await cur.execute("""
+                SELECT id, name, building, capacity, is_available
+                FROM tbl_venues
+                WHERE is_available = TRUE
+                ORDER BY capacity DESC
+            """)
+            return await cur.fetchall()
+
+    return await response_cache.fetch(
+        "venues_available", ("venues",), load, list[VenueOut], request
+    )
 
 
 @app.put("/venues/{venue_id}")
-def update_venue(venue_id: int, venue: VenueUpdate):
-    with get_cursor(commit=True) as cur:
-        cur.execute(
+async def update_venue(venue_id: int, venue: VenueUpdate):
+    async with get_async_cursor(commit=True) as cur:
+        await cur.execute(
             "UPDATE tbl_venues SET is_available = %s WHERE id = %s",
             (venue.is_available, venue_id),
         )
         if cur.rowcount == 0:
             raise HTTPException(status_code=404, detail="Venue not found")
-        return {"message": "Venue updated"}
+
+    response_cache.invalidate("venues")
+    return {"message": "Venue updated"}
 
 
 # ══════════════════════════════════════════
 #  TICKETS
 # ══════════════════════════════════════════
 
+MAX_TICKET_SHARDS = 64
+
 @app.get("/events/{event_id}/tickets", response_model=list[TicketOut])
-def list_tickets(event_id: int):
-    with get_cursor() as cur:
-        cur.execute(
-            "SELECT id, event_id, ticket_type, price, quantity "
-            "FROM tbl_tickets WHERE event_id = %s",
-            (event_id,),
-        )
-        return cur.fetchall()
+async def list_tickets(event_id: int, request: Request):
+    """Tickets for an event; sharded stock is summed across its buckets."""
+    async def load():
+        async with get_async_cursor() as cur:
+            await cur.execute("""
+                SELECT t.id, t.event_id, t.ticket_type, t.price,
+                       t.quantity + COALESCE((
+                           SELECT SUM(s.quantity)
+                           FROM tbl_ticket_shards s
+                           WHERE s.ticket_id = t.id
+                       ), 0) AS quantity
+                FROM tbl_tickets t
+                WHERE t.event_id = %s
+            """, (event_id,))
+            return await cur.fetchall()
+
+    return await response_cache.fetch(
+        f"tickets:{event_id}", ("tickets", f"tickets:{event_id}"),
+        load, list[TicketOut], request,
+    )
 
 
 @app.post("/events/{event_id}/tickets", status_code=201)
-def create_ticket(event_id: int, ticket: TicketCreate):
-    with get_cursor(commit=True) as cur:
-        cur.execute("""
+async def create_ticket(event_id: int, ticket: TicketCreate):
+    if ticket.shards < 1 or ticket.shards > MAX_TICKET_SHARDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Shards must be between 1 and {MAX_TICKET_SHARDS}",
+        )
+
+    async with get_async_cursor(commit=True) as cur:
+        await cur.execute("""
             INSERT INTO tbl_tickets (event_id, ticket_type, price, quantity)
             VALUES (%s, %s, %s, %s)
             RETURNING id, event_id, ticket_type, price, quantity
         """, (event_id, ticket.ticket_type, ticket.price, ticket.quantity))
-        row = cur.fetchone()
+        row = await cur.fetchone()
         if not row:
             raise HTTPException(status_code=500, detail="Failed to create ticket")
-        return row
+        if ticket.shards > 1:
+            await cur.execute(
+                "SELECT shard_ticket(%s, %s)", (row["id"], ticket.shards)
+            )
+
+    response_cache.invalidate(f"tickets:{event_id}")
+    return row
+
+
+@app.put("/tickets/{ticket_id}/shards")
+async def shard_ticket(ticket_id: int, req: TicketShardUpdate):
+    """
+    Split a ticket's stock across N buckets for flash-sale registrations
+    (1 collapses it back into a single row). Stock is preserved.
+    """
+    if req.shards < 1 or req.shards > MAX_TICKET_SHARDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Shards must be between 1 and {MAX_TICKET_SHARDS}",
+        )
+
+    async with get_async_cursor(commit=True) as cur:
+        await cur.execute(
+            "SELECT shard_ticket(%s, %s) AS quantity", (ticket_id, req.shards)
+        )
+        quantity = (await cur.fetchone())["quantity"]
+        if quantity is None:
+            raise HTTPException(status_code=404, detail="Ticket not found")
+
+    response_cache.invalidate("tickets")  # total stock is unchanged; keeps views consistent
+    return {"ticket_id": ticket_id, "shards": req.shards, "quantity": quantity}
 
 
 # ══════════════════════════════════════════
 #  REGISTRATION (transactional)
 # ══════════════════════════════════════════
 
+# Status codes returned by the register_participant() SQL function (db/part8)
+REGISTRATION_ERRORS = {
+    1: (409, "Already registered for this event"),
+    2: (404, "Ticket not found"),
+    3: (400, "Tickets sold out"),
+}
+
+
 @app.post("/events/{event_id}/register", status_code=201)
-def register_for_event(event_id: int, req: RegisterRequest):
+async def register_for_event(event_id: int, req: RegisterRequest):
     """
-    Atomic registration: check duplicate -> lock ticket row ->
-    decrement quantity -> insert order -> insert participant.
-    All in a single transaction with SELECT FOR UPDATE.
+    Atomic registration via register_participant(): duplicate check ->
+    claim a unit of stock (a free bucket when the ticket is sharded) ->
+    insert order -> insert participant,
+    all server-side in one round trip so the ticket row lock is held
+    only for the duration of a single statement's transaction.
     """
-    with get_cursor(commit=True) as cur:
-        # 1. Check if already registered
-        cur.execute(
-            "SELECT 1 FROM tbl_event_participants "
-            "WHERE event_id = %s AND user_id = %s",
-            (event_id, req.user_id),
+    async with get_async_cursor(commit=True) as cur:
+        await cur.execute(
+            "SELECT register_participant(%s, %s, %s) AS status",
+            (event_id, req.user_id, req.ticket_id),
         )
-        if cur.fetchone():
-            raise HTTPException(
-                status_code=409,
-                detail="Already registered for this event",
-            )
+        status = (await cur.fetchone())["status"]
+        if status in REGISTRATION_ERRORS:
+            code, detail = REGISTRATION_ERRORS[status]
+            raise HTTPException(status_code=code, detail=detail)
 
-        # 2. Lock the ticket row and check availability
-        cur.execute(
-            "SELECT quantity FROM tbl_tickets WHERE id = %s FOR UPDATE",
-            (req.ticket_id,),
+    response_cache.invalidate(f"tickets:{event_id}")
+    return {"message": "Successfully registered"}
+
+
+@app.delete("/events/{event_id}/register/{user_id}")
+async def cancel_registration(event_id: int, user_id: int):
+    """
+    Atomic cancellation via cancel_participant(): delete the student's
+    orders -> return each unit to stock (a free bucket when sharded) ->
+    delete participant. Rolled back if there was no registration.
+    """
+    async with get_async_cursor(commit=True) as cur:
+        await cur.execute(
+            "SELECT cancel_participant(%s, %s) AS status", (event_id, user_id)
         )
-        ticket = cur.fetchone()
-        if not ticket:
-            raise HTTPException(status_code=404, detail="Ticket not found")
-        if ticket["quantity"] < 1:
+        if (await cur.fetchone())["status"] != 0:
             raise HTTPException(
-                status_code=400, detail="Tickets sold out"
+                status_code=404, detail="Registration not found"
             )
 
-        # 3. Decrement ticket quantity
-        cur.execute(
-            "UPDATE tbl_tickets SET quantity = quantity - 1 WHERE id = %s",
-            (req.ticket_id,),
-        )
+    response_cache.invalidate(f"tickets:{event_id}")
+    return {"message": "Registration cancelled successfully"}
 
-        # 4. Create order
-        now = datetime.datetime.now()
-        cur.execute("""
-            INSERT INTO tbl_orders (ticket_id, user_id, order_time, payment_status)
-            VALUES (%s, %s, %s, 'Completed')
-        """, (req.ticket_id, req.user_id, now))
 
-        # 5. Create participant record
-        cur.execute("""
-            INSERT INTO tbl_event_participants (event_id, user_id, registration_time)
-            VALUES (%s, %s, %s)
-        """, (event_id, req.user_id, now))
+# ══════════════════════════════════════════
+#  TICKET HOLDS (reserve, then confirm)
+# ══════════════════════════════════════════
 
-    return {"message": "Successfully registered"}
+# Status codes returned by hold_ticket() / confirm_hold() / release_hold() (db/part9)
+HOLD_ERRORS = {
+    **REGISTRATION_ERRORS,
+    4: (404, "Hold not found"),
+    5: (410, "Hold expired"),
+}
 
 
-@app.delete("/events/{event_id}/register/{user_id}")
-def cancel_registration(event_id: int, user_id: int):
+@app.post("/events/{event_id}/holds", response_model=HoldOut, status_code=201)
+async def create_hold(event_id: int, req: HoldRequest):
     """
-    Atomic cancellation: lock ticket rows -> find order ->
-    restock ticket -> delete order -> delete participant.
-    All in a single transaction.
+    Claim one unit of a ticket for HOLD_TTL_SECONDS. The only lock taken
+    is the single-row stock decrement; replaces any earlier hold the
+    student had on this event.
     """
-    with get_cursor(commit=True) as cur:
-        # 1. Lock all ticket rows for this event (prevent concurrent mods)
-        cur.execute(
-            "SELECT id FROM tbl_tickets WHERE event_id = %s FOR UPDATE",
-            (event_id,),
+    async with get_async_cursor(commit=True) as cur:
+        await cur.execute(
+            "SELECT * FROM hold_ticket(%s, %s, %s, %s)",
+            (event_id, req.user_id, req.ticket_id, HOLD_TTL_SECONDS),
+        )
+        row = await cur.fetchone()
+        if row["status"] in HOLD_ERRORS:
+            code, detail = HOLD_ERRORS[row["status"]]
+            raise HTTPException(status_code=code, detail=detail)
+
+    response_cache.invalidate(f"tickets:{event_id}")
+    return {
+        "id": row["hold_id"],
+        "event_id": event_id,
+        "ticket_id": req.ticket_id,
+        "user_id": req.user_id,
+        "expires_at": row["expires_at"],
+    }
+
+
+@app.post("/holds/{hold_id}/confirm", status_code=201)
+async def confirm_hold(hold_id: int, req: HoldAction):
+    """Convert an unexpired hold into the order + participant rows."""
+    async with get_async_cursor(commit=True) as cur:
+        await cur.execute(
+            "SELECT confirm_hold(%s, %s) AS status", (hold_id, req.user_id)
         )
+        status = (await cur.fetchone())["status"]
+
+    # Expired/duplicate holds are restocked by confirm_hold(), so commit before reporting
+    if status in (1, 5):
+        response_cache.invalidate("tickets")
+    if status in HOLD_ERRORS:
+        code, detail = HOLD_ERRORS[status]
+        raise HTTPException(status_code=code, detail=detail)
+    return {"message": "Successfully registered"}
 
-        # 2. Find the student's order for this event
-        cur.execute("""
-            SELECT o.ticket_id
-            FROM tbl_orders o
-            JOIN tbl_tickets t ON o.ticket_id = t.id
-            WHERE o.user_id = %s AND t.event_id = %s
-        """, (user_id, event_id))
-        order_row = cur.fetchone()
-
-        if order_row:
-            # 3. Restock the ticket (+1)
-            cur.execute(
-                "UPDATE tbl_tickets SET quantity = quantity + 1 WHERE id = %s",
-                (order_row["ticket_id"],),
-            )
 
-            # 4. Delete the order
-            cur.execute("""
-                DELETE FROM tbl_orders
-                WHERE user_id = %s
-                  AND ticket_id IN (
-                      SELECT id FROM tbl_tickets WHERE event_id = %s
-                  )
-            """, (user_id, event_id))
-
-        # 5. Delete participant record
-        cur.execute(
-            "DELETE FROM tbl_event_participants "
-            "WHERE event_id = %s AND user_id = %s",
-            (event_id, user_id),
+@app.post("/holds/{hold_id}/release")
+async def release_hold(hold_id: int, req: HoldAction):
+    async with get_async_cursor(commit=True) as cur:
+        await cur.execute(
+            "SELECT release_hold(%s, %s) AS status", (hold_id, req.user_id)
         )
+        if (await cur.fetchone())["status"] != 0:
+            raise HTTPException(status_code=404, detail="Hold not found")
 
-        if cur.rowcount == 0:
-            raise HTTPException(
-                status_code=404, detail="Registration not found"
-            )
-
-    return {"message": "Registration cancelled successfully"}
+    response_cache.invalidate("tickets")
+    return {"message": "Hold released"}
 
 
 # ══════════════════════════════════════════
@@ -380,36 +661,60 @@ def cancel_registration(event_id: int, user_id: int):
 # ══════════════════════════════════════════
 
 @app.get("/events/{event_id}/participants", response_model=list[ParticipantOut])
-def list_participants(event_id: int):
-    with get_cursor() as cur:
-        cur.execute("""
+async def list_participants(event_id: int):
+    async with get_async_cursor() as cur:
+        await cur.execute("""
             SELECT s.id AS student_id, s.name AS student_name,
                    s.srn, p.attendance_status
             FROM tbl_event_participants p
             JOIN tbl_students s ON p.user_id = s.id
             WHERE p.event_id = %s
         """, (event_id,))
-        return cur.fetchall()
+        return await cur.fetchall()
 
 
-@app.get("/participants/all")
-def list_all_participants():
+@app.get("/participants/all", response_model=list[EventParticipantOut])
+async def list_all_participants(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+):
     """All participants across all events (admin view)."""
-    with get_cursor() as cur:
-        cur.execute("""
-            SELECT e.name AS event_name, s.name AS student_name,
+    after_sql, after_params = keyset_filter(after, ("p.id",))
+    limit_sql, limit_params = limit_clause(limit)
+    async with get_async_cursor() as cur:
+        await cur.execute(f"""
+            SELECT p.id AS participant_id,
+                   e.name AS event_name, s.name AS student_name,
                    s.srn, p.attendance_status
             FROM tbl_event_participants p
             JOIN tbl_events e ON p.event_id = e.id
             JOIN tbl_students s ON p.user_id = s.id
-        """)
-        return cur.fetchall()
+            WHERE {after_sql}
+            ORDER BY p.id
+            {limit_sql}
+        """, after_params + limit_params)
+        return finish_page(await cur.fetchall(), limit, ("participant_id",), response)
+
+
+@app.get("/participants/all/stream")
+async def stream_all_participants():
+    """All participants across all events as NDJSON, streamed from a server-side cursor."""
+    rows = stream_rows("""
+        SELECT e.name AS event_name, s.name AS student_name,
+               s.srn, p.attendance_status
+        FROM tbl_event_participants p
+        JOIN tbl_events e ON p.event_id = e.id
+        JOIN tbl_students s ON p.user_id = s.id
+        ORDER BY p.id
+    """)
+    return ndjson_response(rows, EventParticipantOut)
 
 
 @app.put("/events/{event_id}/attendance/{user_id}")
-def mark_attendance(event_id: int, user_id: int):
-    with get_cursor(commit=True) as cur:
-        cur.execute(
+async def mark_attendance(event_id: int, user_id: int):
+    async with get_async_cursor(commit=True) as cur:
+        await cur.execute(
             "UPDATE tbl_event_participants "
             "SET attendance_status = TRUE "
             "WHERE event_id = %s AND user_id = %s",
@@ -422,11 +727,56 @@ def mark_attendance(event_id: int, user_id: int):
         return {"message": "Attendance marked"}
 
 
+@app.put("/events/{event_id}/attendance", response_model=AttendanceBulkOut)
+async def mark_attendance_bulk(event_id: int, req: AttendanceBulk):
+    """Mark a batch of students (by id and/or SRN) as attended in one UPDATE."""
+    if not req.user_ids and not req.srns:
+        raise HTTPException(status_code=400, detail="No students given")
+    if len(req.user_ids) + len(req.srns) > MAX_ATTENDANCE_BATCH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_ATTENDANCE_BATCH} students per request",
+        )
+
+    async with get_async_cursor(commit=True) as cur:
+        await cur.execute(
+            "SELECT * FROM mark_attendance_bulk(%s, %s, %s)",
+            (event_id, req.user_ids, req.srns),
+        )
+        rows = await cur.fetchall()
+
+    counts = dict.fromkeys(ATTENDANCE_RESULTS.values(), 0)
+    results = []
+    for row in rows:
+        status = ATTENDANCE_RESULTS[row["status"]]
+        counts[status] += 1
+        results.append({"user_id": row["user_id"], "srn": row["srn"], "status": status})
+    return {"counts": counts, "results": results}
+
+
+@app.post("/attendance/scans", status_code=202)
+async def ingest_scan(scan: AttendanceScan):
+    """Accept one door scan; it is written to the database by the next batch flush."""
+    if (scan.user_id is None) == (scan.srn is None):
+        raise HTTPException(status_code=400, detail="Give exactly one of user_id or srn")
+    try:
+        queued = scan_buffer.add(scan.event_id, scan.user_id, scan.srn)
+    except ScanQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {"queued": queued}
+
+
+@app.get("/attendance/scans/stats")
+async def scan_stats():
+    """Scan buffer depth, flush lag and per-status totals."""
+    return scan_buffer.stats()
+
+
 @app.get("/registrations/{user_id}", response_model=list[RegistrationOut])
-def list_user_registrations(user_id: int):
+async def list_user_registrations(user_id: int):
     """Get upcoming registrations for a specific student."""
-    with get_cursor() as cur:
-        cur.execute("""
+    async with get_async_cursor() as cur:
+        await cur.execute("""
             SELECT e.id AS event_id, e.name AS event_name,
                    e.date, e.start_time,
                    v.name AS venue_name
@@ -434,10 +784,10 @@ def list_user_registrations(user_id: int):
             JOIN tbl_events e ON p.event_id = e.id
             LEFT JOIN tbl_venues v ON e.location_id = v.id
             WHERE p.user_id = %s
-              AND (e.date + e.end_time) > NOW()
+              AND e.ends_at > NOW()
             ORDER BY e.date
         """, (user_id,))
-        return cur.fetchall()
+        return await cur.fetchall()
 
 
 # ══════════════════════════════════════════
@@ -445,24 +795,40 @@ def list_user_registrations(user_id: int):
 # ══════════════════════════════════════════
 
 @app.get("/resources", response_model=list[ResourceOut])
-def list_resources():
-    with get_cursor() as cur:
-        cur.execute(
-            "SELECT id, name, type, quantity, maintenance_status "
-            "FROM tbl_resources ORDER BY name"
-        )
-        return cur.fetchall()
+async def list_resources(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+):
+    after_sql, after_params = keyset_filter(after, ("name", "id"))
+    limit_sql, limit_params = limit_clause(limit)
+
+    async def load():
+        async with get_async_cursor() as cur:
+            await cur.execute(f"""
+                SELECT id, name, type, quantity, maintenance_status
+                FROM tbl_resources
+                WHERE {after_sql}
+                ORDER BY name, id
+                {limit_sql}
+            """, after_params + limit_params)
+            return await cur.fetchall()
+
+    return await response_cache.fetch(
+        f"resources:{limit}:{after}", ("resources",),
+        load, list[ResourceOut], request, page=(limit, ("name", "id")),
+    )
 
 
 @app.post("/events/{event_id}/resources", status_code=201)
-def assign_resource(event_id: int, req: ResourceAssign):
+async def assign_resource(event_id: int, req: ResourceAssign):
     if req.booking_end <= req.booking_start:
         raise HTTPException(
             status_code=400, detail="Booking end must be after start"
         )
 
-    with get_cursor(commit=True) as cur:
-        cur.execute("""
+    async with get_async_cursor(commit=True) as cur:
+        await cur.execute("""
             INSERT INTO tbl_event_resources
             (event_id, resource_id, quantity_booked, booking_start, booking_end)
             VALUES (%s, %s, %s, %s, %s)
@@ -470,28 +836,33 @@ def assign_resource(event_id: int, req: ResourceAssign):
             event_id, req.resource_id, req.quantity_booked,
             req.booking_start, req.booking_end,
         ))
-        return {"message": "Resource assigned"}
+
+    response_cache.invalidate("resources")
+    return {"message": "Resource assigned"}
 
 
 @app.post("/resources/replenish")
-def replenish_resources():
-    with get_cursor(commit=True) as cur:
-        cur.execute("SELECT replenish_resources()")
-        row = cur.fetchone()
+async def replenish_resources():
+    async with get_async_cursor(commit=True) as cur:
+        await cur.execute("SELECT replenish_resources()")
+        row = await cur.fetchone()
         restored = row["replenish_resources"] if row else 0
-        return {"restored": restored}
+
+    if restored:
+        response_cache.invalidate("resources")
+    return {"restored": restored}
 
 
 @app.post("/resources/{resource_id}/maintenance", status_code=201)
-def schedule_maintenance(resource_id: int, req: MaintenanceCreate):
+async def schedule_maintenance(resource_id: int, req: MaintenanceCreate):
     if req.maintenance_end <= req.maintenance_start:
         raise HTTPException(
             status_code=400,
             detail="Maintenance end must be after start",
         )
 
-    with get_cursor(commit=True) as cur:
-        cur.execute("""
+    async with get_async_cursor(commit=True) as cur:
+        await cur.execute("""
             INSERT INTO tbl_resource_maintenance
             (resource_id, maintenance_start, maintenance_end, description)
             VALUES (%s, %s, %s, %s)
@@ -499,4 +870,145 @@ def schedule_maintenance(resource_id: int, req: MaintenanceCreate):
             resource_id, req.maintenance_start,
             req.maintenance_end, req.description,
         ))
-        return {"message": "Maintenance scheduled"}
+
+    response_cache.invalidate("resources")
+    return {"message": "Maintenance scheduled"}
+
+
+# ══════════════════════════════════════════
+#  DASHBOARDS
+# ══════════════════════════════════════════
+# Everything a frontend page needs in one response, built by a single
+# statement (CTEs + json_agg) so a page costs one HTTP and one DB round trip.
+# Both are cached across every table they read; the ":*" tags drop them
+# on a change to any one event's tickets or participants.
+
+DASHBOARD_TAGS = (
+    "events", "venues", "hosts", "resources", "students",
+    "tickets", "tickets:*", "participants", "participants:*", CLOCK,
+)
+
+
+@app.get("/dashboard/admin", response_model=AdminDashboardOut)
+async def admin_dashboard(request: Request):
+    """Upcoming events with registration/attendance/stock, venues, hosts, resources and totals."""
+    return await response_cache.fetch(
+        "dashboard_admin", DASHBOARD_TAGS, _load_admin_dashboard, AdminDashboardOut, request
+    )
+
+
+async def _load_admin_dashboard():
+    async with get_async_cursor() as cur:
+        await cur.execute("""
+            WITH upcoming AS (
+                SELECT e.id, e.name, e.description, e.date,
+                       e.start_time, e.end_time,
+                       e.location_id, v.name AS venue_name,
+                       e.organizer_id, h.name AS host_name,
+                       e.status, e.max_participants
+                FROM tbl_events e
+                LEFT JOIN tbl_venues v ON e.location_id = v.id
+                LEFT JOIN tbl_hosts h ON e.organizer_id = h.id
+                WHERE e.ends_at > NOW()
+            ),
+            participation AS (
+                SELECT p.event_id,
+                       COUNT(*) AS registered,
+                       COUNT(*) FILTER (WHERE p.attendance_status) AS attended
+                FROM tbl_event_participants p
+                JOIN upcoming u ON u.id = p.event_id
+                GROUP BY p.event_id
+            ),
+            stock AS (
+                SELECT t.event_id,
+                       SUM(t.quantity + COALESCE((
+                           SELECT SUM(s.quantity)
+                           FROM tbl_ticket_shards s
+                           WHERE s.ticket_id = t.id
+                       ), 0)) AS tickets_remaining
+                FROM tbl_tickets t
+                JOIN upcoming u ON u.id = t.event_id
+                GROUP BY t.event_id
+            ),
+            events AS (
+                SELECT u.*,
+                       COALESCE(p.registered, 0) AS registered,
+                       COALESCE(p.attended, 0) AS attended,
+                       st.tickets_remaining
+                FROM upcoming u
+                LEFT JOIN participation p ON p.event_id = u.id
+                LEFT JOIN stock st ON st.event_id = u.id
+            )
+            SELECT
+                json_build_object(
+                    'upcoming_events', (SELECT COUNT(*) FROM upcoming),
+                    'completed_events', (SELECT COUNT(*) FROM tbl_events WHERE ends_at <= NOW()),
+                    'students', (SELECT COUNT(*) FROM tbl_students),
+                    'upcoming_registrations', (SELECT COALESCE(SUM(registered), 0) FROM participation),
+                    'available_venues', (SELECT COUNT(*) FROM tbl_venues WHERE is_available)
+                ) AS summary,
+                (SELECT COALESCE(json_agg(ev ORDER BY ev.date, ev.start_time), '[]')
+                 FROM events ev) AS upcoming_events,
+                (SELECT COALESCE(json_agg(v ORDER BY v.name), '[]')
+                 FROM (SELECT id, name, building, capacity, is_available
+                       FROM tbl_venues) v) AS venues,
+                (SELECT COALESCE(json_agg(h ORDER BY h.name), '[]')
+                 FROM (SELECT id, name, department, role
+                       FROM tbl_hosts) h) AS hosts,
+                (SELECT COALESCE(json_agg(r ORDER BY r.name, r.id), '[]')
+                 FROM (SELECT id, name, type, quantity, maintenance_status
+                       FROM tbl_resources) r) AS resources
+        """)
+        return await cur.fetchone()
+
+
+@app.get("/dashboard/student/{user_id}", response_model=StudentDashboardOut)
+async def student_dashboard(user_id: int, request: Request):
+    """A student's profile, upcoming registrations, upcoming events (flagged if registered) and completed events."""
+    return await response_cache.fetch(
+        f"dashboard_student:{user_id}", DASHBOARD_TAGS,
+        lambda: _load_student_dashboard(user_id), StudentDashboardOut, request,
+    )
+
+
+async def _load_student_dashboard(user_id):
+    async with get_async_cursor() as cur:
+        await cur.execute("""
+            WITH events AS (
+                SELECT e.id, e.name, e.description, e.date,
+                       e.start_time, e.end_time,
+                       e.location_id, v.name AS venue_name,
+                       e.organizer_id, h.name AS host_name,
+                       e.status, e.max_participants,
+                       e.ends_at,
+                       EXISTS (
+                           SELECT 1 FROM tbl_event_participants p
+                           WHERE p.event_id = e.id AND p.user_id = %(user_id)s
+                       ) AS is_registered
+                FROM tbl_events e
+                LEFT JOIN tbl_venues v ON e.location_id = v.id
+                LEFT JOIN tbl_hosts h ON e.organizer_id = h.id
+            )
+            SELECT
+                (SELECT to_json(s)
+                 FROM (SELECT id, srn, name, semester, section
+                       FROM tbl_students WHERE id = %(user_id)s) s) AS student,
+                (SELECT COALESCE(json_agg(json_build_object(
+                            'event_id', ev.id, 'event_name', ev.name,
+                            'date', ev.date, 'start_time', ev.start_time,
+                            'venue_name', ev.venue_name
+                        ) ORDER BY ev.date), '[]')
+                 FROM events ev
+                 WHERE ev.is_registered AND ev.ends_at > NOW()) AS registrations,
+                (SELECT COALESCE(json_agg(ev ORDER BY ev.date, ev.start_time), '[]')
+                 FROM events ev
+                 WHERE ev.ends_at > NOW()) AS upcoming_events,
+                (SELECT COALESCE(json_agg(ev ORDER BY ev.ends_at DESC, ev.id DESC), '[]')
+                 FROM events ev
+                 WHERE ev.ends_at <= NOW()) AS completed_events
+        """, {"user_id": user_id})
+        row = await cur.fetchone()
+        if not row or row["student"] is None:
+            raise HTTPException(status_code=404, detail="Student not found")
+        return row
+
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import date, time, datetime
 
@@ -67,6 +67,11 @@ class TicketCreate(BaseModel):
     ticket_type: str
     price: float
     quantity: int
+    shards: int = 1
+
+
+class TicketShardUpdate(BaseModel):
+    shards: int
 
 
 # ──────────── Registration ────────────
@@ -80,6 +85,25 @@ class CancelRequest(BaseModel):
     user_id: int
 
 
+# ──────────── Ticket Holds ────────────
+
+class HoldRequest(BaseModel):
+    user_id: int
+    ticket_id: int
+
+
+class HoldAction(BaseModel):
+    user_id: int
+
+
+class HoldOut(BaseModel):
+    id: int
+    event_id: int
+    ticket_id: int
+    user_id: int
+    expires_at: datetime
+
+
 # ──────────── Orders ────────────
 
 class OrderOut(BaseModel):
@@ -99,6 +123,42 @@ class ParticipantOut(BaseModel):
     attendance_status: Optional[bool] = None
 
 
+class EventParticipantOut(BaseModel):
+    event_name: str
+    student_name: str
+    srn: str
+    attendance_status: Optional[bool] = None
+
+
+class AttendanceBulk(BaseModel):
+    user_ids: list[int] = []
+    srns: list[str] = []
+
+
+class AttendanceResult(BaseModel):
+    user_id: Optional[int] = None
+    srn: Optional[str] = None
+    status: str
+
+
+BIGINT_MAX = 2**63 - 1
+MAX_SRN_LENGTH = 64
+
+
+class AttendanceScan(BaseModel):
+    # Bounded here so a malformed scan is refused at intake rather than
+    # failing its whole batch at flush time
+    event_id: int = Field(ge=1, le=BIGINT_MAX)
+    user_id: Optional[int] = Field(None, ge=1, le=BIGINT_MAX)
+    srn: Optional[str] = Field(None, min_length=1, max_length=MAX_SRN_LENGTH,
+                               pattern=r"^[^\x00-\x1f\x7f]+$")
+
+
+class AttendanceBulkOut(BaseModel):
+    counts: dict[str, int]
+    results: list[AttendanceResult]
+
+
 class RegistrationOut(BaseModel):
     event_id: int
     event_name: str
@@ -128,3 +188,53 @@ class MaintenanceCreate(BaseModel):
     maintenance_start: datetime
     maintenance_end: datetime
     description: Optional[str] = None
+
+
+# ──────────── Dashboards ────────────
+
+class HostOut(BaseModel):
+    id: int
+    name: str
+    department: Optional[str] = None
+    role: Optional[str] = None
+
+
+class StudentOut(BaseModel):
+    id: int
+    srn: str
+    name: str
+    semester: int
+    section: str
+
+
+class DashboardEventOut(EventOut):
+    registered: int = 0
+    attended: int = 0
+    tickets_remaining: Optional[int] = None   # None when no tickets exist yet
+
+
+class DashboardSummary(BaseModel):
+    upcoming_events: int
+    completed_events: int
+    students: int
+    upcoming_registrations: int
+    available_venues: int
+
+
+class AdminDashboardOut(BaseModel):
+    summary: DashboardSummary
+    upcoming_events: list[DashboardEventOut]
+    venues: list[VenueOut]
+    hosts: list[HostOut]
+    resources: list[ResourceOut]
+
+
+class StudentEventOut(EventOut):
+    is_registered: bool = False
+
+
+class StudentDashboardOut(BaseModel):
+    student: StudentOut
+    registrations: list[RegistrationOut]
+    upcoming_events: list[StudentEventOut]
+    completed_events: list[EventOut]
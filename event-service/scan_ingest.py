@@ -0,0 +1,212 @@
+"""
+Write-behind buffer for door-scanner attendance.
+
+Scanners post one scan per student; each scan is acknowledged as soon as it
+is queued in memory. A background flusher drains the queue every
+SCAN_FLUSH_INTERVAL_MS, or as soon as SCAN_FLUSH_MAX scans are pending,
+writing each event's batch with mark_attendance_bulk() (db/part12). Repeat
+scans of a student already waiting in the queue are dropped.
+
+A batch that fails on a transient error (connection lost, pool timeout)
+is put back and retried on the next flush, until its scans are
+SCAN_RETRY_MAX_AGE seconds old; then they are dropped. A batch the
+database rejects outright (bad data, constraint violation) is split in
+half and retried until the offending scans are isolated; those are
+dropped and listed in the stats, so one bad scan can't hold up the rest.
+"""
+
+import os
+import time
+import asyncio
+from collections import deque
+import psycopg
+from database import get_async_cursor
+
+SCAN_FLUSH_INTERVAL_MS = int(os.getenv("SCAN_FLUSH_INTERVAL_MS", "250"))
+SCAN_FLUSH_MAX = int(os.getenv("SCAN_FLUSH_MAX", "500"))        # pending scans that force an early flush
+SCAN_QUEUE_MAX = int(os.getenv("SCAN_QUEUE_MAX", "50000"))      # reject scans beyond this backlog
+SCAN_RETRY_MAX_AGE = float(os.getenv("SCAN_RETRY_MAX_AGE", "600"))  # seconds a failing scan is retried
+REJECTIONS_KEPT = 50                                              # rejected scans listed in the stats
+
+# Errors retrying won't fix: the batch is split to find the scans at fault
+PERMANENT_ERRORS = (psycopg.DataError, psycopg.IntegrityError, psycopg.ProgrammingError)
+
+# mark_attendance_bulk() status codes (db/part12_bulk_attendance.sql)
+ATTENDANCE_RESULTS = {
+    0: "marked",
+    1: "already_marked",
+    2: "not_registered",
+    3: "unknown_srn",
+}
+
+
+class ScanQueueFull(Exception):
+    """Raised when the backlog of unflushed scans has hit SCAN_QUEUE_MAX."""
+
+
+class ScanBuffer:
+    def __init__(self, flush_interval_ms, flush_max, queue_max):
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_max = flush_max
+        self.queue_max = queue_max
+
+        # event_id -> {("id", user_id) | ("srn", srn): first scanned at}
+        self._pending = {}
+        self._depth = 0
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._stats = {
+            "scans_received": 0,
+            "duplicates_dropped": 0,
+            "scans_flushed": 0,
+            "flushes": 0,
+            "flush_failures": 0,
+            "scans_rejected": 0,
+            "scans_expired": 0,
+            "marked": 0,
+            "already_marked": 0,
+            "not_registered": 0,
+            "unknown_srn": 0,
+        }
+        self._last_flush = {"at": None, "duration_ms": None, "lag_ms": None, "error": None}
+        self._rejections = deque(maxlen=REJECTIONS_KEPT)
+
+    # ── intake ──
+
+    def add(self, event_id, user_id=None, srn=None):
+        """Queue one scan; returns False if it duplicates a scan still pending."""
+        key = ("id", user_id) if user_id is not None else ("srn", srn)
+        self._stats["scans_received"] += 1
+        if key in self._pending.get(event_id, ()):
+            self._stats["duplicates_dropped"] += 1
+            return False
+        if self._depth >= self.queue_max:
+            raise ScanQueueFull(f"Scan backlog is full ({self.queue_max} pending)")
+
+        self._pending.setdefault(event_id, {})[key] = time.monotonic()
+        self._depth += 1
+        if self._depth >= self.flush_max:
+            self._wakeup.set()
+        return True
+
+    # ── flushing ──
+
+    async def run(self):
+        """Background task: flush on the interval, or early when the batch fills."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"[scan-ingest] Flush FAILED: {e}")
+
+    async def flush(self):
+        """Write every pending scan; see the module docstring for failures."""
+        async with self._flush_lock:
+            if not self._depth:
+                return
+            batch, self._pending, self._depth = self._pending, {}, 0
+            oldest = min(t for scans in batch.values() for t in scans.values())
+            started = time.monotonic()
+            error = None
+
+            for event_id, scans in batch.items():
+                error = await self._flush_event(event_id, scans) or error
+
+            finished = time.monotonic()
+            self._stats["flushes"] += 1
+            self._last_flush = {
+                "at": time.time(),
+                "duration_ms": round((finished - started) * 1000, 2),
+                "lag_ms": round((finished - oldest) * 1000, 2),
+                "error": error,
+            }
+
+    async def _flush_event(self, event_id, scans):
+        """Write one event's scans; returns the last error message, if any."""
+        user_ids = [v for kind, v in scans if kind == "id"]
+        srns = [v for kind, v in scans if kind == "srn"]
+        try:
+            async with get_async_cursor(commit=True) as cur:
+                await cur.execute(
+                    "SELECT status FROM mark_attendance_bulk(%s, %s, %s)",
+                    (event_id, user_ids, srns),
+                )
+                rows = await cur.fetchall()
+        except PERMANENT_ERRORS as e:
+            self._stats["flush_failures"] += 1
+            if len(scans) == 1:
+                self._reject(event_id, scans, e)
+                return str(e)
+            keys = list(scans)
+            half = len(keys) // 2
+            first = await self._flush_event(event_id, {k: scans[k] for k in keys[:half]})
+            second = await self._flush_event(event_id, {k: scans[k] for k in keys[half:]})
+            return second or first
+        except Exception as e:
+            self._stats["flush_failures"] += 1
+            self._retry(event_id, scans)
+            return str(e)
+
+        self._stats["scans_flushed"] += len(scans)
+        for row in rows:
+            self._stats[ATTENDANCE_RESULTS[row["status"]]] += 1
+        return None
+
+    def _reject(self, event_id, scans, error):
+        for kind, value in scans:
+            self._stats["scans_rejected"] += 1
+            self._rejections.append({
+                "event_id": event_id,
+                "user_id" if kind == "id" else "srn": value,
+                "error": str(error).strip(),
+            })
+            print(f"[scan-ingest] Rejected scan {kind}={value!r} for event {event_id}: {error}")
+
+    def _retry(self, event_id, scans):
+        cutoff = time.monotonic() - SCAN_RETRY_MAX_AGE
+        keep = {key: t for key, t in scans.items() if t >= cutoff}
+        expired = len(scans) - len(keep)
+        if expired:
+            self._stats["scans_expired"] += expired
+            print(f"[scan-ingest] Dropped {expired} scans for event {event_id} "
+                  f"still failing after {SCAN_RETRY_MAX_AGE:.0f}s")
+        if keep:
+            self._requeue(event_id, keep)
+
+    def _requeue(self, event_id, scans):
+        pending = self._pending.setdefault(event_id, {})
+        for key, scanned_at in scans.items():
+            if key not in pending:
+                self._depth += 1
+            pending[key] = min(scanned_at, pending.get(key, scanned_at))
+
+    # ── stats ──
+
+    def stats(self):
+        now = time.monotonic()
+        oldest = min(
+            (t for scans in self._pending.values() for t in scans.values()),
+            default=None,
+        )
+        return {
+            "queue_depth": self._depth,
+            "oldest_pending_ms": round((now - oldest) * 1000, 2) if oldest else 0.0,
+            "flush_interval_ms": round(self.flush_interval * 1000),
+            "flush_max": self.flush_max,
+            "queue_max": self.queue_max,
+            **self._stats,
+            "last_flush": self._last_flush,
+            "recent_rejections": list(self._rejections),
+        }
+
+
+scan_buffer = ScanBuffer(
+    flush_interval_ms=SCAN_FLUSH_INTERVAL_MS,
+    flush_max=SCAN_FLUSH_MAX,
+    queue_max=SCAN_QUEUE_MAX,
+)
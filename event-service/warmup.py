@@ -0,0 +1,79 @@
+"""
+Startup warm-up and readiness.
+
+A restarted service answers its first requests slowly: database
+connections are opened on demand, Postgres plans each query (and loads
+the pages it reads) for the first time, pydantic builds its serializers
+lazily and the response cache is empty. The lifespan starts a WarmUp task
+that does this work up front: it runs a list of named steps — opening
+pool connections, then GETs of the hot endpoints sent straight to the app
+over ASGI, so they take the real code path and fill the response cache.
+
+/health answers as soon as the process is up; /ready returns 503 until
+every step has run, then 200 with each step's timing. A failed step is
+recorded and logged but doesn't hold readiness back — the endpoints
+recover on their own once the database is reachable again.
+"""
+
+import asyncio
+import os
+import time
+
+import httpx
+from fastapi.responses import JSONResponse
+
+WARMUP_STEP_TIMEOUT = float(os.getenv("WARMUP_STEP_TIMEOUT", "30"))  # seconds per step
+
+
+class WarmUp:
+    def __init__(self, service):
+        self.service = service
+        self.ready = False
+        self._steps = []
+        self._timings = {}
+        self._errors = {}
+        self._total_ms = None
+
+    def step(self, name, action):
+        """Queue action, a coroutine function, to run as part of the warm-up."""
+        self._steps.append((name, action))
+
+    def get(self, app, *paths):
+        """Queue GETs of paths, sent to app in process, as one step per path."""
+        for path in paths:
+            self.step(f"GET {path}", lambda path=path: _get(app, path))
+
+    async def run(self):
+        started = time.perf_counter()
+        for name, action in self._steps:
+            step_started = time.perf_counter()
+            try:
+                await asyncio.wait_for(action(), WARMUP_STEP_TIMEOUT)
+            except Exception as e:
+                self._errors[name] = str(e).strip() or type(e).__name__
+                print(f"[warm-up] {name} FAILED: {self._errors[name]}")
+            self._timings[name] = round((time.perf_counter() - step_started) * 1000, 2)
+        self._total_ms = round((time.perf_counter() - started) * 1000, 2)
+        self.ready = True
+        print(f"[warm-up] {self.service} ready in {self._total_ms} ms "
+              f"({len(self._errors)} of {len(self._steps)} steps failed)")
+
+    def report(self):
+        return {
+            "status": "ready" if self.ready else "warming_up",
+            "service": self.service,
+            "total_ms": self._total_ms,
+            "steps_ms": dict(self._timings),
+            "errors": dict(self._errors),
+        }
+
+    def response(self):
+        """Body for /ready: 503 until the warm-up has finished."""
+        return JSONResponse(status_code=200 if self.ready else 503, content=self.report())
+
+
+async def _get(app, path):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://warm-up") as client:
+        resp = await client.get(path)
+        resp.raise_for_status()
@@ -0,0 +1,221 @@
+"""
+In-process response cache for hot, rarely-changing list endpoints.
+
+Entries hold the serialized JSON body, expire after a TTL, and are evicted
+least-recently-used beyond max_entries. Each entry is tagged with the data
+it was built from (e.g. "venues", "tickets:12"); write paths call
+invalidate(tag) after they commit, which bumps the tag's version so every
+entry built from it is dropped on its next lookup. A body computed while
+one of its tags was being invalidated is not stored, so a read racing a
+write can't put stale data back.
+
+The same tag versions give each response a strong ETag without hashing the
+body: the versions are snapshotted before the query runs, so a matching
+If-None-Match is answered 304 without touching the database. Results that
+depend on the current time also carry the CLOCK tag, whose version is the
+current TTL window. Invalidating a sub-tag ("tickets:12") also bumps its
+family's wildcard ("tickets:*"), for results built across every member
+of the family, such as dashboards. clear() bumps an EPOCH version that every snapshot
+includes, so it retires all ETags, including those of tags never
+invalidated on this replica.
+
+Versions are per process (salted with INSTANCE_ID), so an ETag only
+validates against the replica that issued it; another replica answers a
+full 200 and its own ETag.
+"""
+
+import os
+import time
+import uuid
+import threading
+from types import SimpleNamespace
+from collections import OrderedDict
+from fastapi import Response
+from pydantic import TypeAdapter
+from pagination import finish_page
+
+CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))  # seconds
+CACHE_HEADER = "X-Cache"
+
+CLOCK = "clock"                     # tag for results that change as time passes (NOW())
+EPOCH = "*"                         # pseudo-tag in every snapshot; bumped by clear()
+INSTANCE_ID = uuid.uuid4().hex[:8]  # versions restart with the process; old ETags must not match
+
+
+class ResponseCache:
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._entries = OrderedDict()   # key -> (expires_at, tag versions, body, headers)
+        self._versions = {}             # tag -> invalidation counter
+        self._epoch = 0                 # clear() counter
+        self._adapters = {}             # response model -> TypeAdapter
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "not_modified": 0,
+            "stores": 0,
+            "stale_stores_skipped": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+        self._by_name = {}              # key prefix -> {"hits", "misses", "not_modified"}
+
+    # ── versions ──
+
+    def _version_locked(self, tag):
+        if tag == CLOCK:
+            return int(time.time() // self.ttl)
+        if tag == EPOCH:
+            return self._epoch
+        return self._versions.get(tag, 0)
+
+    def snapshot(self, tags):
+        """Current versions of tags — take this before running the query."""
+        with self._lock:
+            return {tag: self._version_locked(tag) for tag in (*tags, EPOCH)}
+
+    def invalidate(self, *tags):
+        """Drop every entry built from any of tags (call after the write commits)."""
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+                family, sep, _ = tag.partition(":")
+                if sep:
+                    wildcard = f"{family}:*"
+                    self._versions[wildcard] = self._versions.get(wildcard, 0) + 1
+            self._stats["invalidations"] += len(tags)
+
+    def clear(self):
+        """Drop every entry and retire every ETag issued so far."""
+        with self._lock:
+            self._entries.clear()
+            self._epoch += 1
+
+    @staticmethod
+    def etag(versions):
+        return '"{}-{}"'.format(
+            INSTANCE_ID, ".".join(f"{tag}={versions[tag]}" for tag in sorted(versions))
+        )
+
+    # ── lookup / store ──
+
+    def get(self, key, versions):
+        """Cached (body, headers) built at versions, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, built_at, body, headers = entry
+                if expires_at > time.monotonic() and built_at == versions:
+                    self._entries.move_to_end(key)
+                    self._count(key, "hits")
+                    return body, headers
+                del self._entries[key]
+            self._count(key, "misses")
+            return None
+
+    def put(self, key, versions, body, headers, ttl=None):
+        with self._lock:
+            if any(self._version_locked(tag) != v for tag, v in versions.items()):
+                self._stats["stale_stores_skipped"] += 1
+                return
+            self._entries[key] = (time.monotonic() + (ttl or self.ttl), versions, body, headers)
+            self._entries.move_to_end(key)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    # ── endpoint helpers ──
+
+    async def fetch(self, key, tags, load, model, request=None, ttl=None, page=None):
+        """
+        JSON response for key: 304 when the client's ETag is current, the
+        cached body when fresh, otherwise built by awaiting load() and
+        serialized through model. page=(limit, key_fields) trims a keyset
+        page and sets its next-cursor header, as finish_page() does.
+        """
+        versions, etag, response = self._lookup(key, tags, request)
+        if response is not None:
+            return response
+        return self._build(key, versions, etag, await load(), model, ttl, page)
+
+    def fetch_sync(self, key, tags, load, model, request=None, ttl=None, page=None):
+        """fetch() for plain (threadpool) endpoints."""
+        versions, etag, response = self._lookup(key, tags, request)
+        if response is not None:
+            return response
+        return self._build(key, versions, etag, load(), model, ttl, page)
+
+    def _lookup(self, key, tags, request):
+        versions = self.snapshot(tags)
+        etag = self.etag(versions)
+        if request is not None and _etag_matches(request.headers.get("if-none-match"), etag):
+            with self._lock:
+                self._count(key, "not_modified")
+            return versions, etag, Response(status_code=304, headers={"ETag": etag})
+
+        cached = self.get(key, versions)
+        if cached is not None:
+            body, headers = cached
+            return versions, etag, self._response(body, headers, etag, "HIT")
+        return versions, etag, None
+
+    def _build(self, key, versions, etag, rows, model, ttl, page):
+        headers = {}
+        if page is not None:
+            limit, key_fields = page
+            rows = finish_page(rows, limit, key_fields, SimpleNamespace(headers=headers))
+        body = self._serialize(model, rows)
+        self.put(key, versions, body, headers, ttl)
+        return self._response(body, headers, etag, "MISS")
+
+    def _serialize(self, model, value):
+        adapter = self._adapters.get(model)
+        if adapter is None:
+            adapter = self._adapters[model] = TypeAdapter(model)
+        return adapter.dump_json(adapter.validate_python(value))
+
+    @staticmethod
+    def _response(body, headers, etag, status):
+        return Response(content=body, media_type="application/json",
+                        headers={**headers, "ETag": etag, CACHE_HEADER: status})
+
+    # ── stats ──
+
+    def _count(self, key, outcome):
+        self._stats[outcome] += 1
+        name = key.split(":", 1)[0]
+        counters = self._by_name.setdefault(
+            name, {"hits": 0, "misses": 0, "not_modified": 0}
+        )
+        counters[outcome] += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "entries": len(self._entries),
+                **self._stats,
+                "hit_ratio": round(self._stats["hits"] / lookups, 3) if lookups else None,
+                "by_key": {name: dict(c) for name, c in self._by_name.items()},
+            }
+
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+response_cache = ResponseCache(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
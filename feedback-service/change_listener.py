@@ -0,0 +1,120 @@
+"""
+Cross-replica cache invalidation.
+
+The db/part13 triggers pg_notify('eventra_changes', ...) on every write to a
+cached table. Each replica keeps one dedicated connection LISTENing on that
+channel and evicts the matching response-cache tags, so a write handled by
+one replica doesn't leave the others serving stale lists. Whenever the
+connection has to be re-established the whole cache is cleared, since
+notifications sent while it was down are lost. The first connect leaves
+it alone: nothing can have been missed yet.
+
+This service is psycopg2-based, so the listener runs in its own thread and
+waits on the connection socket with select().
+"""
+
+import os
+import json
+import select
+import threading
+import psycopg2
+from psycopg2 import extensions
+from database import DB_CONFIG
+
+CHANGE_CHANNEL = "eventra_changes"
+LISTEN_PING_INTERVAL = float(os.getenv("CHANGE_LISTENER_PING", "60"))  # seconds between liveness checks
+RECONNECT_MIN_DELAY = 1     # seconds; doubles per failed attempt
+RECONNECT_MAX_DELAY = 60
+
+
+def change_tags(payload):
+    """Cache tags affected by one change notification."""
+    try:
+        change = json.loads(payload)
+        table = change["table"]
+    except (ValueError, TypeError, KeyError):
+        return ()
+    event_id = change.get("event_id")
+
+    if table == "tbl_events":
+        return ("events",)
+    if table in ("tbl_tickets", "tbl_ticket_shards"):
+        return (f"tickets:{event_id}",) if event_id is not None else ("tickets",)
+    if table == "tbl_event_participants":
+        return (f"participants:{event_id}",) if event_id is not None else ("participants",)
+    if table == "tbl_venues":
+        return ("venues",)
+    if table == "tbl_hosts":
+        return ("hosts",)
+    if table == "tbl_resources":
+        return ("resources",)
+    if table == "tbl_event_feedback":
+        # "feedback" covers cross-event views such as the leaderboard
+        return (f"feedback:{event_id}", "feedback") if event_id is not None else ("feedback",)
+    if table == "tbl_students":
+        return ("students",)
+    return ()
+
+
+class ChangeListener:
+    def __init__(self, cache):
+        self.cache = cache
+        self._stop = threading.Event()
+        self._listening = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="change-listener", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def wait_listening(self, timeout):
+        """Block until the first LISTEN has succeeded."""
+        if not self._listening.wait(timeout):
+            raise TimeoutError(f"not listening on {CHANGE_CHANNEL} after {timeout}s")
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        delay = RECONNECT_MIN_DELAY
+        reconnecting = False
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(**DB_CONFIG)
+                conn.set_isolation_level(extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {CHANGE_CHANNEL}")
+                    if reconnecting:
+                        self.cache.clear()
+                    reconnecting = True
+                    self._listening.set()
+                    delay = RECONNECT_MIN_DELAY
+                    print(f"[change-listener] Listening on {CHANGE_CHANNEL}")
+                    self._listen(conn, cur)
+            except (psycopg2.Error, OSError) as e:
+                print(f"[change-listener] Connection lost ({e}); retrying in {delay}s")
+            finally:
+                if conn is not None:
+                    conn.close()
+            self._stop.wait(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    def _listen(self, conn, cur):
+        idle = 0.0
+        while not self._stop.is_set():
+            # Wake at least once a second so stop() is honoured promptly
+            if select.select([conn], [], [], 1.0) == ([], [], []):
+                idle += 1.0
+                if idle >= LISTEN_PING_INTERVAL:
+                    cur.execute("SELECT 1")  # quiet period — make sure we're still connected
+                    idle = 0.0
+                continue
+
+            idle = 0.0
+            conn.poll()
+            while conn.notifies:
+                note = conn.notifies.pop(0)
+                self.cache.invalidate(*change_tags(note.payload))
@@ -1,5 +1,9 @@
 import os
+import time
+import threading
+from collections import deque
 import psycopg2
+from psycopg2 import extensions
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 from contextlib import contextmanager
@@ -15,6 +19,17 @@ DB_CONFIG = {
     "sslmode": "require"
 }
 
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))        # seconds to wait for a free connection
+POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", "300"))     # close connections idle longer than this
+POOL_CHECK_AFTER = float(os.getenv("DB_POOL_CHECK_AFTER", "30"))  # ping connections idle longer than this
+POOL_REAP_INTERVAL = float(os.getenv("DB_POOL_REAP_INTERVAL", "60"))  # seconds between idle sweeps
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection became free within the pool timeout."""
+
 
 def get_connection():
     conn = psycopg2.connect(**DB_CONFIG)
@@ -22,17 +37,235 @@ def get_connection():
     return conn
 
 
+class ConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections.
+
+    Idle connections are reused LIFO, pinged on checkout when they have sat
+    idle for a while, and closed once idle past max_idle (never below
+    min_size) — checked on every return, and by reap() on a timer for when
+    traffic stops. When all max_size connections are busy, callers wait up to
+    timeout seconds before PoolTimeout is raised.
+    """
+
+    def __init__(self, min_size, max_size, timeout, max_idle, check_after):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check_after = check_after
+
+        self._idle = deque()    # (conn, returned_at) — right end is most recent
+        self._size = 0          # open connections, idle + in use
+        self._cond = threading.Condition()
+        self._stats = {
+            "checkouts": 0,
+            "connections_opened": 0,
+            "connections_closed": 0,
+            "health_check_failures": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "wait_time_ms": 0.0,
+        }
+
+    # ── checkout / return ──
+
+    def getconn(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            conn, idle_for = self._acquire(deadline)
+            if conn is None:
+                try:
+                    conn = get_connection()
+                except Exception:
+                    self._forget()
+                    raise
+                with self._cond:
+                    self._stats["connections_opened"] += 1
+                return conn
+
+            if self._is_healthy(conn, idle_for):
+                return conn
+
+            with self._cond:
+                self._stats["health_check_failures"] += 1
+            self._discard(conn)
+
+    def putconn(self, conn):
+        if conn.closed or conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            expired = self._reap_locked()
+            self._cond.notify()
+
+        for stale in expired:
+            self._close_quietly(stale)
+
+    def _acquire(self, deadline):
+        """Pop an idle connection or reserve a slot for a new one (returns None)."""
+        started = time.monotonic()
+        waited = False
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                    result = (conn, time.monotonic() - returned_at)
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    result = (None, 0.0)
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"No database connection available within {self.timeout}s "
+                        f"(pool max_size={self.max_size})"
+                    )
+                if not waited:
+                    self._stats["waits"] += 1
+                    waited = True
+                self._cond.wait(remaining)
+
+            self._stats["checkouts"] += 1
+            if waited:
+                self._stats["wait_time_ms"] += (time.monotonic() - started) * 1000
+            return result
+
+    # ── health & reaping ──
+
+    def _is_healthy(self, conn, idle_for):
+        if conn.closed:
+            return False
+        if idle_for < self.check_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _reap_locked(self):
+        """Drop connections idle past max_idle, oldest first, keeping min_size open."""
+        expired = []
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size:
+            conn, returned_at = self._idle[0]
+            if now - returned_at < self.max_idle:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            self._stats["connections_closed"] += 1
+            expired.append(conn)
+        return expired
+
+    def reap(self):
+        with self._cond:
+            expired = self._reap_locked()
+        for conn in expired:
+            self._close_quietly(conn)
+        return len(expired)
+
+    def _discard(self, conn):
+        self._close_quietly(conn)
+        with self._cond:
+            self._stats["connections_closed"] += 1
+        self._forget()
+
+    def _forget(self):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    # ── lifecycle & stats ──
+
+    def prefill(self, count):
+        """Open connections up to count now, instead of on the first requests."""
+        conns = []
+        try:
+            while len(conns) < min(count, self.max_size):
+                conns.append(self.getconn())
+        finally:
+            for conn in conns:
+                self.putconn(conn)
+        return len(conns)
+
+    def closeall(self):
+        with self._cond:
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._stats["connections_closed"] += len(idle)
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                **self._stats,
+                "wait_time_ms": round(self._stats["wait_time_ms"], 2),
+            }
+
+
+_pool = ConnectionPool(
+    min_size=POOL_MIN_SIZE,
+    max_size=POOL_MAX_SIZE,
+    timeout=POOL_TIMEOUT,
+    max_idle=POOL_MAX_IDLE,
+    check_after=POOL_CHECK_AFTER,
+)
+
+
+def pool_stats():
+    return _pool.stats()
+
+
+def prefill_pool(count=POOL_MIN_SIZE):
+    return _pool.prefill(count)
+
+
+def reap_pool():
+    return _pool.reap()
+
+
+def close_pool():
+    _pool.closeall()
+
+
 @contextmanager
 def get_cursor(commit=False):
-    conn = get_connection()
+    conn = _pool.getconn()
     cur = conn.cursor(cursor_factory=RealDictCursor)
     try:
         yield cur
         if commit:
             conn.commit()
+        else:
+            conn.rollback()  # end the read transaction before the connection is reused
     except Exception:
-        conn.rollback()
+        try:
+            conn.rollback()
+        except psycopg2.Error:
+            pass  # broken connection — putconn() will discard it
         raise
     finally:
         cur.close()
-        conn.close()
+        _pool.putconn(conn)
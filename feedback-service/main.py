@@ -1,10 +1,27 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Query
+from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from contextlib import asynccontextmanager
-from database import get_cursor
-from models import FeedbackOut, FeedbackCreate, AverageRatingOut
+from database import (
+    get_cursor, pool_stats, prefill_pool, reap_pool, close_pool, PoolTimeout,
+    POOL_REAP_INTERVAL,
+)
+from pagination import MAX_PAGE_SIZE, keyset_filter, limit_clause
+from cache import response_cache
+from change_listener import ChangeListener
+from warmup import WarmUp, WARMUP_STEP_TIMEOUT
+from search import (
+    DEFAULT_SEARCH_RESULTS, MAX_SEARCH_RESULTS, search_terms, prefix_tsquery,
+)
+from models import (
+    FeedbackOut, FeedbackCreate, AverageRatingOut, RatingHistogramOut,
+    LeaderboardEntryOut,
+)
+from typing import Optional
 import datetime
 import asyncio
 import httpx
+import os
 
 # URLs of all services to keep alive
 KEEP_ALIVE_URLS = [
@@ -13,9 +30,15 @@ KEEP_ALIVE_URLS = [
     "https://eventra-feedbacke-service.onrender.com/health",  # feedback-service
     "https://eventra-cc.streamlit.app/",                  # frontend
 ]
+if os.getenv("KEEP_ALIVE_URLS") is not None:
+    # Comma-separated override; empty leaves just the database ping
+    KEEP_ALIVE_URLS = [url.strip() for url in os.environ["KEEP_ALIVE_URLS"].split(",") if url.strip()]
 
 PING_INTERVAL = 600  # 10 minutes
 
+MAX_BATCH_EVENTS = 500  # event ids per /feedback/averages request
+LEADERBOARD_PRIOR_WEIGHT = float(os.getenv("LEADERBOARD_PRIOR_WEIGHT", "5"))  # pseudo-reviews at the global mean
+
 
 async def keep_alive_task():
     """Background task that pings all services and Supabase every 10 minutes."""
@@ -40,22 +63,67 @@ async def keep_alive_task():
                     print(f"[keep-alive] Failed to ping {url}: {e}")
 
 
+async def pool_reaper_task():
+    """Background task that closes pooled connections left idle past DB_POOL_MAX_IDLE."""
+    while True:
+        await asyncio.sleep(POOL_REAP_INTERVAL)
+        try:
+            closed = await run_in_threadpool(reap_pool)
+            if closed:
+                print(f"[pool-reaper] Closed {closed} idle connections")
+        except Exception as e:
+            print(f"[pool-reaper] Reap FAILED: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Start keep-alive background task on startup."""
+    """
+    Start the keep-alive, pool-reaper, cache change-listener and warm-up
+    tasks on startup.
+    /ready reports 503 until the warm-up has opened the pool and, once the
+    listener is up (so no change can slip past it), primed the hot endpoints.
+    """
     task = asyncio.create_task(keep_alive_task())
     print("[keep-alive] Background ping task started")
+    reaper = asyncio.create_task(pool_reaper_task())
+    listener = ChangeListener(response_cache)
+    listener.start()
+    warmup.step("db pool", lambda: run_in_threadpool(prefill_pool))
+    warmup.step("change listener",
+                lambda: run_in_threadpool(listener.wait_listening, WARMUP_STEP_TIMEOUT))
+    warmup.get(app, "/feedback/leaderboard?limit=10&min_reviews=3")
+    warming = asyncio.create_task(warmup.run())
     yield
+    warming.cancel()
+    try:
+        await warming
+    except asyncio.CancelledError:
+        pass
+    listener.stop()
+    reaper.cancel()
+    try:
+        await reaper
+    except asyncio.CancelledError:
+        pass
     task.cancel()
     try:
         await task
     except asyncio.CancelledError:
         print("[keep-alive] Background task stopped")
+    close_pool()
+
 
+warmup = WarmUp("feedback-service")
 
 app = FastAPI(title="Eventra Feedback Service", version="1.0.0", lifespan=lifespan)
 
 
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolTimeout):
+    """Every pooled connection stayed busy past the timeout — ask clients to retry."""
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+
 # ──────────── Health ────────────
 
 @app.get("/health")
@@ -63,40 +131,247 @@ def health():
     return {"status": "ok", "service": "feedback-service"}
 
 
+@app.get("/health/pool")
+def health_pool():
+    """Connection pool statistics (size, idle/in-use, waits, timeouts)."""
+    return pool_stats()
+
+
+@app.get("/ready")
+def ready():
+    """503 until the startup warm-up has finished; reports how long each step took."""
+    return warmup.response()
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    """Response cache size and hit/miss counters, overall and per endpoint."""
+    return response_cache.stats()
+
+
 # ──────────── Feedback ────────────
 
-@app.get("/feedback/{event_id}", response_model=list[FeedbackOut])
-def list_feedback(event_id: int):
-    """List all feedback for an event, with student names."""
+# Fixed paths first — /feedback/{event_id} would otherwise capture them
+
+@app.get("/feedback/averages", response_model=list[AverageRatingOut])
+def get_average_ratings(event_ids: list[str] = Query(...)):
+    """
+    Averages for many events in one query, in request order. Accepts
+    ?event_ids=1&event_ids=2 or ?event_ids=1,2.
+    """
+    try:
+        ids = [int(part) for value in event_ids for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="event_ids must be integers")
+    if len(ids) > MAX_BATCH_EVENTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_EVENTS} event ids per request",
+        )
+
     with get_cursor() as cur:
         cur.execute("""
+            SELECT i.event_id,
+                   COALESCE(s.review_count, 0) AS review_count,
+                   COALESCE(s.rating_sum, 0) AS rating_sum
+            FROM unnest(%s::bigint[]) WITH ORDINALITY AS i(event_id, ord)
+            LEFT JOIN tbl_event_rating_summary s ON s.event_id = i.event_id
+            ORDER BY i.ord
+        """, (ids,))
+        return [
+            AverageRatingOut(
+                event_id=row["event_id"],
+                average_rating=_average(row),
+                total_reviews=row["review_count"],
+            )
+            for row in cur.fetchall()
+        ]
+
+
+@app.get("/feedback/leaderboard", response_model=list[LeaderboardEntryOut])
+def get_leaderboard(
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+    min_reviews: int = Query(3, ge=1),
+):
+    """
+    Top-rated events by Bayesian average: each event's ratings plus
+    LEADERBOARD_PRIOR_WEIGHT pseudo-reviews at the global mean, so a couple
+    of 5-star reviews don't outrank many consistently good ones.
+    """
+    def load():
+        with get_cursor() as cur:
+            cur.execute("""
+                WITH prior AS (
+                    SELECT COALESCE(SUM(rating_sum)::numeric / NULLIF(SUM(review_count), 0), 0) AS mean
+                    FROM tbl_event_rating_summary
+                )
+                SELECT s.event_id, e.name AS event_name,
+                       s.review_count, s.rating_sum,
+                       (%s * p.mean + s.rating_sum) / (%s + s.review_count) AS adjusted
+                FROM tbl_event_rating_summary s
+                CROSS JOIN prior p
+                LEFT JOIN tbl_events e ON e.id = s.event_id
+                WHERE s.review_count >= %s
+                ORDER BY adjusted DESC, s.review_count DESC, s.event_id
+                LIMIT %s
+            """, (LEADERBOARD_PRIOR_WEIGHT, LEADERBOARD_PRIOR_WEIGHT, min_reviews, limit))
+            return [
+                {
+                    "rank": rank,
+                    "event_id": row["event_id"],
+                    "event_name": row["event_name"],
+                    "average_rating": _average(row),
+                    "adjusted_rating": round(float(row["adjusted"]), 2),
+                    "total_reviews": row["review_count"],
+                }
+                for rank, row in enumerate(cur.fetchall(), start=1)
+            ]
+
+    return response_cache.fetch_sync(
+        f"feedback_leaderboard:{limit}:{min_reviews}", ("feedback", "events"),
+        load, list[LeaderboardEntryOut], request,
+    )
+
+
+@app.get("/feedback/search", response_model=list[FeedbackOut])
+def search_feedback(
+    q: str,
+    event_id: Optional[int] = None,
+    limit: int = Query(DEFAULT_SEARCH_RESULTS, ge=1, le=MAX_SEARCH_RESULTS),
+):
+    """Feedback whose comments match the query's words (as prefixes), best match first."""
+    terms = search_terms(q)
+    event_sql = "AND f.event_id = %s" if event_id is not None else ""
+    event_params = (event_id,) if event_id is not None else ()
+
+    with get_cursor() as cur:
+        cur.execute(f"""
+            WITH q AS (SELECT to_tsquery('english', %s) AS query)
             SELECT f.id, f.event_id, f.user_id,
                    s.name AS student_name, s.srn,
                    f.rating, f.comments, f.submitted_at
             FROM tbl_event_feedback f
+            CROSS JOIN q
             LEFT JOIN tbl_students s ON f.user_id = s.id
-            WHERE f.event_id = %s
-            ORDER BY f.submitted_at DESC
-        """, (event_id,))
+            WHERE f.comments_vector @@ q.query
+              {event_sql}
+            ORDER BY ts_rank(f.comments_vector, q.query) DESC, f.id DESC
+            LIMIT %s
+        """, (prefix_tsquery(terms),) + event_params + (limit,))
         return cur.fetchall()
 
 
+@app.get("/feedback/{event_id}", response_model=list[FeedbackOut])
+def list_feedback(
+    event_id: int,
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+):
+    """
+    List feedback for an event, newest first, with student names.
+    Paged by id: submitted_at is stamped at insert, so id order matches it.
+    """
+    after_sql, after_params = keyset_filter(after, ("f.id",), descending=True)
+    limit_sql, limit_params = limit_clause(limit)
+
+    def load():
+        with get_cursor() as cur:
+            cur.execute(f"""
+                SELECT f.id, f.event_id, f.user_id,
+                       s.name AS student_name, s.srn,
+                       f.rating, f.comments, f.submitted_at
+                FROM tbl_event_feedback f
+                LEFT JOIN tbl_students s ON f.user_id = s.id
+                WHERE f.event_id = %s
+                  AND {after_sql}
+                ORDER BY f.id DESC
+                {limit_sql}
+            """, (event_id,) + after_params + limit_params)
+            return cur.fetchall()
+
+    return response_cache.fetch_sync(
+        f"feedback:{event_id}:{limit}:{after}", (f"feedback:{event_id}", "students"),
+        load, list[FeedbackOut], request, page=(limit, ("id",)),
+    )
+
+
 @app.get("/feedback/{event_id}/average", response_model=AverageRatingOut)
-def get_average_rating(event_id: int):
-    """Compute average rating for an event."""
+def get_average_rating(event_id: int, request: Request):
+    """Average rating for an event, read from its rating summary row."""
+    def load():
+        row = _rating_summary(event_id)
+        return AverageRatingOut(
+            event_id=event_id,
+            average_rating=_average(row),
+            total_reviews=row["review_count"],
+        )
+
+    return response_cache.fetch_sync(
+        f"feedback_average:{event_id}", (f"feedback:{event_id}",),
+        load, AverageRatingOut, request,
+    )
+
+
+@app.get("/feedback/{event_id}/histogram", response_model=RatingHistogramOut)
+def get_rating_histogram(event_id: int, request: Request):
+    """Number of reviews per rating (1-5), with the average and total."""
+    def load():
+        row = _rating_summary(event_id)
+        return RatingHistogramOut(
+            event_id=event_id,
+            average_rating=_average(row),
+            total_reviews=row["review_count"],
+            counts={n: row[f"rating_{n}"] for n in range(1, 6)},
+        )
+
+    return response_cache.fetch_sync(
+        f"feedback_histogram:{event_id}", (f"feedback:{event_id}",),
+        load, RatingHistogramOut, request,
+    )
+
+
+def _rating_summary(event_id):
+    """The event's tbl_event_rating_summary row (all zeros if it has no reviews)."""
     with get_cursor() as cur:
         cur.execute("""
-            SELECT COALESCE(AVG(rating), 0) AS avg_rating,
-                   COUNT(*) AS total
-            FROM tbl_event_feedback
+            SELECT review_count, rating_sum,
+                   rating_1, rating_2, rating_3, rating_4, rating_5
+            FROM tbl_event_rating_summary
             WHERE event_id = %s
         """, (event_id,))
         row = cur.fetchone()
-        return AverageRatingOut(
-            event_id=event_id,
-            average_rating=round(float(row["avg_rating"]), 2),
-            total_reviews=int(row["total"]),
+    return row or dict.fromkeys(
+        ("review_count", "rating_sum",
+         "rating_1", "rating_2", "rating_3", "rating_4", "rating_5"), 0
+    )
+
+
+def _average(row):
+    if not row["review_count"]:
+        return 0.0
+    return round(row["rating_sum"] / row["review_count"], 2)
+
+
+@app.post("/feedback/summary/reconcile")
+def reconcile_rating_summary(event_id: Optional[int] = None):
+    """
+    Rebuild rating summaries from tbl_event_feedback (one event, or all)
+    and report how many were out of date.
+    """
+    with get_cursor(commit=True) as cur:
+        cur.execute(
+            "SELECT reconcile_rating_summary(%s) AS corrected", (event_id,)
         )
+        corrected = cur.fetchone()["corrected"]
+
+    if corrected:
+        if event_id is None:
+            response_cache.clear()
+        else:
+            response_cache.invalidate(f"feedback:{event_id}", "feedback")
+    return {"corrected": corrected}
 
 
 @app.post("/feedback", status_code=201)
@@ -154,4 +429,5 @@ def submit_feedback(req: FeedbackCreate):
                 status_code=500, detail="Failed to submit feedback"
             )
 
-        return {"message": "Feedback submitted", "feedback_id": row["id"]}
+    response_cache.invalidate(f"feedback:{req.event_id}", "feedback")
+    return {"message": "Feedback submitted", "feedback_id": row["id"]}
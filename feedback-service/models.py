@@ -25,3 +25,19 @@ class AverageRatingOut(BaseModel):
     event_id: int
     average_rating: float
     total_reviews: int
+
+
+class RatingHistogramOut(BaseModel):
+    event_id: int
+    average_rating: float
+    total_reviews: int
+    counts: dict[int, int]  # rating (1-5) -> number of reviews
+
+
+class LeaderboardEntryOut(BaseModel):
+    rank: int
+    event_id: int
+    event_name: Optional[str] = None
+    average_rating: float
+    adjusted_rating: float   # Bayesian average, shrunk toward the global mean
+    total_reviews: int
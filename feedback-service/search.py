@@ -0,0 +1,44 @@
+"""
+Query-string handling for the search endpoints.
+
+User text never reaches to_tsquery() or a LIKE pattern verbatim: it is split
+into word tokens, each matched as a prefix (so results narrow as the user
+types), and LIKE wildcards are escaped.
+"""
+
+import re
+from fastapi import HTTPException
+
+MIN_QUERY_LENGTH = 2
+DEFAULT_SEARCH_RESULTS = 10
+MAX_SEARCH_RESULTS = 50
+
+_WORD = re.compile(r"\w+")
+
+
+def search_terms(q):
+    """Word tokens of q; 400 if there is too little to search for."""
+    terms = _WORD.findall(q or "")
+    if sum(len(t) for t in terms) < MIN_QUERY_LENGTH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Search query needs at least {MIN_QUERY_LENGTH} letters or digits",
+        )
+    return terms
+
+
+def prefix_tsquery(terms):
+    """to_tsquery() input matching every term as a word prefix."""
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def like_escape(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def like_prefix(text):
+    return like_escape(text) + "%"
+
+
+def like_contains(text):
+    return "%" + like_escape(text) + "%"
@@ -4,6 +4,8 @@ import requests
 import threading
 import time
 
+from services.transport import IN_PROCESS
+
 # ---------- KEEP-ALIVE BACKGROUND TASK ----------
 KEEP_ALIVE_URLS = [
     "https://eventra-xgrj.onrender.com/health",           # user-service
@@ -28,8 +30,8 @@ def keep_alive_worker():
 
 
 def start_keep_alive():
-    """Start the keep-alive thread once per process."""
-    if "keep_alive_started" not in st.session_state:
+    """Start the keep-alive thread once per process (not needed when the services run in it)."""
+    if not IN_PROCESS and "keep_alive_started" not in st.session_state:
         st.session_state["keep_alive_started"] = True
         thread = threading.Thread(target=keep_alive_worker, daemon=True)
         thread.start()
@@ -57,7 +59,9 @@ if 'page' not in st.session_state:
 from ui.student_ui import student_login_page, student_menu
 from ui.admin_ui import admin_portal_menu
 from services.api_client import (
-    get_all_events, get_feedback, get_average_rating,
+    get_all_events, get_feedback, get_rating_histogram,
+    get_average_ratings, get_leaderboard, search_feedback, fetch_all,
+    reset_stale, stale_responses,
 )
 
 
@@ -90,19 +94,40 @@ def main_menu():
 def display_view_event_feedback():
     st.subheader("View Event Feedback")
 
-    try:
-        events = get_all_events()
-    except requests.RequestException as e:
-        st.error(f"Service error: {e}")
+    results, errors = fetch_all(events=get_all_events, leaderboard=get_leaderboard)
+    if "events" in errors:
+        st.error(f"Service error: {errors['events']}")
         return
+    events = results["events"]
+    leaderboard = results.get("leaderboard", [])
 
     if not events:
         st.info("No events available.")
         return
 
-    event_map = {e["id"]: e["name"] for e in events}
     event_ids = [e["id"] for e in events]
 
+    # One batch lookup instead of an /average call per event
+    try:
+        ratings = get_average_ratings(event_ids)
+    except requests.RequestException:
+        ratings = {}
+
+    def event_label(e):
+        r = ratings.get(e["id"])
+        if r and r["total_reviews"]:
+            return f"{e['name']} ({r['average_rating']:.1f}/5, {r['total_reviews']} reviews)"
+        return e["name"]
+
+    event_map = {e["id"]: event_label(e) for e in events}
+
+    if leaderboard:
+        st.markdown("### Top Rated Events")
+        df = pd.DataFrame(leaderboard)
+        df = df[["rank", "event_name", "average_rating", "total_reviews"]]
+        df.columns = ["Rank", "Event", "Average Rating", "Reviews"]
+        st.dataframe(df, hide_index=True, use_container_width=True)
+
     event_id = st.selectbox(
         "Select Event:",
         options=[None] + event_ids,
@@ -110,10 +135,19 @@ def display_view_event_feedback():
     )
 
     if event_id:
-        try:
-            feedback = get_feedback(event_id)
-        except requests.RequestException:
-            feedback = []
+        query = st.text_input("Search comments", placeholder="e.g. speakers")
+        if len(query.strip()) >= 2:
+            load_feedback = lambda: search_feedback(query, event_id=event_id, limit=50)
+        else:
+            load_feedback = lambda: get_feedback(event_id)
+
+        results, _ = fetch_all(
+            feedback=load_feedback,
+            summary=lambda: get_rating_histogram(event_id),
+        )
+        feedback = results.get("feedback", [])
+        summary = results.get("summary")
+        avg = summary.get("average_rating", 0.0) if summary else 0.0
 
         if feedback:
             df = pd.DataFrame(feedback)
@@ -121,18 +155,32 @@ def display_view_event_feedback():
             df.columns = ["Student Name", "SRN", "Rating", "Comment"]
             st.dataframe(df, hide_index=True, use_container_width=True)
 
-        try:
-            avg_data = get_average_rating(event_id)
-            avg = avg_data.get("average_rating", 0.0)
-        except requests.RequestException:
-            avg = 0.0
-
         st.markdown(f"### Average Rating: **{avg:.2f}/5.00**")
+        if summary and summary["total_reviews"]:
+            counts = pd.DataFrame(
+                {"Reviews": [summary["counts"][str(n)] for n in range(1, 6)]},
+                index=[f"{n} star" for n in range(1, 6)],
+            )
+            st.bar_chart(counts)
 
 
 # ---------- ROUTER ----------
+def show_stale_banner(placeholder):
+    """Warn when part of the page came from a stale copy while a service is slow or down."""
+    stale = stale_responses()
+    if stale:
+        oldest = max(stale.values())
+        age = f"{oldest / 60:.0f} min" if oldest >= 60 else f"{oldest:.0f} s"
+        placeholder.warning(
+            f"Some data shown may be out of date (up to {age} old) — "
+            "a service is slow or unavailable; it will refresh automatically."
+        )
+
+
 def run_app():
     page = st.session_state['page']
+    reset_stale()
+    stale_banner = st.empty()  # filled in after the page, once we know
 
     if page == 'main':
         main_menu()
@@ -152,6 +200,8 @@ def run_app():
             st.session_state['page'] = 'main'
             st.rerun()
 
+    show_stale_banner(stale_banner)
+
 
 # ---------- ENTRY POINT ----------
 if __name__ == "__main__":
@@ -4,8 +4,17 @@ The Streamlit frontend calls these functions instead of the database directly.
 """
 
 import os
+import json
+import threading
 import requests
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
 from dotenv import load_dotenv
+from services.transport import get_transport, IN_PROCESS, IN_PROCESS_URLS
+from services.resilience import (
+    DiskStore, backoff_delay, breaker_for, breaker_stats,
+)
 
 load_dotenv()
 
@@ -22,13 +31,59 @@ def _get_config(key, default):
         return default
 
 
-USER_SERVICE_URL = _get_config("USER_SERVICE_URL", "http://localhost:8001")
-EVENT_SERVICE_URL = _get_config("EVENT_SERVICE_URL", "http://localhost:8002")
-FEEDBACK_SERVICE_URL = _get_config("FEEDBACK_SERVICE_URL", "http://localhost:8003")
+if IN_PROCESS:
+    USER_SERVICE_URL = IN_PROCESS_URLS["user"]
+    EVENT_SERVICE_URL = IN_PROCESS_URLS["event"]
+    FEEDBACK_SERVICE_URL = IN_PROCESS_URLS["feedback"]
+else:
+    USER_SERVICE_URL = _get_config("USER_SERVICE_URL", "http://localhost:8001")
+    EVENT_SERVICE_URL = _get_config("EVENT_SERVICE_URL", "http://localhost:8002")
+    FEEDBACK_SERVICE_URL = _get_config("FEEDBACK_SERVICE_URL", "http://localhost:8003")
 
 TIMEOUT = 60        # seconds — enough for Render cold starts (~30-50s)
 MAX_RETRIES = 3     # retry on transient failures
-RETRY_DELAY = 2     # seconds between retries
+RETRY_DELAY = 2     # base backoff in seconds; doubles per attempt, with jitter
+RETRY_MAX_DELAY = 20
+
+PAGE_SIZE = 50                        # rows per page for paged list helpers
+NEXT_CURSOR_HEADER = "X-Next-Cursor"  # set by the services when more rows follow
+
+VALIDATOR_CACHE_SIZE = 512            # GET responses remembered for conditional requests
+
+# Seconds a GET response is served from memory without asking the service,
+# by cache tag family. Writes made through this module expire the affected
+# tags at once; the TTL bounds staleness from writes made elsewhere.
+DATA_CACHE_ENABLED = os.getenv("API_DATA_CACHE", "1").lower() not in ("0", "false", "no")
+CACHE_TTLS = {
+    "students": 60,
+    "hosts": 300,
+    "events": 30,
+    "venues": 60,
+    "tickets": 5,          # availability moves with every registration
+    "participants": 10,
+    "registrations": 10,
+    "resources": 30,
+    "feedback": 30,
+    "ratings": 60,
+    "dashboard": 10,
+}
+
+# Stale-while-revalidate: a cached response whose TTL has lapsed is still
+# returned at once (and flagged as stale for the page) while a background
+# request refreshes it, as long as it is under STALE_TTL_FACTOR times its
+# tag's TTL old (and at most STALE_MAX_AGE) — so a busy page skips the
+# round trip without drifting far behind. Older copies are fetched in the
+# foreground, and responses a write has invalidated are never served this
+# way. When a service can't be reached, whatever copy exists is served
+# instead of an error. API_STALE_STORE=<file> keeps a copy on disk so this
+# survives restarts.
+STALE_WHILE_REVALIDATE = os.getenv("API_STALE_WHILE_REVALIDATE", "1").lower() not in ("0", "false", "no")
+STALE_TTL_FACTOR = float(os.getenv("API_STALE_TTL_FACTOR", "3"))
+STALE_MAX_AGE = float(os.getenv("API_STALE_MAX_AGE", "300"))  # seconds
+STALE_STORE_PATH = os.getenv("API_STALE_STORE")
+REFRESH_WORKERS = 4
+
+FANOUT_WORKERS = int(os.getenv("API_FANOUT_WORKERS", "16"))  # threads for fetch_all(), shared by all sessions
 
 
 # ══════════════════════════════════════════
@@ -38,28 +93,288 @@ RETRY_DELAY = 2     # seconds between retries
 import time
 
 
-def _request(method, url, **kwargs):
-    """HTTP request with automatic retry for Render cold-start timeouts."""
+def _send(method, url, **kwargs):
+    """
+    HTTP request with retries for Render cold-start timeouts, behind the
+    service's circuit breaker: once a service keeps failing, calls fail fast
+    with CircuitOpenError instead of waiting out every timeout.
+    """
     kwargs.setdefault("timeout", TIMEOUT)
-    last_error = Exception("Request failed after retries")
+    breaker = breaker_for(url)
     for attempt in range(1, MAX_RETRIES + 1):
+        breaker.before_call()
         try:
-            resp = requests.request(method, url, **kwargs)
-            resp.raise_for_status()
-            return resp.json()
-        except (requests.ConnectionError, requests.Timeout) as e:
-            last_error = e
-            if attempt < MAX_RETRIES:
-                time.sleep(RETRY_DELAY)
-        except requests.HTTPError:
-            raise  # don't retry 4xx/5xx — those are real errors
-    raise last_error
+            resp = get_transport().send(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            breaker.record_failure()
+            if attempt == MAX_RETRIES or breaker.is_open:
+                raise
+            time.sleep(backoff_delay(attempt, RETRY_DELAY, RETRY_MAX_DELAY))
+            continue
+        except requests.HTTPError as e:
+            # don't retry 4xx/5xx — those are real errors; 5xx still counts against the service
+            if e.response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return resp
+
+
+# (url, params) -> (etag, body bytes, next cursor, fresh until, tag, stored at);
+# shared by all sessions — keys include every id the response depends on.
+# fresh until is a monotonic deadline, 0 once invalidated; stored at is wall time.
+_validators = OrderedDict()
+_validators_lock = threading.Lock()
+_generation = 0  # bumped by invalidate_cache(); a GET that raced a write isn't kept fresh
+_cache_counters = {}  # tag family -> {"hits", "revalidated", "misses", "stale"}
+_cache_invalidations = 0
+
+_LONG_AGO = 1.0  # fresh-until for copies loaded from disk: expired, but not invalidated
+_disk_store = DiskStore(STALE_STORE_PATH) if STALE_STORE_PATH else None
+_refresh_pool = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix="api-refresh")
+_refreshing = set()  # keys with a background refresh in flight
+
+_render = threading.local()  # per-thread record of stale responses served
+
+
+def _validator_key(url, params):
+    return url, tuple(sorted((params or {}).items()))
+
+
+def _count(tag, outcome):
+    family = tag.split(":", 1)[0] if tag else "(untagged)"
+    counters = _cache_counters.setdefault(
+        family, {"hits": 0, "revalidated": 0, "misses": 0, "stale": 0}
+    )
+    counters[outcome] += 1
+
+
+def _conditional_get(url, params=None, cache=None, **kwargs):
+    """
+    GET through the shared response store. Within its tag's TTL a response
+    is answered from memory; after that, or once a write has invalidated the
+    tag, it is revalidated with If-None-Match, so an unchanged resource costs
+    a bodyless 304. Lapsed copies may be served stale meanwhile (see
+    STALE_WHILE_REVALIDATE). Returns (data, cursor).
+    """
+    key = _validator_key(url, params)
+    with _validators_lock:
+        cached = _validators.get(key)
+        if cached and cached[3] > time.monotonic():
+            _validators.move_to_end(key)
+            _count(cache, "hits")
+            return json.loads(cached[1]), cached[2]
+    if cached is None and cache and _disk_store is not None:
+        cached = _load_from_disk(key)
+
+    if cached and _may_serve_stale(cached, cache):
+        _refresh_in_background(key, url, params, cache, kwargs)
+        return _serve_stale(url, cache, cached)
+
+    try:
+        return _fetch(key, url, params, cache, **kwargs)
+    except requests.RequestException as e:
+        unreachable = not isinstance(e, requests.HTTPError) or e.response.status_code >= 500
+        if cached and unreachable:
+            return _serve_stale(url, cache, cached)
+        raise
+
+
+def _ttl(cache):
+    return CACHE_TTLS.get(cache.split(":", 1)[0], 0) if cache and DATA_CACHE_ENABLED else 0
+
+
+def _fetch(key, url, params, cache, **kwargs):
+    """Revalidate or fetch key from the service and store the result."""
+    ttl = _ttl(cache)
+    with _validators_lock:
+        cached = _validators.get(key)
+        generation = _generation
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if cached and cached[0]:
+        headers["If-None-Match"] = cached[0]
+    resp = _send("GET", url, params=params, headers=headers, **kwargs)
+
+    if resp.status_code == 304 and cached:
+        etag, body, cursor = cached[:3]
+        outcome = "revalidated"
+    else:
+        etag = resp.headers.get("ETag")
+        body = resp.content
+        cursor = resp.headers.get(NEXT_CURSOR_HEADER)
+        outcome = "misses"
+        if cache and _disk_store is not None:
+            _disk_store.put(url, json.dumps(key[1]), etag, body, cursor, cache, time.time())
+
+    with _validators_lock:
+        fresh_until = time.monotonic() + ttl if ttl and generation == _generation else 0
+        if etag or fresh_until or cache:
+            _validators[key] = (etag, body, cursor, fresh_until, cache, time.time())
+            _validators.move_to_end(key)
+            while len(_validators) > VALIDATOR_CACHE_SIZE:
+                _validators.popitem(last=False)
+        else:
+            _validators.pop(key, None)
+        _count(cache, outcome)
+
+    # Parse per call so callers never share (and mutate) one cached object
+    return json.loads(body), cursor
+
+
+def _load_from_disk(key):
+    row = _disk_store.get(key[0], json.dumps(key[1]))
+    if row is None:
+        return None
+    etag, body, cursor, tag, stored_at = row
+    entry = (etag, body, cursor, _LONG_AGO, tag, stored_at)
+    with _validators_lock:
+        return _validators.setdefault(key, entry)
+
+
+def _may_serve_stale(entry, cache):
+    return (
+        STALE_WHILE_REVALIDATE
+        and entry[3] != 0  # never once a write has invalidated it
+        and time.time() - entry[5] < min(_ttl(cache) * STALE_TTL_FACTOR, STALE_MAX_AGE)
+    )
+
+
+def _serve_stale(url, cache, entry):
+    with _validators_lock:
+        _count(cache, "stale")
+    stale = getattr(_render, "stale", None)
+    if stale is None:
+        stale = _render.stale = {}
+    stale[url] = max(stale.get(url, 0), time.time() - entry[5])
+    return json.loads(entry[1]), entry[2]
+
+
+def _refresh_in_background(key, url, params, cache, kwargs):
+    with _validators_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            _fetch(key, url, params, cache, **kwargs)
+        except requests.RequestException as e:
+            print(f"[api-client] Background refresh of {url} failed: {e}")
+        finally:
+            with _validators_lock:
+                _refreshing.discard(key)
+
+    _refresh_pool.submit(refresh)
+
+
+def reset_stale():
+    """Start recording stale responses afresh for this thread (call once per page render)."""
+    _render.stale = {}
+
+
+def stale_responses():
+    """URLs this thread was served stale copies of since reset_stale(), with their age in seconds."""
+    return dict(getattr(_render, "stale", None) or {})
+
+
+def _merge_stale(stale):
+    if stale:
+        mine = getattr(_render, "stale", None)
+        if mine is None:
+            mine = _render.stale = {}
+        for url, age in stale.items():
+            mine[url] = max(mine.get(url, 0), age)
+
+
+def invalidate_cache(*tags):
+    """
+    Expire cached responses for tags (all of them when no tags are given);
+    a tag also covers its sub-tags ("tickets" expires "tickets:12"). Entries
+    keep their ETag, so the next read is a cheap conditional request.
+    """
+    global _generation, _cache_invalidations
+    with _validators_lock:
+        _generation += 1
+        _cache_invalidations += 1
+        expired = [
+            key for key, entry in _validators.items()
+            if not tags or entry[4] and any(
+                entry[4] == t or entry[4].startswith(t + ":") for t in tags
+            )
+        ]
+        for key in expired:
+            _validators[key] = _validators[key][:3] + (0,) + _validators[key][4:]
+
+
+def cache_stats():
+    """Counters for the response store, overall and per tag family."""
+    with _validators_lock:
+        now = time.monotonic()
+        totals = {"hits": 0, "revalidated": 0, "misses": 0, "stale": 0}
+        for counters in _cache_counters.values():
+            for outcome, n in counters.items():
+                totals[outcome] += n
+        lookups = sum(totals.values())
+        return {
+            "enabled": DATA_CACHE_ENABLED,
+            "entries": len(_validators),
+            "fresh_entries": sum(1 for entry in _validators.values() if entry[3] > now),
+            "max_entries": VALIDATOR_CACHE_SIZE,
+            **totals,
+            "invalidations": _cache_invalidations,
+            "hit_ratio": round(totals["hits"] / lookups, 3) if lookups else None,
+            "by_tag": {family: dict(c) for family, c in _cache_counters.items()},
+            "stale_store": STALE_STORE_PATH,
+        }
+
+
+def circuit_stats():
+    """Circuit breaker state per service host."""
+    return breaker_stats()
+
+
+def _request(method, url, invalidates=(), **kwargs):
+    if method == "GET":
+        return _conditional_get(url, **kwargs)[0]
+    try:
+        return _send(method, url, **kwargs).json()
+    finally:
+        # Even a failed write (e.g. sold out) means what we showed was stale;
+        # dashboards aggregate nearly everything, so any write expires them
+        invalidate_cache(*invalidates, "dashboard")
+
+
+def connection_stats():
+    """Requests vs. connections opened per service, for the shared transport."""
+    return get_transport().stats()
 
 
 def _get(url, **kwargs):
     return _request("GET", url, **kwargs)
 
 
+def _get_page(url, limit=PAGE_SIZE, after=None, params=None, **kwargs):
+    """One keyset page: (rows, cursor for the next page or None)."""
+    params = {**(params or {}), "limit": limit}
+    if after:
+        params["after"] = after
+    return _conditional_get(url, params=params, **kwargs)
+
+
+def _iter_ndjson(url, **kwargs):
+    """Yield rows from a streaming NDJSON endpoint as they arrive."""
+    kwargs.setdefault("timeout", TIMEOUT)
+    for line in get_transport().iter_lines(url, **kwargs):
+        if line:
+            yield json.loads(line)
+
+
 def _post(url, json=None, **kwargs):
     return _request("POST", url, json=json, **kwargs)
 
@@ -72,26 +387,84 @@ def _delete(url, **kwargs):
     return _request("DELETE", url, **kwargs)
 
 
+_fanout_pool = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix="api-fanout")
+
+
+def fetch_all(**calls):
+    """
+    Run independent API calls concurrently, so a page waits for the slowest
+    call rather than the sum of them. Each keyword maps to a zero-argument
+    callable:
+
+        results, errors = fetch_all(hosts=get_hosts, venues=get_available_venues)
+
+    Returns ({name: result}, {name: exception}); one failing call doesn't
+    stop the others. The callables must not call fetch_all() themselves.
+    """
+    if not calls:
+        return {}, {}
+    *pooled, (last_name, last_call) = calls.items()
+    futures = {name: _fanout_pool.submit(_tracking_stale, call) for name, call in pooled}
+
+    results, errors = {}, {}
+    try:
+        results[last_name] = last_call()  # the calling thread does one share of the work
+    except Exception as e:
+        errors[last_name] = e
+    for name, future in futures.items():
+        try:
+            results[name], stale = future.result()
+            _merge_stale(stale)  # so the page's stale banner covers pooled calls too
+        except Exception as e:
+            errors[name] = e
+    return results, errors
+
+
+def _tracking_stale(call):
+    reset_stale()
+    return call(), stale_responses()
+
+
 # ══════════════════════════════════════════
 #  USER SERVICE
 # ══════════════════════════════════════════
 
 def get_students():
-    return _get(f"{USER_SERVICE_URL}/students")
+    return _get(f"{USER_SERVICE_URL}/students", cache="students")
+
+
+def get_students_page(limit=PAGE_SIZE, after=None):
+    return _get_page(f"{USER_SERVICE_URL}/students", limit, after, cache="students")
+
+
+def get_student_by_srn(srn):
+    return _get(f"{USER_SERVICE_URL}/students/by-srn/{quote(srn.strip(), safe='')}")
+
+
+def search_students(query, limit=10):
+    return _get(f"{USER_SERVICE_URL}/students/search",
+                params={"q": query, "limit": limit})
 
 
 def get_student(student_id):
-    return _get(f"{USER_SERVICE_URL}/students/{student_id}")
+    return _get(f"{USER_SERVICE_URL}/students/{student_id}", cache=f"students:{student_id}")
 
 
 def create_student(srn, name, semester, section):
     return _post(f"{USER_SERVICE_URL}/students", json={
         "srn": srn, "name": name, "semester": semester, "section": section,
-    })
+    }, invalidates=("students",))
+
+
+def import_students(data, filename):
+    """Upload a .csv or .ndjson/.jsonl file of students in one request."""
+    content_type = "text/csv" if filename.lower().endswith(".csv") else "application/x-ndjson"
+    return _post(f"{USER_SERVICE_URL}/students/bulk", data=data,
+                 headers={"Content-Type": content_type}, invalidates=("students",))
 
 
 def get_hosts():
-    return _get(f"{USER_SERVICE_URL}/hosts")
+    return _get(f"{USER_SERVICE_URL}/hosts", cache="hosts")
 
 
 # ══════════════════════════════════════════
@@ -99,19 +472,36 @@ def get_hosts():
 # ══════════════════════════════════════════
 
 def get_scheduled_events():
-    return _get(f"{EVENT_SERVICE_URL}/events")
+    return _get(f"{EVENT_SERVICE_URL}/events", cache="events")
 
 
 def get_completed_events():
-    return _get(f"{EVENT_SERVICE_URL}/events/completed")
+    return _get(f"{EVENT_SERVICE_URL}/events/completed", cache="events")
+
+
+def get_completed_events_page(limit=PAGE_SIZE, after=None):
+    return _get_page(f"{EVENT_SERVICE_URL}/events/completed", limit, after, cache="events")
+
+
+def iter_completed_events():
+    return _iter_ndjson(f"{EVENT_SERVICE_URL}/events/completed/stream")
 
 
 def get_all_events():
-    return _get(f"{EVENT_SERVICE_URL}/events/all")
+    return _get(f"{EVENT_SERVICE_URL}/events/all", cache="events")
+
+
+def get_all_events_page(limit=PAGE_SIZE, after=None):
+    return _get_page(f"{EVENT_SERVICE_URL}/events/all", limit, after, cache="events")
+
+
+def search_events(query, limit=10, upcoming=False):
+    return _get(f"{EVENT_SERVICE_URL}/events/search",
+                params={"q": query, "limit": limit, "upcoming": upcoming})
 
 
 def get_event(event_id):
-    return _get(f"{EVENT_SERVICE_URL}/events/{event_id}")
+    return _get(f"{EVENT_SERVICE_URL}/events/{event_id}", cache=f"events:{event_id}")
 
 
 def create_event(name, description, date, start_time, end_time,
@@ -125,7 +515,7 @@ def create_event(name, description, date, start_time, end_time,
         "location_id": location_id,
         "organizer_id": organizer_id,
         "max_participants": max_participants,
-    })
+    }, invalidates=("events",))
 
 
 def update_event(event_id, **fields):
@@ -134,7 +524,8 @@ def update_event(event_id, **fields):
     for k, v in fields.items():
         if v is not None:
             payload[k] = str(v) if hasattr(v, 'isoformat') else v
-    return _put(f"{EVENT_SERVICE_URL}/events/{event_id}", json=payload)
+    return _put(f"{EVENT_SERVICE_URL}/events/{event_id}", json=payload,
+                invalidates=("events",))
 
 
 # ══════════════════════════════════════════
@@ -142,17 +533,17 @@ def update_event(event_id, **fields):
 # ══════════════════════════════════════════
 
 def get_venues():
-    return _get(f"{EVENT_SERVICE_URL}/venues")
+    return _get(f"{EVENT_SERVICE_URL}/venues", cache="venues")
 
 
 def get_available_venues():
-    return _get(f"{EVENT_SERVICE_URL}/venues/available")
+    return _get(f"{EVENT_SERVICE_URL}/venues/available", cache="venues")
 
 
 def update_venue(venue_id, is_available):
     return _put(f"{EVENT_SERVICE_URL}/venues/{venue_id}", json={
         "is_available": is_available,
-    })
+    }, invalidates=("venues", "events"))
 
 
 # ══════════════════════════════════════════
@@ -160,27 +551,58 @@ def update_venue(venue_id, is_available):
 # ══════════════════════════════════════════
 
 def get_tickets(event_id):
-    return _get(f"{EVENT_SERVICE_URL}/events/{event_id}/tickets")
+    return _get(f"{EVENT_SERVICE_URL}/events/{event_id}/tickets", cache=f"tickets:{event_id}")
 
 
-def create_ticket(event_id, ticket_type, price, quantity):
+def create_ticket(event_id, ticket_type, price, quantity, shards=1):
     return _post(f"{EVENT_SERVICE_URL}/events/{event_id}/tickets", json={
         "ticket_type": ticket_type, "price": price, "quantity": quantity,
-    })
+        "shards": shards,
+    }, invalidates=(f"tickets:{event_id}",))
+
+
+def shard_ticket(ticket_id, shards):
+    return _put(f"{EVENT_SERVICE_URL}/tickets/{ticket_id}/shards", json={
+        "shards": shards,
+    }, invalidates=("tickets",))
 
 
 # ══════════════════════════════════════════
 #  EVENT SERVICE — Registration
 # ══════════════════════════════════════════
 
+def _registration_tags(event_id, user_id):
+    return (f"tickets:{event_id}", f"participants:{event_id}", "participants:all",
+            f"registrations:{user_id}")
+
+
 def register_for_event(event_id, user_id, ticket_id):
     return _post(f"{EVENT_SERVICE_URL}/events/{event_id}/register", json={
         "user_id": user_id, "ticket_id": ticket_id,
-    })
+    }, invalidates=_registration_tags(event_id, user_id))
 
 
 def cancel_registration(event_id, user_id):
-    return _delete(f"{EVENT_SERVICE_URL}/events/{event_id}/register/{user_id}")
+    return _delete(f"{EVENT_SERVICE_URL}/events/{event_id}/register/{user_id}",
+                   invalidates=_registration_tags(event_id, user_id))
+
+
+def hold_ticket(event_id, user_id, ticket_id):
+    return _post(f"{EVENT_SERVICE_URL}/events/{event_id}/holds", json={
+        "user_id": user_id, "ticket_id": ticket_id,
+    }, invalidates=(f"tickets:{event_id}",))
+
+
+def confirm_hold(hold_id, user_id):
+    return _post(f"{EVENT_SERVICE_URL}/holds/{hold_id}/confirm", json={
+        "user_id": user_id,
+    }, invalidates=("tickets", "participants", f"registrations:{user_id}"))
+
+
+def release_hold(hold_id, user_id):
+    return _post(f"{EVENT_SERVICE_URL}/holds/{hold_id}/release", json={
+        "user_id": user_id,
+    }, invalidates=("tickets",))
 
 
 # ══════════════════════════════════════════
@@ -188,19 +610,54 @@ def cancel_registration(event_id, user_id):
 # ══════════════════════════════════════════
 
 def get_participants(event_id):
-    return _get(f"{EVENT_SERVICE_URL}/events/{event_id}/participants")
+    return _get(f"{EVENT_SERVICE_URL}/events/{event_id}/participants",
+                cache=f"participants:{event_id}")
 
 
 def get_all_participants():
-    return _get(f"{EVENT_SERVICE_URL}/participants/all")
+    return _get(f"{EVENT_SERVICE_URL}/participants/all", cache="participants:all")
+
+
+def get_all_participants_page(limit=PAGE_SIZE, after=None):
+    return _get_page(f"{EVENT_SERVICE_URL}/participants/all", limit, after,
+                     cache="participants:all")
+
+
+def iter_all_participants():
+    return _iter_ndjson(f"{EVENT_SERVICE_URL}/participants/all/stream")
 
 
 def mark_attendance(event_id, user_id):
-    return _put(f"{EVENT_SERVICE_URL}/events/{event_id}/attendance/{user_id}")
+    return _put(f"{EVENT_SERVICE_URL}/events/{event_id}/attendance/{user_id}",
+                invalidates=(f"participants:{event_id}", "participants:all",
+                             f"registrations:{user_id}"))
+
+
+def mark_attendance_bulk(event_id, user_ids=(), srns=()):
+    return _put(f"{EVENT_SERVICE_URL}/events/{event_id}/attendance", json={
+        "user_ids": list(user_ids),
+        "srns": list(srns),
+    }, invalidates=(f"participants:{event_id}", "participants:all", "registrations"))
 
 
 def get_user_registrations(user_id):
-    return _get(f"{EVENT_SERVICE_URL}/registrations/{user_id}")
+    return _get(f"{EVENT_SERVICE_URL}/registrations/{user_id}",
+                cache=f"registrations:{user_id}")
+
+
+# ══════════════════════════════════════════
+#  EVENT SERVICE — Dashboards
+# ══════════════════════════════════════════
+
+def get_admin_dashboard():
+    """Upcoming events (with counts), venues, hosts, resources and totals in one call."""
+    return _get(f"{EVENT_SERVICE_URL}/dashboard/admin", cache="dashboard:admin")
+
+
+def get_student_dashboard(user_id):
+    """Student profile, registrations, upcoming and completed events in one call."""
+    return _get(f"{EVENT_SERVICE_URL}/dashboard/student/{user_id}",
+                cache=f"dashboard:student:{user_id}")
 
 
 # ══════════════════════════════════════════
@@ -208,7 +665,11 @@ def get_user_registrations(user_id):
 # ══════════════════════════════════════════
 
 def get_resources():
-    return _get(f"{EVENT_SERVICE_URL}/resources")
+    return _get(f"{EVENT_SERVICE_URL}/resources", cache="resources")
+
+
+def get_resources_page(limit=PAGE_SIZE, after=None):
+    return _get_page(f"{EVENT_SERVICE_URL}/resources", limit, after, cache="resources")
 
 
 def assign_resource(event_id, resource_id, quantity_booked,
@@ -218,11 +679,11 @@ def assign_resource(event_id, resource_id, quantity_booked,
         "quantity_booked": quantity_booked,
         "booking_start": str(booking_start),
         "booking_end": str(booking_end),
-    })
+    }, invalidates=("resources",))
 
 
 def replenish_resources():
-    return _post(f"{EVENT_SERVICE_URL}/resources/replenish")
+    return _post(f"{EVENT_SERVICE_URL}/resources/replenish", invalidates=("resources",))
 
 
 def schedule_maintenance(resource_id, maintenance_start,
@@ -231,7 +692,7 @@ def schedule_maintenance(resource_id, maintenance_start,
         "maintenance_start": str(maintenance_start),
         "maintenance_end": str(maintenance_end),
         "description": description,
-    })
+    }, invalidates=("resources",))
 
 
 # ══════════════════════════════════════════
@@ -239,11 +700,45 @@ def schedule_maintenance(resource_id, maintenance_start,
 # ══════════════════════════════════════════
 
 def get_feedback(event_id):
-    return _get(f"{FEEDBACK_SERVICE_URL}/feedback/{event_id}")
+    return _get(f"{FEEDBACK_SERVICE_URL}/feedback/{event_id}", cache=f"feedback:{event_id}")
+
+
+def get_feedback_page(event_id, limit=PAGE_SIZE, after=None):
+    return _get_page(f"{FEEDBACK_SERVICE_URL}/feedback/{event_id}", limit, after,
+                     cache=f"feedback:{event_id}")
+
+
+def search_feedback(query, event_id=None, limit=10):
+    params = {"q": query, "limit": limit}
+    if event_id is not None:
+        params["event_id"] = event_id
+    return _get(f"{FEEDBACK_SERVICE_URL}/feedback/search", params=params)
 
 
 def get_average_rating(event_id):
-    return _get(f"{FEEDBACK_SERVICE_URL}/feedback/{event_id}/average")
+    return _get(f"{FEEDBACK_SERVICE_URL}/feedback/{event_id}/average",
+                cache=f"ratings:{event_id}")
+
+
+def get_rating_histogram(event_id):
+    return _get(f"{FEEDBACK_SERVICE_URL}/feedback/{event_id}/histogram",
+                cache=f"ratings:{event_id}")
+
+
+def get_average_ratings(event_ids):
+    """Averages for many events in one request, keyed by event id."""
+    if not event_ids:
+        return {}
+    rows = _get(f"{FEEDBACK_SERVICE_URL}/feedback/averages",
+                params={"event_ids": ",".join(str(i) for i in event_ids)},
+                cache="ratings:all")
+    return {row["event_id"]: row for row in rows}
+
+
+def get_leaderboard(limit=10, min_reviews=3):
+    return _get(f"{FEEDBACK_SERVICE_URL}/feedback/leaderboard",
+                params={"limit": limit, "min_reviews": min_reviews},
+                cache="ratings:all")
 
 
 def submit_feedback(event_id, user_id, rating, comments):
@@ -252,4 +747,17 @@ def submit_feedback(event_id, user_id, rating, comments):
         "user_id": user_id,
         "rating": rating,
         "comments": comments,
-    })
+    }, invalidates=(f"feedback:{event_id}", f"ratings:{event_id}", "ratings:all"))
+
+
+# ══════════════════════════════════════════
+#  CACHE STATS
+# ══════════════════════════════════════════
+
+def get_service_cache_stats():
+    """Each service's response-cache counters: ({service: stats}, {service: error})."""
+    return fetch_all(
+        user=lambda: _get(f"{USER_SERVICE_URL}/cache/stats"),
+        event=lambda: _get(f"{EVENT_SERVICE_URL}/cache/stats"),
+        feedback=lambda: _get(f"{FEEDBACK_SERVICE_URL}/cache/stats"),
+    )
@@ -0,0 +1,153 @@
+"""
+Failure handling for api_client: retry backoff, per-service circuit
+breakers, and an optional on-disk copy of the last good GET responses.
+
+A service that keeps failing (connection errors, timeouts, 5xx) trips its
+breaker: calls fail fast with CircuitOpenError for a cool-down period,
+then a single probe is let through to see whether it has recovered.
+CircuitOpenError is a requests.ConnectionError, so existing handlers
+treat it like any other unreachable service.
+"""
+
+import os
+import random
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("API_BREAKER_FAILURES", "5"))  # consecutive failures to trip
+BREAKER_COOLDOWN = float(os.getenv("API_BREAKER_COOLDOWN", "30"))         # seconds before a probe
+
+
+def backoff_delay(attempt, base, cap):
+    """Exponential backoff with full jitter for retry number attempt (1-based)."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class CircuitOpenError(requests.ConnectionError):
+    pass
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD,
+                 cooldown=BREAKER_COOLDOWN):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._rejected = 0
+        self._trips = 0
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go ahead now."""
+        with self._lock:
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    self._rejected += 1
+                    raise CircuitOpenError(f"{self.name} is unavailable (circuit open)")
+                self._state = self.HALF_OPEN
+            if self._state == self.HALF_OPEN:
+                if self._probing:
+                    self._rejected += 1
+                    raise CircuitOpenError(f"{self.name} is unavailable (recovery probe in flight)")
+                self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._trips += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    @property
+    def is_open(self):
+        with self._lock:
+            return self._state == self.OPEN
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "trips": self._trips,
+                "rejected": self._rejected,
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker_for(url):
+    host = urlsplit(url).netloc
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(host)
+        return breaker
+
+
+def breaker_stats():
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.stats() for b in breakers}
+
+
+class DiskStore:
+    """
+    Last good GET responses in a local SQLite file, so a restarted frontend
+    can show something while cold services wake up. Only written when the
+    body changes, not on every 304.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    etag TEXT,
+                    body BLOB NOT NULL,
+                    cursor TEXT,
+                    tag TEXT,
+                    stored_at REAL NOT NULL,
+                    PRIMARY KEY (url, params)
+                )
+            """)
+
+    def get(self, url, params):
+        """(etag, body, cursor, tag, stored_at) or None."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT etag, body, cursor, tag, stored_at FROM responses "
+                "WHERE url = ? AND params = ?", (url, params),
+            ).fetchone()
+
+    def put(self, url, params, etag, body, cursor, tag, stored_at):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, params, etag, body, cursor, tag, stored_at),
+            )
@@ -0,0 +1,237 @@
+"""
+Shared HTTP transport for api_client.
+
+One pooled client per process, shared by every Streamlit session, so calls
+reuse keep-alive connections instead of paying a TCP (and, on Render, TLS)
+handshake each. Both backends are safe to share between threads; the
+requests one never stores cookies, so nothing leaks between users.
+
+API_HTTP2=1 switches to httpx with HTTP/2 (needs `httpx[http2]`), which
+multiplexes a page's calls over one connection per service. Errors are
+raised as requests exceptions whichever backend is in use.
+
+EVENTRA_IN_PROCESS=1 runs the services inside this process instead
+(all-in-one/main.py) and calls them through an ASGI test client, with no
+sockets at all; the service URLs then point at its mounts.
+"""
+
+import atexit
+import importlib.util
+import os
+import threading
+from collections import defaultdict
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+POOL_HOSTS = int(os.getenv("API_POOL_HOSTS", "4"))      # services kept in the pool
+POOL_MAXSIZE = int(os.getenv("API_POOL_MAXSIZE", "16"))  # idle connections kept per service
+HTTP2 = os.getenv("API_HTTP2", "").lower() in ("1", "true", "yes")
+IN_PROCESS = os.getenv("EVENTRA_IN_PROCESS", "").lower() in ("1", "true", "yes")
+ALL_IN_ONE_APP = os.getenv(
+    "EVENTRA_ALL_IN_ONE_APP",
+    os.path.join(os.path.dirname(__file__), "..", "..", "all-in-one", "main.py"),
+)
+
+# Base URLs of the all-in-one mounts; the host names only keep per-service
+# stats and circuit breakers apart, nothing is resolved
+IN_PROCESS_URLS = {
+    "user": "http://user-service/user",
+    "event": "http://event-service/event",
+    "feedback": "http://feedback-service/feedback",
+}
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = defaultdict(int)
+        self._connections = defaultdict(int)
+
+    def request(self, url):
+        with self._lock:
+            self._requests[urlsplit(url).netloc] += 1
+
+    def connection(self, host):
+        with self._lock:
+            self._connections[host] += 1
+
+    def snapshot(self, connections=None):
+        with self._lock:
+            opened = connections if connections is not None else dict(self._connections)
+            hosts = {}
+            for host, count in self._requests.items():
+                new = opened.get(host, 0)
+                hosts[host] = {
+                    "requests": count,
+                    "connections_opened": new,
+                    "reuse_ratio": round(1 - new / count, 3) if count else None,
+                }
+            return hosts
+
+
+class RequestsTransport:
+    name = "requests"
+
+    def __init__(self):
+        self._session = requests.Session()
+        self._session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_MAXSIZE)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._adapter = adapter
+        self._stats = _Stats()
+
+    def send(self, method, url, **kwargs):
+        self._stats.request(url)
+        resp = self._session.request(method, url, **kwargs)
+        resp.raise_for_status()
+        return resp
+
+    def iter_lines(self, url, **kwargs):
+        self._stats.request(url)
+        with self._session.get(url, stream=True, **kwargs) as resp:
+            resp.raise_for_status()
+            yield from resp.iter_lines()
+
+    def stats(self):
+        # urllib3 counts the connections each host pool has opened
+        pools = self._adapter.poolmanager.pools
+        connections = {}
+        for key in pools.keys():
+            pool = pools.get(key)  # None if evicted meanwhile
+            if pool is not None:
+                host = pool.host if pool.port in (None, 80, 443) else f"{pool.host}:{pool.port}"
+                connections[host] = connections.get(host, 0) + pool.num_connections
+        return {"backend": self.name, "hosts": self._stats.snapshot(connections)}
+
+
+class HttpxTransport:
+    name = "httpx-http2"
+
+    def __init__(self):
+        import httpx
+        self._httpx = httpx
+        self._client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=POOL_MAXSIZE * POOL_HOSTS),
+        )
+        self._stats = _Stats()
+
+    def _options(self, url, kwargs):
+        data = kwargs.pop("data", None)
+        if data is not None:
+            kwargs["content"] = data
+        host = urlsplit(url).netloc
+
+        def trace(event, info):
+            if event == "connection.connect_tcp.started":
+                self._stats.connection(host)
+
+        kwargs["extensions"] = {"trace": trace}
+        return kwargs
+
+    def send(self, method, url, **kwargs):
+        self._stats.request(url)
+        with self._translate_errors():
+            resp = self._client.request(method, url, **self._options(url, kwargs))
+        _raise_for_status(resp)
+        return resp
+
+    def iter_lines(self, url, **kwargs):
+        self._stats.request(url)
+        with self._translate_errors():
+            with self._client.stream("GET", url, **self._options(url, kwargs)) as resp:
+                if resp.status_code >= 400:
+                    resp.read()
+                _raise_for_status(resp)
+                yield from resp.iter_lines()
+
+    def _translate_errors(self):
+        return _HttpxErrors(self._httpx)
+
+    def stats(self):
+        return {"backend": self.name, "hosts": self._stats.snapshot()}
+
+
+class InProcessTransport(HttpxTransport):
+    """
+    Calls the all-in-one app in this process through Starlette's TestClient
+    (an httpx client over ASGI). The app's lifespan — pools, change
+    listeners, background tasks — runs from the first call until exit.
+    """
+
+    name = "in-process"
+
+    def __init__(self, app):
+        import httpx
+        from starlette.testclient import TestClient
+        self._httpx = httpx
+        self._client = TestClient(app, raise_server_exceptions=False)
+        self._client.__enter__()
+        atexit.register(self._client.__exit__, None, None, None)
+        self._stats = _Stats()
+
+    def _options(self, url, kwargs):
+        kwargs.pop("timeout", None)  # no network to wait on; TestClient rejects it
+        return super()._options(url, kwargs)
+
+
+class _HttpxErrors:
+    """Re-raise httpx failures as the requests exceptions callers handle."""
+
+    def __init__(self, httpx):
+        self._httpx = httpx
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is None:
+            return False
+        if isinstance(exc, self._httpx.TimeoutException):
+            raise requests.Timeout(str(exc)) from exc
+        if isinstance(exc, self._httpx.TransportError):
+            raise requests.ConnectionError(str(exc)) from exc
+        return False
+
+
+def _raise_for_status(resp):
+    if resp.status_code >= 400:
+        raise requests.HTTPError(
+            f"{resp.status_code} Error for url: {resp.url}", response=resp
+        )
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = _create_transport()
+    return _transport
+
+
+def _create_transport():
+    if IN_PROCESS:
+        return InProcessTransport(_load_all_in_one())
+    if HTTP2:
+        try:
+            import h2  # noqa: F401 — httpx needs it for http2=True
+            return HttpxTransport()
+        except ImportError:
+            print("[api-client] API_HTTP2 set but httpx[http2] is not installed; using requests")
+    return RequestsTransport()
+
+
+def _load_all_in_one():
+    spec = importlib.util.spec_from_file_location("eventra_all_in_one", ALL_IN_ONE_APP)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.app
@@ -3,14 +3,19 @@ import pandas as pd
 import requests
 
 from services.api_client import (
-    get_scheduled_events, get_completed_events, get_all_events,
-    get_available_venues, get_venues, get_tickets, get_resources,
-    get_hosts, get_participants, get_all_participants,
-    create_event, update_event, create_ticket, create_student,
-    mark_attendance, update_venue,
+    get_admin_dashboard, get_all_events, search_events,
+    get_tickets, get_participants,
+    get_students_page, get_all_participants_page, iter_all_participants,
+    create_event, update_event, create_ticket, shard_ticket,
+    create_student, import_students,
+    mark_attendance, mark_attendance_bulk, update_venue,
     assign_resource, replenish_resources, schedule_maintenance,
+    cache_stats, connection_stats, circuit_stats,
+    get_service_cache_stats, invalidate_cache,
 )
 import datetime
+import csv
+import io
 
 
 # ---------- ADMIN MENU ----------
@@ -30,6 +35,7 @@ def admin_portal_menu():
     choice = st.sidebar.radio(
         "Admin Tasks",
         (
+            'Dashboard',
             'Add New Event',
             'Update Event Details',
             'Manage Event Tickets',
@@ -38,11 +44,14 @@ def admin_portal_menu():
             'Add New Student',
             'View Students/Hosts',
             'Manage Venues',
-            'Manage Resources'
+            'Manage Resources',
+            'Cache Stats'
         )
     )
 
-    if choice == 'Add New Event':
+    if choice == 'Dashboard':
+        display_dashboard()
+    elif choice == 'Add New Event':
         display_add_new_event()
     elif choice == 'Update Event Details':
         display_update_event_details()
@@ -60,10 +69,93 @@ def admin_portal_menu():
         display_manage_venues()
     elif choice == 'Manage Resources':
         display_manage_resources()
+    elif choice == 'Cache Stats':
+        display_cache_stats()
+
+
+# ---------- PAGED TABLES ----------
+
+def _load_next_page(state, fetch_page):
+    rows, cursor = fetch_page(after=state["cursor"])
+    state["rows"].extend(rows)
+    state["cursor"] = cursor
+    state["done"] = cursor is None
+
+
+def display_paged_table(key, fetch_page, columns, labels, empty_message):
+    """
+    Render a table that loads one keyset page at a time. Loaded rows live in
+    session state, so reruns don't refetch; "Load more" pulls the next page.
+    """
+    state = st.session_state.get(key)
+    try:
+        if state is None:
+            state = {"rows": [], "cursor": None, "done": False}
+            _load_next_page(state, fetch_page)
+            st.session_state[key] = state
+    except requests.RequestException as e:
+        st.error(f"Service error: {e}")
+        return
+
+    if not state["rows"]:
+        st.info(empty_message)
+        return
+
+    df = pd.DataFrame(state["rows"])
+    df = df[columns]
+    df.columns = labels
+    st.dataframe(df, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    if not state["done"] and col1.button("Load more", key=f"{key}_more"):
+        try:
+            _load_next_page(state, fetch_page)
+        except requests.RequestException as e:
+            st.error(f"Service error: {e}")
+            return
+        st.rerun()
+    if col2.button("Refresh", key=f"{key}_refresh"):
+        del st.session_state[key]
+        st.rerun()
 
 
 # ---------- ADMIN FUNCTIONS ----------
 
+def _load_dashboard():
+    """The admin dashboard aggregate most pages draw from (one cached call)."""
+    try:
+        return get_admin_dashboard()
+    except requests.RequestException as e:
+        st.error(f"Service error: {e}")
+        return None
+
+
+def display_dashboard():
+    dash = _load_dashboard()
+    if dash is None:
+        return
+
+    summary = dash["summary"]
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Upcoming Events", summary["upcoming_events"])
+    col2.metric("Completed Events", summary["completed_events"])
+    col3.metric("Students", summary["students"])
+    col4.metric("Upcoming Registrations", summary["upcoming_registrations"])
+    col5.metric("Available Venues", summary["available_venues"])
+
+    st.markdown("### Upcoming Events")
+    if not dash["upcoming_events"]:
+        st.info("No upcoming events.")
+        return
+
+    df = pd.DataFrame(dash["upcoming_events"])
+    df = df[["id", "name", "date", "start_time", "venue_name", "host_name",
+             "registered", "attended", "max_participants", "tickets_remaining"]]
+    df.columns = ["ID", "Name", "Date", "Start", "Venue", "Host",
+                  "Registered", "Attended", "Capacity", "Tickets Left"]
+    st.dataframe(df, hide_index=True, use_container_width=True)
+
+
 def display_add_new_student():
     st.subheader("Add New Student")
 
@@ -79,16 +171,35 @@ def display_add_new_student():
             except requests.HTTPError as e:
                 st.error(f"Failed: {e.response.text}")
 
+    st.markdown("---")
+    st.markdown("### Bulk Import")
+    st.caption("CSV with header srn,name,semester,section, or NDJSON with one student per line. "
+               "Students whose SRN already exists are skipped.")
+    upload = st.file_uploader("Student file", type=["csv", "ndjson", "jsonl"])
+    if upload and st.button("Import Students"):
+        try:
+            report = import_students(upload.getvalue(), upload.name)
+        except requests.HTTPError as e:
+            st.error(f"Import failed: {e.response.text}")
+            return
+
+        st.success(f"Imported {report['inserted']} of {report['received']} rows "
+                   f"({report['duplicates']} duplicates, {report['invalid']} invalid).")
+        if report["errors"]:
+            df = pd.DataFrame(report["errors"])
+            df.columns = ["Line", "Error"]
+            st.dataframe(df, hide_index=True)
+
 
 def display_add_new_event():
     st.subheader("Add New Event")
 
-    try:
-        hosts = get_hosts()
-        venues = get_available_venues()
-    except requests.RequestException as e:
-        st.error(f"Service error: {e}")
+    dash = _load_dashboard()
+    if dash is None:
         return
+    hosts = dash["hosts"]
+    venues = sorted((v for v in dash["venues"] if v["is_available"]),
+                    key=lambda v: v["capacity"] or 0, reverse=True)
 
     if not hosts or not venues:
         st.warning("Hosts or venues missing.")
@@ -125,14 +236,22 @@ def display_add_new_event():
 def display_update_event_details():
     st.subheader("Update Event")
 
-    try:
-        events = get_scheduled_events()
-    except requests.RequestException as e:
-        st.error(f"Service error: {e}")
-        return
+    query = st.text_input("Search events", placeholder="Name or description")
+
+    if len(query.strip()) >= 2:
+        try:
+            events = search_events(query, limit=20, upcoming=True)
+        except requests.RequestException as e:
+            st.error(f"Service error: {e}")
+            return
+    else:
+        dash = _load_dashboard()
+        if dash is None:
+            return
+        events = dash["upcoming_events"]
 
     if not events:
-        st.info("No upcoming events.")
+        st.info("No matching upcoming events." if query.strip() else "No upcoming events.")
         return
 
     event_map = {e["id"]: e["name"] for e in events}
@@ -197,13 +316,28 @@ def display_manage_event_tickets():
         df.columns = ["ID", "Type", "Price", "Qty"]
         st.dataframe(df, hide_index=True)
 
+        with st.expander("Shard Ticket Inventory"):
+            tid = st.selectbox("Ticket ID", [t["id"] for t in tickets],
+                               key="shard_ticket_id")
+            n_shards = st.number_input("Shards", 1, 64, 8, key="shard_count")
+            if st.button("Reshard"):
+                try:
+                    shard_ticket(tid, n_shards)
+                    st.success("Inventory resharded.")
+                except requests.HTTPError as e:
+                    st.error(f"Failed: {e.response.text}")
+
     with st.form("add_ticket"):
         ttype = st.text_input("Ticket Type")
         price = st.number_input("Price", 0.0)
         qty = st.number_input("Quantity", 0)
+        shards = st.number_input(
+            "Inventory Shards", 1, 64, 1,
+            help="Split stock across buckets for high-demand (flash-sale) events.",
+        )
         if st.form_submit_button("Add"):
             try:
-                create_ticket(eid, ttype, price, qty)
+                create_ticket(eid, ttype, price, qty, shards)
                 st.success("Ticket added.")
             except requests.HTTPError as e:
                 st.error(f"Failed: {e.response.text}")
@@ -239,49 +373,86 @@ def display_mark_attendance():
     df.columns = ["ID", "Name", "SRN", "Attended"]
     st.dataframe(df, hide_index=True)
 
-    sid = st.selectbox("Student ID", [p["student_id"] for p in parts])
-    if st.button("Mark Attended"):
+    mode = st.radio("Mode", ["Single", "Bulk (Check-in Desk)"], horizontal=True)
+
+    if mode == "Single":
+        sid = st.selectbox("Student ID", [p["student_id"] for p in parts])
+        if st.button("Mark Attended"):
+            try:
+                mark_attendance(eid, sid)
+                st.success("Marked attended.")
+            except requests.HTTPError as e:
+                st.error(f"Failed: {e.response.text}")
+        return
+
+    pending = {p["student_id"]: f"{p['student_name']} ({p['srn']})"
+               for p in parts if not p["attendance_status"]}
+    sids = st.multiselect("Students", list(pending.keys()),
+                          format_func=lambda x: pending[x])
+    srn_text = st.text_area("Or scan / paste SRNs (one per line or comma-separated)")
+    srns = [s.strip() for s in srn_text.replace(",", "\n").splitlines() if s.strip()]
+
+    if st.button(f"Mark {len(sids) + len(srns)} Attended",
+                 disabled=not (sids or srns)):
         try:
-            mark_attendance(eid, sid)
-            st.success("Marked attended.")
+            result = mark_attendance_bulk(eid, sids, srns)
         except requests.HTTPError as e:
             st.error(f"Failed: {e.response.text}")
+            return
+
+        counts = result["counts"]
+        st.success(f"Marked {counts['marked']} attended "
+                   f"({counts['already_marked']} already marked).")
+        problems = [r for r in result["results"]
+                    if r["status"] in ("not_registered", "unknown_srn")]
+        if problems:
+            df = pd.DataFrame(problems)
+            df.columns = ["Student ID", "SRN", "Result"]
+            st.warning(f"{len(problems)} entries could not be marked:")
+            st.dataframe(df, hide_index=True)
 
 
 def display_view_participants():
     st.subheader("Participants")
 
-    try:
-        rows = get_all_participants()
-    except requests.RequestException as e:
-        st.error(f"Service error: {e}")
-        return
+    display_paged_table(
+        "participants_table", get_all_participants_page,
+        ["event_name", "student_name", "srn", "attendance_status"],
+        ["Event", "Student", "SRN", "Attended"],
+        "No data.",
+    )
 
-    if rows:
-        df = pd.DataFrame(rows)
-        df.columns = ["Event", "Student", "SRN", "Attended"]
-        st.dataframe(df, hide_index=True)
-    else:
-        st.info("No data.")
+    st.markdown("---")
+    if st.button("Prepare Full Export (CSV)"):
+        try:
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(["Event", "Student", "SRN", "Attended"])
+            for row in iter_all_participants():
+                writer.writerow([row["event_name"], row["student_name"],
+                                 row["srn"], row["attendance_status"]])
+        except requests.RequestException as e:
+            st.error(f"Service error: {e}")
+            return
+        st.download_button("Download participants.csv", buf.getvalue(),
+                           file_name="participants.csv", mime="text/csv")
 
 
 def display_view_users():
     st.subheader("Users")
 
-    try:
-        from services.api_client import get_students
-        students = get_students()
-        hosts = get_hosts()
-    except requests.RequestException as e:
-        st.error(f"Service error: {e}")
-        return
-
     st.markdown("### Students")
-    if students:
-        df = pd.DataFrame(students)
-        df = df[["id", "srn", "name", "semester", "section"]]
-        df.columns = ["ID", "SRN", "Name", "Sem", "Sec"]
-        st.dataframe(df, hide_index=True)
+    display_paged_table(
+        "students_table", get_students_page,
+        ["id", "srn", "name", "semester", "section"],
+        ["ID", "SRN", "Name", "Sem", "Sec"],
+        "No students.",
+    )
+
+    dash = _load_dashboard()
+    if dash is None:
+        return
+    hosts = dash["hosts"]
 
     st.markdown("### Hosts")
     if hosts:
@@ -293,11 +464,10 @@ def display_view_users():
 def display_manage_venues():
     st.subheader("Venues")
 
-    try:
-        venues = get_venues()
-    except requests.RequestException as e:
-        st.error(f"Service error: {e}")
+    dash = _load_dashboard()
+    if dash is None:
         return
+    venues = dash["venues"]
 
     df = pd.DataFrame(venues)
     df = df[["id", "name", "building", "capacity", "is_available"]]
@@ -319,11 +489,10 @@ def display_manage_venues():
 def display_manage_resources():
     st.subheader("Resource Management")
 
-    try:
-        resources = get_resources()
-    except requests.RequestException as e:
-        st.error(f"Service error: {e}")
+    dash = _load_dashboard()
+    if dash is None:
         return
+    resources = dash["resources"]
 
     if not resources:
         st.info("No resources.")
@@ -337,10 +506,7 @@ def display_manage_resources():
     st.markdown("---")
     st.markdown("### Assign Resource to Event")
 
-    try:
-        events = get_scheduled_events()
-    except requests.RequestException:
-        events = []
+    events = dash["upcoming_events"]
 
     if not events:
         st.info("No upcoming events.")
@@ -419,3 +585,63 @@ def display_manage_resources():
             st.success("Resource sent to maintenance.")
         except requests.HTTPError as e:
             st.error(f"Failed: {e.response.text}")
+
+
+def display_cache_stats():
+    st.subheader("Cache Stats")
+
+    st.markdown("### Frontend Response Cache")
+    stats = cache_stats()
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Hit Ratio", f"{stats['hit_ratio']:.1%}" if stats["hit_ratio"] is not None else "—")
+    col2.metric("Served From Memory", stats["hits"])
+    col3.metric("Revalidated (304)", stats["revalidated"])
+    col4.metric("Fetched", stats["misses"])
+    col5.metric("Served Stale", stats["stale"])
+    st.caption(
+        f"{stats['entries']} entries ({stats['fresh_entries']} fresh) of "
+        f"{stats['max_entries']}; {stats['invalidations']} invalidations"
+        + ("" if stats["enabled"] else " — freshness cache disabled (API_DATA_CACHE=0)")
+    )
+    if stats["by_tag"]:
+        df = pd.DataFrame.from_dict(stats["by_tag"], orient="index")
+        df.columns = ["Hits", "Revalidated", "Fetched", "Stale"]
+        st.dataframe(df, use_container_width=True)
+
+    if st.button("Clear Frontend Cache"):
+        invalidate_cache()
+        st.rerun()
+
+    st.markdown("### Service Health")
+    breakers = circuit_stats()
+    if breakers:
+        df = pd.DataFrame.from_dict(breakers, orient="index")
+        df.columns = ["Circuit", "Consecutive Failures", "Trips", "Calls Rejected"]
+        st.dataframe(df, use_container_width=True)
+
+    st.markdown("### Connections")
+    conns = connection_stats()
+    st.caption(f"Transport: {conns['backend']}")
+    if conns["hosts"]:
+        df = pd.DataFrame.from_dict(conns["hosts"], orient="index")
+        df.columns = ["Requests", "Connections Opened", "Reuse Ratio"]
+        st.dataframe(df, use_container_width=True)
+
+    st.markdown("### Service Response Caches")
+    results, errors = get_service_cache_stats()
+    rows = []
+    for service in ("user", "event", "feedback"):
+        if service in errors:
+            st.warning(f"{service}-service: {errors[service]}")
+            continue
+        s_stats = results[service]
+        rows.append({
+            "Service": service,
+            "Entries": s_stats["entries"],
+            "Hits": s_stats["hits"],
+            "Misses": s_stats["misses"],
+            "Not Modified": s_stats["not_modified"],
+            "Hit Ratio": s_stats["hit_ratio"],
+        })
+    if rows:
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
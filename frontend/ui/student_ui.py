@@ -1,35 +1,96 @@
 import streamlit as st
 import pandas as pd
 import requests
+import datetime
 
 from services.api_client import (
-    get_students, get_student,
-    get_scheduled_events, get_completed_events,
-    get_tickets, get_user_registrations,
-    register_for_event, cancel_registration,
-    submit_feedback, get_feedback, get_average_rating,
+    get_student_by_srn, search_students, get_student_dashboard,
+    get_tickets, cancel_registration, hold_ticket, confirm_hold, release_hold,
+    submit_feedback,
 )
 
 
 # ---------------- LOGIN & MENU ----------------
 
+LOGIN_MIN_QUERY = 2     # characters entered before the service is queried
+LOGIN_PAGE_SIZE = 20
+LOGIN_MAX_RESULTS = 50  # the user service's cap on /students/search
+LOGIN_MEMO_SIZE = 32    # recent lookups remembered per session
+
+
+def _looks_like_srn(query):
+    return " " not in query and any(ch.isdigit() for ch in query)
+
+
+def _login_lookup(query):
+    """
+    Matches for query, memoized per session: reruns and going back to an
+    earlier query reuse the rows already fetched.
+    """
+    memo = st.session_state.setdefault("login_lookup", {})
+    key = query.casefold()
+    state = memo.pop(key, None)
+    if state is None:
+        state = {"rows": [], "limit": 0, "done": False}
+        if _looks_like_srn(query):
+            try:
+                state["rows"] = [get_student_by_srn(query)]
+                state["done"] = True
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code != 404:
+                    raise
+        if not state["done"]:
+            _login_next_page(query, state)
+    memo[key] = state  # most recent last
+    while len(memo) > LOGIN_MEMO_SIZE:
+        memo.pop(next(iter(memo)))
+    return state
+
+
+def _login_next_page(query, state):
+    # /students/search ranks rather than pages, so "more" asks for a longer list
+    state["limit"] = min(state["limit"] + LOGIN_PAGE_SIZE, LOGIN_MAX_RESULTS)
+    state["rows"] = search_students(query, limit=state["limit"])
+    state["done"] = len(state["rows"]) < state["limit"] or state["limit"] == LOGIN_MAX_RESULTS
+
+
 def student_login_page():
     st.header("Student Login")
 
+    # Submit-to-search, not typeahead: text_input only reruns on Enter or
+    # focus loss, so the service is queried once per submitted query
+    query = st.text_input("Your name or SRN", placeholder="Type and press Enter").strip()
+    if len(query) < LOGIN_MIN_QUERY:
+        st.caption(f"Enter at least {LOGIN_MIN_QUERY} characters and press Enter to find yourself.")
+        return
+
     try:
-        students = get_students()
+        state = _login_lookup(query)
     except requests.RequestException as e:
         st.error(f"Service error: {e}")
         return
 
-    student_map = {s["id"]: f"{s['name']} ({s['srn']})" for s in students}
+    if not state["rows"]:
+        st.info("No students match.")
+        return
+
+    student_map = {s["id"]: f"{s['name']} ({s['srn']})" for s in state["rows"]}
     sid = st.selectbox(
         "Select your Student ID:",
         list(student_map.keys()),
         format_func=lambda x: student_map[x]
     )
 
+    if not state["done"] and st.button("Show more matches"):
+        try:
+            _login_next_page(query, state)
+        except requests.RequestException as e:
+            st.error(f"Service error: {e}")
+            return
+        st.rerun()
+
     if st.button("Log In"):
+        st.session_state.pop("login_lookup", None)
         st.session_state["logged_in_user_id"] = sid
         st.session_state["page"] = "student_menu"
         st.rerun()
@@ -38,16 +99,20 @@ def student_login_page():
 def student_menu():
     user_id = st.session_state["logged_in_user_id"]
 
+    # One call covers the student, their registrations and the event lists
     try:
-        student = get_student(user_id)
+        dashboard = get_student_dashboard(user_id)
     except requests.HTTPError:
         st.error("Student not found. Please log in again.")
         st.session_state["page"] = "main"
         st.session_state["logged_in_user_id"] = None
         st.rerun()
         return
+    except requests.RequestException as e:
+        st.error(f"Service error: {e}")
+        return
 
-    student_name = student["name"]
+    student_name = dashboard["student"]["name"]
 
     st.sidebar.title(f"Welcome, {student_name}!")
     st.sidebar.button(
@@ -69,27 +134,23 @@ def student_menu():
     )
 
     if choice == "My Registrations":
-        display_my_registrations(user_id)
+        display_my_registrations(dashboard)
     elif choice == "Register for Event":
-        display_register_event(user_id)
+        display_register_event(user_id, dashboard)
     elif choice == "Completed Events":
-        display_list_completed_events()
+        display_list_completed_events(dashboard)
     elif choice == "Write Feedback":
-        display_write_event_feedback(user_id)
+        display_write_event_feedback(user_id, dashboard)
     elif choice == "Cancel Registration":
-        display_cancel_registration(user_id)
+        display_cancel_registration(user_id, dashboard)
 
 
 # ---------------- STUDENT FEATURES ----------------
 
-def display_my_registrations(user_id):
+def display_my_registrations(dashboard):
     st.subheader("My Upcoming Registrations")
 
-    try:
-        rows = get_user_registrations(user_id)
-    except requests.RequestException as e:
-        st.error(f"Service error: {e}")
-        return
+    rows = dashboard["registrations"]
 
     if not rows:
         st.info("You are not registered for any upcoming events.")
@@ -102,14 +163,10 @@ def display_my_registrations(user_id):
     return True
 
 
-def display_cancel_registration(user_id):
+def display_cancel_registration(user_id, dashboard):
     st.subheader("Cancel Registration")
 
-    try:
-        regs = get_user_registrations(user_id)
-    except requests.RequestException as e:
-        st.error(f"Service error: {e}")
-        return
+    regs = dashboard["registrations"]
 
     if not regs:
         st.info("You are not registered for any upcoming events.")
@@ -137,20 +194,17 @@ def display_cancel_registration(user_id):
             st.error(f"Cancellation failed: {e.response.text}")
 
 
-def display_register_event(user_id):
+def display_register_event(user_id, dashboard):
     st.subheader("Register for Event")
 
-    try:
-        events = get_scheduled_events()
-    except requests.RequestException as e:
-        st.error(f"Service error: {e}")
-        return
+    events = dashboard["upcoming_events"]
 
     if not events:
         st.info("No upcoming events.")
         return
 
     event_map = {e["id"]: f"{e['name']} at {e.get('venue_name', 'TBD')}"
+                          + (" (registered)" if e["is_registered"] else "")
                  for e in events}
     event_id = st.selectbox(
         "Select Event:",
@@ -158,10 +212,12 @@ def display_register_event(user_id):
         format_func=lambda x: event_map[x],
     )
 
-    # Get available tickets
+    # Get available tickets (a ticket this student holds stays selectable)
+    held_id = st.session_state.get("ticket_hold", {}).get("ticket_id")
     try:
         tickets = get_tickets(event_id)
-        available_tickets = [t for t in tickets if t["quantity"] > 0]
+        available_tickets = [t for t in tickets
+                             if t["quantity"] > 0 or t["id"] == held_id]
     except requests.RequestException:
         available_tickets = []
 
@@ -179,29 +235,66 @@ def display_register_event(user_id):
     price = ticket_map[ticket_id]["price"]
     st.write(f"Price: Rs.{price}")
 
-    if st.button("Confirm Order and Register"):
+    # Two-phase registration: reserve a unit (short TTL), then confirm it
+    hold = st.session_state.get("ticket_hold")
+    if hold and (hold["event_id"], hold["ticket_id"]) != (event_id, ticket_id):
+        try:
+            release_hold(hold["id"], user_id)
+        except requests.HTTPError:
+            pass  # already expired and swept
+        st.session_state.pop("ticket_hold", None)
+        hold = None
+
+    if not hold:
+        if st.button("Reserve Ticket"):
+            try:
+                st.session_state["ticket_hold"] = hold_ticket(
+                    event_id, user_id, ticket_id
+                )
+                st.rerun()
+            except requests.HTTPError as e:
+                _show_registration_error(e)
+        return
+
+    expires_at = datetime.datetime.fromisoformat(hold["expires_at"]).astimezone()
+    st.info(f"Ticket reserved until {expires_at:%H:%M:%S}. "
+            "Confirm to complete your registration.")
+
+    col1, col2 = st.columns(2)
+    if col1.button("Confirm Order and Register"):
+        st.session_state.pop("ticket_hold", None)
         try:
-            register_for_event(event_id, user_id, ticket_id)
+            confirm_hold(hold["id"], user_id)
             st.success("Successfully registered!")
             st.rerun()
         except requests.HTTPError as e:
-            error_detail = e.response.json().get("detail", e.response.text)
-            if "Already registered" in str(error_detail):
-                st.info("You are already registered for this event.")
-            elif "sold out" in str(error_detail).lower():
-                st.error("Tickets sold out. Try another ticket type.")
-            else:
-                st.error(f"Registration failed: {error_detail}")
+            _show_registration_error(e)
 
+    if col2.button("Release Reservation"):
+        st.session_state.pop("ticket_hold", None)
+        try:
+            release_hold(hold["id"], user_id)
+        except requests.HTTPError:
+            pass  # already expired and swept
+        st.rerun()
+
+
+def _show_registration_error(e):
+    error_detail = e.response.json().get("detail", e.response.text)
+    if "Already registered" in str(error_detail):
+        st.info("You are already registered for this event.")
+    elif "sold out" in str(error_detail).lower():
+        st.error("Tickets sold out. Try another ticket type.")
+    elif "Hold" in str(error_detail):
+        st.warning("Your reservation has expired. Please reserve again.")
+    else:
+        st.error(f"Registration failed: {error_detail}")
 
-def display_list_completed_events():
+
+def display_list_completed_events(dashboard):
     st.subheader("Completed Events")
 
-    try:
-        rows = get_completed_events()
-    except requests.RequestException as e:
-        st.error(f"Service error: {e}")
-        return
+    rows = dashboard["completed_events"]
 
     if not rows:
         st.info("No completed events.")
@@ -214,14 +307,10 @@ def display_list_completed_events():
     return True
 
 
-def display_write_event_feedback(user_id):
+def display_write_event_feedback(user_id, dashboard):
     st.subheader("Write Feedback")
 
-    try:
-        completed = get_completed_events()
-    except requests.RequestException as e:
-        st.error(f"Service error: {e}")
-        return
+    completed = dashboard["completed_events"]
 
     if not completed:
         st.info("No completed events.")
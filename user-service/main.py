@@ -1,7 +1,25 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Query
+from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from contextlib import asynccontextmanager
-from database import get_cursor
-from models import StudentOut, StudentCreate, HostOut
+from database import (
+    get_cursor, pool_stats, prefill_pool, reap_pool, close_pool, PoolTimeout,
+    POOL_REAP_INTERVAL,
+)
+from pagination import MAX_PAGE_SIZE, keyset_filter, limit_clause
+from cache import response_cache
+from change_listener import ChangeListener
+from warmup import WarmUp, WARMUP_STEP_TIMEOUT
+from search import (
+    DEFAULT_SEARCH_RESULTS, MAX_SEARCH_RESULTS, search_terms,
+    like_prefix, like_contains,
+)
+from student_import import (
+    upload_format, new_spool, spool_chunk, import_students,
+    UploadTooLarge, InvalidUpload, MAX_UPLOAD_BYTES,
+)
+from models import StudentOut, StudentCreate, StudentImportOut, HostOut
+from typing import Optional
 import asyncio
 import httpx
 import os
@@ -13,6 +31,9 @@ KEEP_ALIVE_URLS = [
     "https://eventra-feedbacke-service.onrender.com/health",  # feedback-service
     "https://eventra-cc.streamlit.app/",                  # frontend
 ]
+if os.getenv("KEEP_ALIVE_URLS") is not None:
+    # Comma-separated override; empty leaves just the database ping
+    KEEP_ALIVE_URLS = [url.strip() for url in os.environ["KEEP_ALIVE_URLS"].split(",") if url.strip()]
 
 PING_INTERVAL = 600  # 10 minutes
 
@@ -40,22 +61,67 @@ async def keep_alive_task():
                     print(f"[keep-alive] Failed to ping {url}: {e}")
 
 
+async def pool_reaper_task():
+    """Background task that closes pooled connections left idle past DB_POOL_MAX_IDLE."""
+    while True:
+        await asyncio.sleep(POOL_REAP_INTERVAL)
+        try:
+            closed = await run_in_threadpool(reap_pool)
+            if closed:
+                print(f"[pool-reaper] Closed {closed} idle connections")
+        except Exception as e:
+            print(f"[pool-reaper] Reap FAILED: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Start keep-alive background task on startup."""
+    """
+    Start the keep-alive, pool-reaper, cache change-listener and warm-up
+    tasks on startup.
+    /ready reports 503 until the warm-up has opened the pool and, once the
+    listener is up (so no change can slip past it), primed the hot endpoints.
+    """
     task = asyncio.create_task(keep_alive_task())
     print("[keep-alive] Background ping task started")
+    reaper = asyncio.create_task(pool_reaper_task())
+    listener = ChangeListener(response_cache)
+    listener.start()
+    warmup.step("db pool", lambda: run_in_threadpool(prefill_pool))
+    warmup.step("change listener",
+                lambda: run_in_threadpool(listener.wait_listening, WARMUP_STEP_TIMEOUT))
+    warmup.get(app, "/students", "/hosts")
+    warming = asyncio.create_task(warmup.run())
     yield
+    warming.cancel()
+    try:
+        await warming
+    except asyncio.CancelledError:
+        pass
+    listener.stop()
+    reaper.cancel()
+    try:
+        await reaper
+    except asyncio.CancelledError:
+        pass
     task.cancel()
     try:
         await task
     except asyncio.CancelledError:
         print("[keep-alive] Background task stopped")
+    close_pool()
 
 
+warmup = WarmUp("user-service")
+
 app = FastAPI(title="Eventra User Service", version="1.0.0", lifespan=lifespan)
 
 
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolTimeout):
+    """Every pooled connection stayed busy past the timeout — ask clients to retry."""
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+
 # ──────────── Health ────────────
 
 @app.get("/health")
@@ -70,15 +136,108 @@ def health():
     return {"status": "ok", "service": "user-service", "database": db_status}
 
 
+@app.get("/health/pool")
+def health_pool():
+    """Connection pool statistics (size, idle/in-use, waits, timeouts)."""
+    return pool_stats()
+
+
+@app.get("/ready")
+def ready():
+    """503 until the startup warm-up has finished; reports how long each step took."""
+    return warmup.response()
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    """Response cache size and hit/miss counters, overall and per endpoint."""
+    return response_cache.stats()
+
+
 # ──────────── Students ────────────
 
 @app.get("/students", response_model=list[StudentOut])
-def list_students():
+def list_students(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    prefix: Optional[str] = None,
+):
+    """
+    Students by name (keyset-paged by name, id). prefix narrows to names or
+    SRNs starting with it, case-insensitively — the login typeahead.
+    """
+    after_sql, after_params = keyset_filter(after, ("name", "id"))
+    limit_sql, limit_params = limit_clause(limit)
+    prefix = (prefix or "").strip()
+    if prefix:
+        prefix_sql = "AND (lower(name) LIKE %s OR upper(srn) LIKE %s)"
+        prefix_params = (like_prefix(prefix.lower()), like_prefix(prefix.upper()))
+    else:
+        prefix_sql, prefix_params = "", ()
+
+    def load():
+        with get_cursor() as cur:
+            cur.execute(f"""
+                SELECT id, srn, name, semester, section
+                FROM tbl_students
+                WHERE {after_sql}
+                  {prefix_sql}
+                ORDER BY name, id
+                {limit_sql}
+            """, after_params + prefix_params + limit_params)
+            return cur.fetchall()
+
+    return response_cache.fetch_sync(
+        f"students:{limit}:{after}:{prefix.lower()}", ("students",),
+        load, list[StudentOut], request, page=(limit, ("name", "id")),
+    )
+
+
+@app.get("/students/search", response_model=list[StudentOut])
+def search_students(
+    q: str,
+    limit: int = Query(DEFAULT_SEARCH_RESULTS, ge=1, le=MAX_SEARCH_RESULTS),
+):
+    """
+    Typeahead over students: SRN prefix, name substring, or a name close to
+    the query (typos), via the pg_trgm indexes. Prefix matches rank first.
+    """
+    terms = search_terms(q)
+    text = " ".join(terms)
+
+    with get_cursor() as cur:
+        cur.execute("""
+            SELECT id, srn, name, semester, section
+            FROM tbl_students
+            WHERE srn ILIKE %(prefix)s
+               OR name ILIKE %(contains)s
+               OR %(text)s <%% name
+            ORDER BY (srn ILIKE %(prefix)s OR name ILIKE %(prefix)s) DESC,
+                     word_similarity(%(text)s, name) DESC,
+                     name, id
+            LIMIT %(limit)s
+        """, {
+            "prefix": like_prefix(text),
+            "contains": like_contains(text),
+            "text": text,
+            "limit": limit,
+        })
+        return cur.fetchall()
+
+
+@app.get("/students/by-srn/{srn}", response_model=StudentOut)
+def get_student_by_srn(srn: str):
+    """Exact, case-insensitive SRN lookup."""
     with get_cursor() as cur:
         cur.execute(
-            "SELECT id, srn, name, semester, section FROM tbl_students ORDER BY name"
+            "SELECT id, srn, name, semester, section FROM tbl_students WHERE upper(srn)=%s",
+            (srn.strip().upper(),),
         )
-        return cur.fetchall()
+        row = cur.fetchone()
+        if not row:
+            raise HTTPException(status_code=404, detail="Student not found")
+        return row
 
 
 @app.get("/students/{student_id}", response_model=StudentOut)
@@ -108,15 +267,56 @@ def create_student(student: StudentCreate):
         row = cur.fetchone()
         if not row:
             raise HTTPException(status_code=500, detail="Failed to create student")
-        return row
+
+    response_cache.invalidate("students")
+    return row
+
+
+@app.post("/students/bulk", response_model=StudentImportOut)
+async def bulk_import_students(request: Request):
+    """
+    Import students from a CSV (header: srn,name,semester,section) or NDJSON
+    request body of up to STUDENT_IMPORT_MAX_BYTES. Existing SRNs are skipped
+    and reported as duplicates.
+    """
+    fmt = upload_format(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(
+            status_code=415,
+            detail="Upload must be text/csv or application/x-ndjson",
+        )
+
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds {MAX_UPLOAD_BYTES} bytes")
+
+    with new_spool() as upload:
+        try:
+            async for chunk in request.stream():
+                # The spool spills to disk past SPOOL_MAX_MEMORY; keep that off the event loop
+                await run_in_threadpool(spool_chunk, upload, chunk)
+            report = await run_in_threadpool(import_students, upload, fmt)
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except InvalidUpload as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    if report["inserted"]:
+        response_cache.invalidate("students")
+    return report
 
 
 # ──────────── Hosts ────────────
 
 @app.get("/hosts", response_model=list[HostOut])
-def list_hosts():
-    with get_cursor() as cur:
-        cur.execute(
-            "SELECT id, name, department, role FROM tbl_hosts ORDER BY name"
-        )
-        return cur.fetchall()
+def list_hosts(request: Request):
+    def load():
+        with get_cursor() as cur:
+            cur.execute(
+                "SELECT id, name, department, role FROM tbl_hosts ORDER BY name"
+            )
+            return cur.fetchall()
+
+    return response_cache.fetch_sync(
+        "hosts", ("hosts",), load, list[HostOut], request
+    )
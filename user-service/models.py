@@ -1,6 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
+INT_MIN, INT_MAX = -2**31, 2**31 - 1  # tbl_students.semester is an integer column
+
 
 class StudentOut(BaseModel):
     id: int
@@ -13,10 +15,23 @@ class StudentOut(BaseModel):
 class StudentCreate(BaseModel):
     srn: str
     name: str
-    semester: int
+    semester: int = Field(ge=INT_MIN, le=INT_MAX)
     section: str
 
 
+class StudentImportError(BaseModel):
+    line: int
+    error: str
+
+
+class StudentImportOut(BaseModel):
+    received: int
+    inserted: int
+    duplicates: int
+    invalid: int
+    errors: list[StudentImportError]
+
+
 class HostOut(BaseModel):
     id: int
     name: str
@@ -0,0 +1,57 @@
+"""
+Keyset (cursor) pagination for the list endpoints.
+
+Pages are requested with ?limit=N&after=<cursor>. The body stays a plain
+JSON list; when more rows follow, the opaque cursor for the next page is
+returned in the X-Next-Cursor response header.
+"""
+
+import base64
+import json
+from fastapi import HTTPException
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def keyset_filter(after, columns, descending=False):
+    """WHERE fragment and params selecting rows strictly past the cursor."""
+    if not after:
+        return "TRUE", ()
+    values = decode_cursor(after, len(columns))
+    op = "<" if descending else ">"
+    placeholders = ", ".join(["%s"] * len(columns))
+    return f"({', '.join(columns)}) {op} ({placeholders})", tuple(values)
+
+
+def limit_clause(limit):
+    """Fetch one look-ahead row so we know whether another page follows."""
+    if not limit:
+        return "", ()
+    return "LIMIT %s", (limit + 1,)
+
+
+def finish_page(rows, limit, key_fields, response):
+    """Drop the look-ahead row and advertise where the next page starts."""
+    if limit and len(rows) > limit:
+        del rows[limit:]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [rows[-1][field] for field in key_fields]
+        )
+    return rows
@@ -0,0 +1,179 @@
+"""
+Bulk student import (CSV or NDJSON upload).
+
+The upload is spooled to a temporary file as it arrives, validated row by
+row, and the valid rows are loaded with COPY into a temp staging table. A
+single INSERT ... SELECT then merges them into tbl_students; SRNs that
+already exist (or repeat within the upload) are skipped via the
+tbl_students_srn_unique constraint and counted as duplicates.
+"""
+
+import io
+import os
+import csv
+import json
+import tempfile
+from pydantic import ValidationError
+from database import get_cursor
+from models import StudentCreate
+
+CSV_TYPES = {"text/csv", "application/csv"}
+NDJSON_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
+CSV_COLUMNS = ("srn", "name", "semester", "section")
+
+SPOOL_MAX_MEMORY = 1024 * 1024  # bytes kept in memory before spilling to disk
+MAX_UPLOAD_BYTES = int(os.getenv("STUDENT_IMPORT_MAX_BYTES", str(20 * 1024 * 1024)))
+MAX_REPORTED_ERRORS = 50        # invalid rows described in the response
+
+
+class UploadTooLarge(Exception):
+    """The request body is bigger than MAX_UPLOAD_BYTES."""
+
+
+class InvalidUpload(Exception):
+    """The upload can't be imported at all (e.g. a CSV without the expected header)."""
+
+
+def upload_format(content_type):
+    """'csv', 'ndjson', or None for an unsupported Content-Type."""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in CSV_TYPES:
+        return "csv"
+    if media_type in NDJSON_TYPES:
+        return "ndjson"
+    return None
+
+
+def new_spool():
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+
+
+def spool_chunk(upload, chunk):
+    """Append chunk to the spool, refusing uploads past MAX_UPLOAD_BYTES."""
+    if upload.tell() + len(chunk) > MAX_UPLOAD_BYTES:
+        raise UploadTooLarge(f"Upload exceeds {MAX_UPLOAD_BYTES} bytes")
+    upload.write(chunk)
+
+
+def check_csv_header(upload):
+    """Raise InvalidUpload unless the CSV header names every column in CSV_COLUMNS."""
+    upload.seek(0)
+    try:
+        header = next(csv.reader([upload.readline().decode("utf-8-sig")]), [])
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise InvalidUpload(f"Unreadable CSV header: {e}")
+    missing = [col for col in CSV_COLUMNS if col not in {h.strip() for h in header}]
+    if missing:
+        raise InvalidUpload(
+            f"CSV header must be {','.join(CSV_COLUMNS)} (missing: {', '.join(missing)})"
+        )
+
+
+def _read_rows(text, fmt):
+    """Yield (line number, raw row) pairs; raw rows are dicts or parse errors."""
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_no, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError as e:
+            yield line_no, e
+
+
+def _validate(raw):
+    """A StudentCreate for a valid row, else an error message."""
+    if isinstance(raw, Exception):
+        return f"Invalid JSON: {raw}"
+    if not isinstance(raw, dict):
+        return "Expected an object with srn, name, semester, section"
+    raw = {k.strip(): v.strip() if isinstance(v, str) else v
+           for k, v in raw.items() if isinstance(k, str)}
+    try:
+        student = StudentCreate.model_validate(raw)
+    except ValidationError as e:
+        return "; ".join(
+            f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+        )
+    if not student.srn or not student.name:
+        return "srn and name must not be empty"
+    return student
+
+
+def _report_error(errors, line, message):
+    if len(errors) < MAX_REPORTED_ERRORS:
+        errors.append({"line": line, "error": message})
+
+
+def import_students(upload, fmt):
+    """
+    Validate and merge a spooled upload; returns the import report. Raises
+    InvalidUpload, before anything is merged, for a CSV without the expected
+    header or an upload that isn't valid UTF-8 (or CSV) all the way through.
+    """
+    if fmt == "csv":
+        check_csv_header(upload)
+    upload.seek(0)
+    text = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+
+    received = 0
+    errors = []
+    invalid = 0
+    staged = 0
+    with new_spool() as staging:
+        out = io.TextIOWrapper(staging, encoding="utf-8", newline="")
+        writer = csv.writer(out)
+        try:
+            for line_no, raw in _read_rows(text, fmt):
+                received += 1
+                result = _validate(raw)
+                if isinstance(result, str):
+                    invalid += 1
+                    _report_error(errors, line_no, result)
+                    continue
+                writer.writerow([line_no, result.srn, result.name,
+                                 result.semester, result.section])
+                staged += 1
+        except (UnicodeDecodeError, csv.Error) as e:
+            raise InvalidUpload(f"Unreadable upload: {e}")
+        out.seek(0)
+
+        inserted = 0
+        if staged:
+            with get_cursor(commit=True) as cur:
+                cur.execute("""
+                    CREATE TEMP TABLE tmp_student_import (
+                        line integer, srn text, name text,
+                        semester integer, section text
+                    ) ON COMMIT DROP
+                """)
+                cur.copy_expert(
+                    "COPY tmp_student_import (line, srn, name, semester, section) "
+                    "FROM STDIN WITH (FORMAT csv)",
+                    out,
+                )
+                # First occurrence wins when an SRN repeats within the upload
+                cur.execute("""
+                    INSERT INTO tbl_students (srn, name, semester, section)
+                    SELECT DISTINCT ON (srn) srn, name, semester, section
+                    FROM tmp_student_import
+                    ORDER BY srn, line
+                    ON CONFLICT ON CONSTRAINT tbl_students_srn_unique DO NOTHING
+                """)
+                inserted = cur.rowcount
+        out.detach()
+    text.detach()
+
+    return {
+        "received": received,
+        "inserted": inserted,
+        "duplicates": staged - inserted,
+        "invalid": invalid,
+        "errors": errors,
+    }